@@ -0,0 +1,76 @@
+from flask import Blueprint, request, jsonify, current_app, session
+from werkzeug.exceptions import HTTPException
+from werkzeug.test import EnvironBuilder
+from backend.config import Config
+from backend.database import read_transaction
+
+batch_bp = Blueprint('batch', __name__, url_prefix='/api/batch')
+
+# GET endpoints that stream or hold the connection open; never batched
+BATCH_EXCLUDED_ENDPOINTS = {'matches.stream_matches', 'export.export'}
+
+
+def dispatch_get(path):
+    """Run one GET sub-request in the current app context.
+
+    The sub-request shares the app context, so it reuses the request's
+    database connection and loaded user, and the session of the batch
+    request. Only the view runs; before/after request hooks belong to the
+    batch request itself. Returns the item for the batch response.
+    """
+    app = current_app._get_current_object()
+    builder = EnvironBuilder(path=path, base_url=request.host_url, method='GET')
+    ctx = app.request_context(builder.get_environ())
+    ctx.session = session._get_current_object()
+
+    with ctx:
+        sub = ctx.request
+        try:
+            if sub.routing_exception is not None:
+                raise sub.routing_exception
+            if not sub.url_rule.rule.startswith('/api/'):
+                return {'path': path, 'status': 404, 'body': {'error': 'Not found'}}
+            if sub.endpoint in BATCH_EXCLUDED_ENDPOINTS:
+                return {'path': path, 'status': 400,
+                        'body': {'error': 'Streaming endpoints cannot be batched'}}
+            response = app.make_response(app.dispatch_request())
+        except HTTPException as e:
+            return {'path': path, 'status': e.code, 'body': {'error': e.description}}
+        except Exception as e:
+            current_app.logger.exception('Batch item %s failed', path)
+            return {'path': path, 'status': 500, 'body': {'error': str(e)}}
+
+        item = {'path': path, 'status': response.status_code, 'body': response.get_json(silent=True)}
+        if 'X-Next-Cursor' in response.headers:
+            item['next_cursor'] = response.headers['X-Next-Cursor']
+        response.close()
+        return item
+
+
+@batch_bp.route('', methods=['POST'])
+def batch():
+    """Resolve several GET requests in one round trip.
+
+    Body: {"requests": ["/api/teams/3", {"path": "/api/players/team/3"}, ...]}.
+    Every item runs on one connection inside one read transaction, so all
+    results come from the same snapshot. The response lists each item's
+    path, status and JSON body in request order.
+    """
+    data = request.get_json(silent=True)
+    items = data.get('requests') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'requests must be a non-empty list'}), 400
+    if len(items) > Config.BATCH_MAX_REQUESTS:
+        return jsonify({'error': f'At most {Config.BATCH_MAX_REQUESTS} requests per batch'}), 400
+
+    paths = []
+    for index, item in enumerate(items):
+        path = item.get('path') if isinstance(item, dict) else item
+        if not isinstance(path, str) or not path.startswith('/api/'):
+            return jsonify({'error': f'Request {index}: path must start with /api/'}), 400
+        paths.append(path)
+
+    with read_transaction():
+        responses = [dispatch_get(path) for path in paths]
+
+    return jsonify({'responses': responses}), 200
@@ -0,0 +1,76 @@
+from flask import Blueprint, jsonify
+from datetime import date
+from backend.auth import admin_required
+from backend.cache import cached_response
+from backend.config import Config
+from backend.database import execute_query, execute_single
+from backend.api.listing import ListQueryError, date_arg
+
+dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
+
+# Columns of the fixture and result lists
+DASHBOARD_MATCH_SELECT = '''
+    SELECT m.id, m.match_date, m.match_time, m.round, m.venue, m.status,
+           m.team_a_id, ta.name AS team_a_name, m.team_b_id, tb.name AS team_b_name,
+           m.team_a_score, m.team_b_score, m.winner_id, w.name AS winner_name,
+           m.result_summary
+    FROM matches m
+    LEFT JOIN teams ta ON m.team_a_id = ta.id
+    LEFT JOIN teams tb ON m.team_b_id = tb.id
+    LEFT JOIN teams w ON m.winner_id = w.id
+'''
+
+
+@dashboard_bp.route('', methods=['GET'])
+@admin_required
+@cached_response('teams', 'players', 'matches')
+def get_dashboard():
+    """Totals, matches by status, today's and upcoming fixtures and latest results.
+
+    ?date=YYYY-MM-DD sets "today" (default: the server's date), so the
+    page can ask for the viewer's local day.
+    """
+    try:
+        today = date_arg('date') or date.today().isoformat()
+    except ListQueryError as e:
+        return jsonify({'error': str(e)}), 400
+
+    limit = Config.DASHBOARD_LIST_SIZE
+
+    totals = execute_single('''
+        SELECT (SELECT COUNT(*) FROM teams) AS teams,
+               (SELECT COUNT(*) FROM players) AS players,
+               (SELECT COUNT(*) FROM matches) AS matches
+    ''')
+
+    by_status = execute_query('SELECT status, COUNT(*) AS count FROM matches GROUP BY status')
+
+    todays_matches = execute_query(
+        DASHBOARD_MATCH_SELECT + '''
+        WHERE m.match_date = ?
+        ORDER BY m.match_time, m.id
+        LIMIT ?
+    ''', (today, limit))
+
+    upcoming = execute_query(
+        DASHBOARD_MATCH_SELECT + '''
+        WHERE m.status = 'scheduled' AND m.match_date > ?
+        ORDER BY m.match_date, m.match_time
+        LIMIT ?
+    ''', (today, limit))
+
+    recent_results = execute_query(
+        DASHBOARD_MATCH_SELECT + '''
+        WHERE m.status = 'completed'
+        ORDER BY m.match_date DESC, m.match_time DESC
+        LIMIT ?
+    ''', (limit,))
+
+    return jsonify({
+        'date': today,
+        'totals': totals,
+        'matches_by_status': {row['status'] or 'unknown': row['count'] for row in by_status},
+        'today': todays_matches,
+        'upcoming': upcoming,
+        'recent_results': recent_results
+    }), 200
@@ -0,0 +1,231 @@
+import sqlite3
+from flask import Blueprint, request, jsonify
+from backend.auth import admin_required
+from backend.cache import cached_response
+from backend.config import Config
+from backend.database import execute_query, execute_single, transaction
+from backend.events import match_events
+
+deliveries_bp = Blueprint('deliveries', __name__, url_prefix='/api/matches')
+
+
+EXTRA_TYPES = ('wide', 'noball', 'bye', 'legbye', 'penalty')
+WICKET_KINDS = (
+    'bowled', 'caught', 'lbw', 'stumped', 'hit wicket', 'run out',
+    'retired hurt', 'retired out', 'obstructing the field', 'hit the ball twice',
+    'handled the ball', 'timed out'
+)
+# Dismissals that name a fielder (the bowler for caught and bowled)
+FIELDER_WICKETS = ('caught', 'stumped', 'run out')
+
+DELIVERY_COLUMNS = (
+    'innings', 'batting_team_id', 'over_number', 'ball', 'striker_id', 'non_striker_id',
+    'bowler_id', 'runs_batter', 'extras', 'extra_type', 'wicket_kind', 'player_out_id',
+    'fielder_id'
+)
+
+
+def _int_field(row, name, minimum=0, maximum=None, required=True):
+    """Read an integer field from a delivery, raising ValueError if invalid"""
+    value = row.get(name)
+    if value in (None, ''):
+        if required:
+            raise ValueError(f'{name} is required')
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f'{name} must be an integer')
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be an integer')
+    if value < minimum or (maximum is not None and value > maximum):
+        raise ValueError(f'{name} is out of range')
+    return value
+
+
+def _validate_delivery(row, match, squads):
+    """Validate one ball and return its insert parameters"""
+    innings = _int_field(row, 'innings', minimum=1, maximum=4)
+    over_number = _int_field(row, 'over', maximum=Config.MAX_OVERS_PER_INNINGS - 1)
+    ball = _int_field(row, 'ball', minimum=1, maximum=99)
+    runs_batter = _int_field(row, 'runs', maximum=7, required=False) or 0
+    extras = _int_field(row, 'extras', maximum=7, required=False) or 0
+
+    striker_id = _int_field(row, 'striker_id', minimum=1)
+    non_striker_id = _int_field(row, 'non_striker_id', minimum=1, required=False)
+    bowler_id = _int_field(row, 'bowler_id', minimum=1)
+    for name, player_id in (('striker_id', striker_id), ('non_striker_id', non_striker_id),
+                            ('bowler_id', bowler_id)):
+        if player_id is not None and player_id not in squads:
+            raise ValueError(f'{name} is not in either team of this match')
+
+    batting_team_id = squads[striker_id]
+    if squads[bowler_id] == batting_team_id:
+        raise ValueError('Striker and bowler must be on opposing teams')
+    if non_striker_id is not None and (
+            non_striker_id == striker_id or squads[non_striker_id] != batting_team_id):
+        raise ValueError('non_striker_id must be another player of the batting team')
+
+    extra_type = row.get('extra_type') or None
+    if extra_type is not None and extra_type not in EXTRA_TYPES:
+        raise ValueError(f'extra_type must be one of {", ".join(EXTRA_TYPES)}')
+    if extras and extra_type is None:
+        raise ValueError('extra_type is required when extras are given')
+    if extra_type in ('wide', 'noball') and extras < 1:
+        raise ValueError('Wides and no-balls carry at least one extra')
+
+    wicket_kind = row.get('wicket_kind') or None
+    player_out_id = fielder_id = None
+    if wicket_kind is not None:
+        if wicket_kind not in WICKET_KINDS:
+            raise ValueError('Unknown wicket_kind')
+        player_out_id = _int_field(row, 'player_out_id', minimum=1, required=False) or striker_id
+        if player_out_id not in (striker_id, non_striker_id):
+            raise ValueError('player_out_id must be the striker or the non-striker')
+        if wicket_kind in FIELDER_WICKETS:
+            fielder_id = _int_field(row, 'fielder_id', minimum=1, required=wicket_kind != 'run out')
+            if fielder_id is not None and squads.get(fielder_id) != squads[bowler_id]:
+                raise ValueError('fielder_id must be a player of the fielding team')
+
+    return (
+        match['id'], innings, batting_team_id, over_number, ball, striker_id, non_striker_id,
+        bowler_id, runs_batter, extras, extra_type, wicket_kind, player_out_id, fielder_id
+    )
+
+
+@deliveries_bp.route('/<int:match_id>/deliveries', methods=['POST'])
+@admin_required
+def add_deliveries(match_id):
+    """Record a batch of balls for a match (admin only)
+
+    Accepts {"deliveries": [...]} or a bare list. Each ball has innings,
+    over (0-based), ball (1-based, counting extras), striker_id, bowler_id,
+    and optionally non_striker_id, runs, extras, extra_type, wicket_kind,
+    player_out_id and fielder_id. The batch is validated as a whole and
+    written in one transaction; triggers update player statistics, innings
+    totals and the match score as part of it.
+    """
+    data = request.get_json(silent=True)
+    rows = data.get('deliveries') if isinstance(data, dict) else data
+    if not isinstance(rows, list) or len(rows) == 0:
+        return jsonify({'error': 'No deliveries provided'}), 400
+
+    if len(rows) > Config.DELIVERY_BATCH_MAX_ROWS:
+        return jsonify({
+            'error': f'At most {Config.DELIVERY_BATCH_MAX_ROWS} deliveries per request'
+        }), 400
+
+    match = execute_single(
+        'SELECT id, team_a_id, team_b_id FROM matches WHERE id = ?', (match_id,)
+    )
+    if not match:
+        return jsonify({'error': 'Match not found'}), 404
+
+    # Both squads in one query: player id -> team id
+    squads = {
+        player['id']: player['team_id'] for player in execute_query(
+            'SELECT id, team_id FROM players WHERE team_id IN (?, ?)',
+            (match['team_a_id'], match['team_b_id'])
+        )
+    }
+
+    values, errors = [], []
+    for index, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors.append({'row': index, 'error': 'Row must be an object'})
+            continue
+        try:
+            values.append(_validate_delivery(row, match, squads))
+        except ValueError as e:
+            errors.append({'row': index, 'error': str(e)})
+    if errors:
+        return jsonify({'error': 'Validation failed', 'errors': errors}), 400
+
+    try:
+        with transaction() as cursor:
+            cursor.executemany(f'''
+                INSERT INTO deliveries (match_id, {', '.join(DELIVERY_COLUMNS)})
+                VALUES ({', '.join('?' * (len(DELIVERY_COLUMNS) + 1))})
+            ''', values)
+
+            last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+            score = cursor.execute(
+                'SELECT status, team_a_score, team_b_score FROM matches WHERE id = ?',
+                (match_id,)
+            ).fetchone()
+    except sqlite3.IntegrityError:
+        return jsonify({'error': 'A ball with the same innings, over and number already exists'}), 409
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    match_events.publish('match.score', dict(score, id=match_id))
+
+    return jsonify({
+        'message': f'{len(values)} delivery(s) recorded',
+        'created_count': len(values),
+        'delivery_ids': list(range(last_id - len(values) + 1, last_id + 1)),
+        'team_a_score': score['team_a_score'],
+        'team_b_score': score['team_b_score']
+    }), 201
+
+
+@deliveries_bp.route('/<int:match_id>/deliveries', methods=['GET'])
+@cached_response('deliveries')
+def get_deliveries(match_id):
+    """Get a match's balls in order, optionally for one innings"""
+    conditions, params = ['match_id = ?'], [match_id]
+
+    innings = request.args.get('innings')
+    if innings:
+        if not innings.isdigit():
+            return jsonify({'error': 'innings must be an integer'}), 400
+        conditions.append('innings = ?')
+        params.append(int(innings))
+
+    deliveries = execute_query(f'''
+        SELECT id, match_id, {', '.join(DELIVERY_COLUMNS)}, created_at
+        FROM deliveries
+        WHERE {' AND '.join(conditions)}
+        ORDER BY innings, over_number, ball
+    ''', params)
+
+    return jsonify(deliveries), 200
+
+
+@deliveries_bp.route('/<int:match_id>/innings', methods=['GET'])
+@cached_response('deliveries')
+def get_innings(match_id):
+    """Get the running totals of each innings of a match"""
+    innings = execute_query('''
+        SELECT innings, batting_team_id, deliveries, runs, wickets, legal_balls
+        FROM innings_totals
+        WHERE match_id = ?
+        ORDER BY innings
+    ''', (match_id,))
+
+    return jsonify(innings), 200
+
+
+@deliveries_bp.route('/<int:match_id>/deliveries/<int:delivery_id>', methods=['DELETE'])
+@admin_required
+def delete_delivery(match_id, delivery_id):
+    """Remove a ball, reversing its effect on the totals (admin only)"""
+    try:
+        with transaction() as cursor:
+            affected = cursor.execute(
+                'DELETE FROM deliveries WHERE id = ? AND match_id = ?',
+                (delivery_id, match_id)
+            ).rowcount
+            score = cursor.execute(
+                'SELECT status, team_a_score, team_b_score FROM matches WHERE id = ?',
+                (match_id,)
+            ).fetchone()
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    if affected == 0:
+        return jsonify({'error': 'Delivery not found'}), 404
+
+    match_events.publish('match.score', dict(score, id=match_id))
+
+    return jsonify({'message': 'Delivery deleted successfully'}), 200
@@ -0,0 +1,138 @@
+from flask import Blueprint, jsonify, Response, stream_with_context
+import csv
+import io
+import json
+from backend.config import Config
+from backend.database import get_pool
+from backend.api.listing import ListQueryError, parse_fields, select_query
+from backend.api.teams import TEAM_LIST_COLUMNS, TEAM_LIST_JOINS, TEAM_LIST_ORDER
+from backend.api.players import (
+    PLAYER_LIST_COLUMNS, PLAYER_LIST_JOINS, PLAYER_LIST_ORDER, PLAYER_LIST_FROM,
+    player_list_filters
+)
+from backend.api.matches import (
+    MATCH_LIST_COLUMNS, MATCH_LIST_JOINS, MATCH_LIST_ORDER, MATCH_LIST_FROM,
+    match_list_filters
+)
+
+export_bp = Blueprint('export', __name__, url_prefix='/api/export')
+
+
+# Output columns of the statistics export: name -> (SQL expression, join needed)
+STATISTICS_EXPORT_COLUMNS = {
+    'player_id': ('ps.player_id', None),
+    'player_name': ('p.name', None),
+    'team_id': ('p.team_id', None),
+    'team_name': ('t.name', None),
+    'role': ('p.role', None),
+    **{column: (f'ps.{column}', None) for column in (
+        'matches_played', 'runs_scored', 'balls_faced', 'fours', 'sixes', 'times_out',
+        'wickets_taken', 'balls_bowled', 'runs_conceded', 'catches', 'stumpings',
+        'strike_rate', 'batting_average', 'economy', 'bowling_average'
+    )}
+}
+
+# entity -> (columns, FROM clause, ORDER BY, optional joins, filter builder)
+EXPORTS = {
+    'teams': (TEAM_LIST_COLUMNS, 'teams t', TEAM_LIST_ORDER, TEAM_LIST_JOINS, None),
+    'players': (PLAYER_LIST_COLUMNS, PLAYER_LIST_FROM, PLAYER_LIST_ORDER, PLAYER_LIST_JOINS,
+                player_list_filters),
+    'matches': (MATCH_LIST_COLUMNS, MATCH_LIST_FROM, MATCH_LIST_ORDER, MATCH_LIST_JOINS,
+                match_list_filters),
+    'statistics': (
+        STATISTICS_EXPORT_COLUMNS,
+        '''player_statistics ps
+           JOIN players p ON p.id = ps.player_id
+           JOIN teams t ON t.id = p.team_id''',
+        [('ps.player_id', 'ASC')],
+        None,
+        player_list_filters
+    ),
+}
+
+EXPORT_MIMETYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson'
+}
+
+
+def stream_rows(query, params):
+    """Yield result rows as tuples in chunks of EXPORT_CHUNK_ROWS.
+
+    The query runs on its own pooled connection inside one read
+    transaction, so the export is a consistent snapshot and only one chunk
+    of rows is held in memory at a time. The connection goes back to the
+    pool when the generator finishes or is closed by a client disconnect.
+    """
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        conn.execute('BEGIN')
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(Config.EXPORT_CHUNK_ROWS)
+            if not rows:
+                break
+            yield rows
+    finally:
+        pool.release(conn)
+
+
+def encode_csv(fields, chunks):
+    """CSV text: a header line, then one write per chunk of rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def encode_ndjson(fields, chunks):
+    """One JSON object per line, one write per chunk of rows"""
+    for rows in chunks:
+        yield ''.join(
+            json.dumps(dict(zip(fields, row)), separators=(',', ':')) + '\n' for row in rows
+        )
+
+
+ENCODERS = {
+    'csv': encode_csv,
+    'ndjson': encode_ndjson
+}
+
+
+@export_bp.route('/<entity>.<any(csv, ndjson):fmt>', methods=['GET'])
+def export(entity, fmt):
+    """Stream every row of an entity as CSV or NDJSON.
+
+    Accepts the list endpoint's fields= and filter arguments; rows come in
+    the list endpoint's order, without pagination.
+    """
+    if entity not in EXPORTS:
+        return jsonify({'error': f"Unknown export; expected one of: {', '.join(EXPORTS)}"}), 404
+
+    columns, base_from, order_by, joins, filters = EXPORTS[entity]
+    try:
+        fields = parse_fields(columns)
+        conditions, params = filters() if filters else ([], [])
+    except ListQueryError as e:
+        return jsonify({'error': str(e)}), 400
+
+    query = select_query(columns, fields, base_from, order_by, joins, conditions)
+    body = ENCODERS[fmt](fields, stream_rows(query, tuple(params)))
+
+    return Response(
+        stream_with_context(body),
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={
+            'Content-Disposition': f'attachment; filename="{entity}.{fmt}"',
+            'Cache-Control': 'no-store'
+        }
+    )
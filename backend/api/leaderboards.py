@@ -0,0 +1,88 @@
+from flask import Blueprint, jsonify
+from backend.cache import cached_response
+from backend.database import execute_query
+from backend.config import Config
+from backend.api.listing import ListQueryError, int_arg
+
+leaderboards_bp = Blueprint('leaderboards', __name__, url_prefix='/api/leaderboards')
+
+# metric -> (ranked column, order, qualifying column, minimum, displayed counters).
+# Each ordering matches an idx_leaders_* index (migration 7) that also holds
+# the qualifying and displayed counters. The counting metrics' indexes are
+# covering. SQLite never plans an index on a generated column as covering,
+# so the rate plans show USING INDEX; their columns are still read from the
+# index and the deferred table seek is never taken.
+LEADERBOARDS = {
+    'runs': ('runs_scored', 'DESC', None, None, ('matches_played', 'balls_faced')),
+    'wickets': ('wickets_taken', 'DESC', None, None, ('matches_played', 'balls_bowled')),
+    'sixes': ('sixes', 'DESC', None, None, ('matches_played',)),
+    'catches': ('catches', 'DESC', None, None, ('matches_played',)),
+    'strike_rate': ('strike_rate', 'DESC', 'balls_faced', Config.LEADERBOARD_MIN_BALLS_FACED,
+                    ('matches_played', 'runs_scored', 'balls_faced')),
+    'batting_average': ('batting_average', 'DESC', 'times_out', Config.LEADERBOARD_MIN_DISMISSALS,
+                        ('matches_played', 'runs_scored', 'times_out')),
+    'economy': ('economy', 'ASC', 'balls_bowled', Config.LEADERBOARD_MIN_BALLS_BOWLED,
+                ('matches_played', 'wickets_taken', 'balls_bowled')),
+    'bowling_average': ('bowling_average', 'ASC', 'wickets_taken', Config.LEADERBOARD_MIN_WICKETS,
+                        ('matches_played', 'runs_conceded', 'wickets_taken')),
+}
+
+
+@leaderboards_bp.route('', methods=['GET'])
+def list_leaderboards():
+    """Available leaderboard metrics"""
+    return jsonify([
+        {'metric': metric, 'order': order.lower(), 'qualifier': qualifier, 'minimum': minimum}
+        for metric, (_, order, qualifier, minimum, _) in LEADERBOARDS.items()
+    ]), 200
+
+
+@leaderboards_bp.route('/<metric>', methods=['GET'])
+@cached_response('player_statistics', 'players', 'teams')
+def get_leaderboard(metric):
+    """Top players for one metric"""
+    if metric not in LEADERBOARDS:
+        return jsonify({
+            'error': f"Unknown metric; expected one of: {', '.join(LEADERBOARDS)}"
+        }), 404
+
+    column, order, qualifier, minimum, counters = LEADERBOARDS[metric]
+    try:
+        limit = int_arg('limit') or Config.LEADERBOARD_DEFAULT_LIMIT
+        if limit < 1:
+            raise ListQueryError('limit must be positive')
+        limit = min(limit, Config.LEADERBOARD_MAX_LIMIT)
+    except ListQueryError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Counting stats rank only players who have any; rates need a
+    # minimum sample and are NULL without one
+    conditions = [f'ps.{column} > 0' if qualifier is None else f'ps.{column} IS NOT NULL']
+    params = []
+    if qualifier is not None:
+        conditions.append(f'ps.{qualifier} >= ?')
+        params.append(minimum)
+
+    counter_columns = ''.join(f', ps.{counter}' for counter in counters if counter != column)
+    rows = execute_query(f'''
+        SELECT ps.player_id, p.name, p.team_id, t.name AS team_name, p.photo_path,
+               ps.{column} AS value{counter_columns}
+        FROM player_statistics ps
+        JOIN players p ON p.id = ps.player_id
+        JOIN teams t ON t.id = p.team_id
+        WHERE {' AND '.join(conditions)}
+        ORDER BY ps.{column} {order}, ps.player_id
+        LIMIT ?
+    ''', params + [limit])
+
+    for position, row in enumerate(rows, start=1):
+        row['rank'] = position
+        if isinstance(row['value'], float):
+            row['value'] = round(row['value'], 2)
+
+    return jsonify({
+        'metric': metric,
+        'qualifier': qualifier,
+        'minimum': minimum,
+        'leaders': rows
+    }), 200
@@ -0,0 +1,188 @@
+"""
+Shared helpers for the list endpoints: field projection (?fields=),
+server-side filters and keyset (cursor) pagination on each endpoint's
+ORDER BY keys.
+
+Responses stay plain JSON arrays. When a page is requested with ?limit=
+or ?cursor=, the cursor for the following page is returned in the
+X-Next-Cursor header and omitted on the last page.
+"""
+import base64
+import json
+from datetime import datetime
+from flask import request, jsonify
+from backend.config import Config
+from backend.database import execute_query
+
+
+class ListQueryError(ValueError):
+    """Raised when list query parameters are invalid"""
+
+
+def int_arg(name):
+    """Return an integer query argument, or None if absent"""
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ListQueryError(f'{name} must be an integer')
+
+
+def date_arg(name):
+    """Return a YYYY-MM-DD query argument, or None if absent"""
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise ListQueryError(f'{name} must be a date in YYYY-MM-DD format')
+    return value
+
+
+def parse_fields(columns):
+    """Return the output columns requested with ?fields=, or all of them"""
+    raw = request.args.get('fields')
+    if not raw:
+        return list(columns)
+
+    names = [name.strip() for name in raw.split(',') if name.strip()]
+    unknown = [name for name in names if name not in columns]
+    if unknown:
+        raise ListQueryError(f"Unknown field(s): {', '.join(unknown)}")
+    return list(dict.fromkeys(names))
+
+
+def encode_cursor(values):
+    """Encode ORDER BY key values as an opaque cursor token"""
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, size):
+    """Decode a cursor token back into its ORDER BY key values"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ListQueryError('Invalid cursor')
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ListQueryError('Invalid cursor')
+    return values
+
+
+def keyset_condition(order_by, values):
+    """Build a WHERE clause matching rows that sort after the cursor.
+
+    All keys must share one direction. Without NULLs a row-value comparison
+    is used so SQLite can seek straight into the ORDER BY index; otherwise
+    the comparison is expanded term by term, placing NULLs where SQLite
+    sorts them (first ascending, last descending).
+    """
+    directions = {direction for _, direction in order_by}
+    assert len(directions) == 1, 'keyset pagination needs a uniform sort direction'
+    descending = directions.pop() == 'DESC'
+    exprs = [expr for expr, _ in order_by]
+
+    if None not in values:
+        op = '<' if descending else '>'
+        placeholders = ', '.join('?' * len(values))
+        return f"({', '.join(exprs)}) {op} ({placeholders})", list(values)
+
+    clauses, params = [], []
+    for i, expr in enumerate(exprs):
+        terms = [f'{prev} IS ?' for prev in exprs[:i]]
+        term_params = list(values[:i])
+        value = values[i]
+
+        if descending:
+            if value is None:
+                continue
+            terms.append(f'({expr} < ? OR {expr} IS NULL)')
+            term_params.append(value)
+        elif value is None:
+            terms.append(f'{expr} IS NOT NULL')
+        else:
+            terms.append(f'{expr} > ?')
+            term_params.append(value)
+
+        clauses.append('(' + ' AND '.join(terms) + ')')
+        params.extend(term_params)
+
+    return '(' + (' OR '.join(clauses) or '0') + ')', params
+
+
+def select_query(columns, fields, base_from, order_by, joins=None, conditions=(), extra_select=()):
+    """Build the SELECT of a list query for the given output fields.
+
+    Only the joins that a selected column needs are added.
+    """
+    joins = joins or {}
+    select = [f'{columns[name][0]} AS {name}' for name in fields] + list(extra_select)
+    needed = {columns[name][1] for name in fields}
+    join_clauses = [clause for name, clause in joins.items() if name in needed]
+
+    query = f"SELECT {', '.join(select)} FROM {base_from} {' '.join(join_clauses)}"
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    query += ' ORDER BY ' + ', '.join(f'{expr} {direction}' for expr, direction in order_by)
+    return query
+
+
+def list_rows(columns, base_from, order_by, joins=None, conditions=(), params=()):
+    """Run a projected, filtered and optionally paginated list query.
+
+    columns maps output names to (SQL expression, optional join name);
+    joins maps join names to LEFT JOIN clauses that are only added when a
+    selected column needs them. Returns (rows, next_cursor).
+    """
+    fields = parse_fields(columns)
+    conditions = list(conditions)
+    params = list(params)
+
+    paginate = 'limit' in request.args or 'cursor' in request.args
+    if paginate:
+        limit = int_arg('limit') or Config.DEFAULT_PAGE_SIZE
+        if limit < 1:
+            raise ListQueryError('limit must be positive')
+        limit = min(limit, Config.MAX_PAGE_SIZE)
+
+        token = request.args.get('cursor')
+        if token:
+            values = decode_cursor(token, len(order_by))
+            condition, condition_params = keyset_condition(order_by, values)
+            conditions.append(condition)
+            params.extend(condition_params)
+
+    query = select_query(
+        columns, fields, base_from, order_by, joins, conditions,
+        extra_select=[f'{expr} AS _key{i}' for i, (expr, _) in enumerate(order_by)]
+    )
+    if paginate:
+        query += ' LIMIT ?'
+        params.append(limit + 1)
+
+    rows = execute_query(query, tuple(params))
+
+    next_cursor = None
+    if paginate and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last[f'_key{i}'] for i in range(len(order_by))])
+
+    for row in rows:
+        for i in range(len(order_by)):
+            del row[f'_key{i}']
+
+    return rows, next_cursor
+
+
+def list_response(rows, next_cursor):
+    """Build a JSON array response carrying the next-page cursor header"""
+    response = jsonify(rows)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response, 200
@@ -1,30 +1,149 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response
 from flask_login import login_required
 from backend.auth import admin_required
-from backend.database import execute_query, execute_single, execute_insert, execute_update, execute_delete
+from backend.cache import cached_response
+from backend.config import Config
+from backend.events import match_events, TooManySubscribers
+from backend.bracket import knockout_round_number
+from backend.scores import ALL_OUT_WICKETS, format_score, overs_to_balls, parse_score
+from backend.database import execute_query, execute_single, execute_insert, execute_update, transaction
+from backend.api.listing import ListQueryError, int_arg, date_arg, list_rows, list_response
 from datetime import datetime
 
 matches_bp = Blueprint('matches', __name__, url_prefix='/api/matches')
 
 
+# Output columns of GET /api/matches: name -> (SQL expression, join needed)
+MATCH_LIST_COLUMNS = {
+    'id': ('m.id', None),
+    'match_date': ('m.match_date', None),
+    'match_day': ('m.match_day', None),
+    'team_a_id': ('m.team_a_id', None),
+    'team_b_id': ('m.team_b_id', None),
+    'venue': ('m.venue', None),
+    'match_time': ('m.match_time', None),
+    'round': ('m.round', None),
+    'status': ('m.status', None),
+    'winner_id': ('m.winner_id', None),
+    'team_a_score': ('m.team_a_score', None),
+    'team_b_score': ('m.team_b_score', None),
+    'team_a_runs': ('m.team_a_runs', None),
+    'team_a_wickets': ('m.team_a_wickets', None),
+    'team_a_balls': ('m.team_a_balls', None),
+    'team_b_runs': ('m.team_b_runs', None),
+    'team_b_wickets': ('m.team_b_wickets', None),
+    'team_b_balls': ('m.team_b_balls', None),
+    'overs_limit': ('m.overs_limit', None),
+    'result_summary': ('m.result_summary', None),
+    'created_at': ('m.created_at', None),
+    'round_number': ('m.round_number', None),
+    'bracket_position': ('m.bracket_position', None),
+    'parent_match_id': ('m.parent_match_id', None),
+    'parent_slot': ('m.parent_slot', None),
+    'team_a_name': ('ta.name', None),
+    'team_a_logo': ('ta.logo_path', None),
+    'team_b_name': ('tb.name', None),
+    'team_b_logo': ('tb.logo_path', None),
+    'winner_name': ('w.name', 'winner')
+}
+MATCH_LIST_JOINS = {
+    'winner': 'LEFT JOIN teams w ON m.winner_id = w.id'
+}
+MATCH_LIST_ORDER = [('m.match_date', 'ASC'), ('m.match_time', 'ASC'), ('m.id', 'ASC')]
+
+# Match fields carried by the live feed's create/update events
+MATCH_EVENT_FIELDS = ('match_date', 'match_day', 'team_a_id', 'team_b_id',
+                      'venue', 'match_time', 'round', 'status')
+
+
+MATCH_LIST_FROM = '''matches m
+    LEFT JOIN teams ta ON m.team_a_id = ta.id
+    LEFT JOIN teams tb ON m.team_b_id = tb.id'''
+
+
+def match_list_filters():
+    """WHERE conditions and parameters for the match list query arguments"""
+    conditions, params = [], []
+
+    team_id = int_arg('team_id')
+    if team_id is not None:
+        conditions.append('(m.team_a_id = ? OR m.team_b_id = ?)')
+        params.extend([team_id, team_id])
+
+    for arg, column in (('status', 'm.status'), ('round', 'm.round')):
+        value = request.args.get(arg)
+        if value:
+            conditions.append(f'{column} = ?')
+            params.append(value)
+
+    date_from = date_arg('date_from')
+    if date_from:
+        conditions.append('m.match_date >= ?')
+        params.append(date_from)
+
+    date_to = date_arg('date_to')
+    if date_to:
+        conditions.append('m.match_date <= ?')
+        params.append(date_to)
+
+    return conditions, params
+
+
 @matches_bp.route('', methods=['GET'])
+@cached_response('matches', 'teams')
 def get_matches():
-    """Get all matches"""
-    matches = execute_query('''
-        SELECT m.*,
-               ta.name as team_a_name, ta.logo_path as team_a_logo,
-               tb.name as team_b_name, tb.logo_path as team_b_logo,
-               w.name as winner_name
-        FROM matches m
-        JOIN teams ta ON m.team_a_id = ta.id
-        JOIN teams tb ON m.team_b_id = tb.id
-        LEFT JOIN teams w ON m.winner_id = w.id
-        ORDER BY m.match_date ASC, m.match_time ASC
-    ''')
-    return jsonify(matches), 200
+    """Get all matches, optionally filtered, projected and paginated"""
+    try:
+        conditions, params = match_list_filters()
+        matches, next_cursor = list_rows(
+            MATCH_LIST_COLUMNS,
+            MATCH_LIST_FROM,
+            MATCH_LIST_ORDER,
+            joins=MATCH_LIST_JOINS,
+            conditions=conditions,
+            params=params
+        )
+    except ListQueryError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return list_response(matches, next_cursor)
+
+
+@matches_bp.route('/stream', methods=['GET'])
+def stream_matches():
+    """Live feed of match changes as Server-Sent Events.
+
+    Events: match.created, match.updated, match.result and match.score
+    (ball-by-ball scoring) carry the changed fields, match.deleted the id;
+    reset asks the client to re-fetch /api/matches. Reconnects resume from Last-Event-ID.
+    """
+    if request.method == 'HEAD':
+        # No body follows, so there is nothing to subscribe for
+        response = Response(mimetype='text/event-stream')
+    else:
+        try:
+            subscriber = match_events.subscribe(
+                request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+            )
+        except TooManySubscribers:
+            response = jsonify({'error': 'Too many live feed connections'})
+            response.headers['Retry-After'] = '30'
+            return response, 503
+
+        response = Response(
+            match_events.stream(subscriber, Config.EVENT_HEARTBEAT_SECONDS),
+            mimetype='text/event-stream'
+        )
+        # The server closes the response however the stream ends, including
+        # when the client disconnects before the first chunk
+        response.call_on_close(lambda: match_events.unsubscribe(subscriber))
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 
 @matches_bp.route('/<int:match_id>', methods=['GET'])
+@cached_response('matches', 'teams')
 def get_match(match_id):
     """Get single match details"""
     match = execute_single('''
@@ -33,8 +152,8 @@ def get_match(match_id):
                tb.name as team_b_name, tb.logo_path as team_b_logo,
                w.name as winner_name
         FROM matches m
-        JOIN teams ta ON m.team_a_id = ta.id
-        JOIN teams tb ON m.team_b_id = tb.id
+        LEFT JOIN teams ta ON m.team_a_id = ta.id
+        LEFT JOIN teams tb ON m.team_b_id = tb.id
         LEFT JOIN teams w ON m.winner_id = w.id
         WHERE m.id = ?
     ''', (match_id,))
@@ -46,6 +165,7 @@ def get_match(match_id):
 
 
 @matches_bp.route('/round/<string:round_name>', methods=['GET'])
+@cached_response('matches', 'teams')
 def get_matches_by_round(round_name):
     """Get matches by round"""
     matches = execute_query('''
@@ -54,8 +174,8 @@ def get_matches_by_round(round_name):
                tb.name as team_b_name, tb.logo_path as team_b_logo,
                w.name as winner_name
         FROM matches m
-        JOIN teams ta ON m.team_a_id = ta.id
-        JOIN teams tb ON m.team_b_id = tb.id
+        LEFT JOIN teams ta ON m.team_a_id = ta.id
+        LEFT JOIN teams tb ON m.team_b_id = tb.id
         LEFT JOIN teams w ON m.winner_id = w.id
         WHERE m.round = ?
         ORDER BY m.match_date ASC, m.match_time ASC
@@ -77,8 +197,9 @@ def create_match():
     try:
         match_id = execute_insert('''
             INSERT INTO matches
-            (match_date, match_day, team_a_id, team_b_id, venue, match_time, round, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            (match_date, match_day, team_a_id, team_b_id, venue, match_time, round, status,
+             round_number)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             data['match_date'],
             data['match_day'],
@@ -87,9 +208,14 @@ def create_match():
             data.get('venue'),
             data.get('match_time'),
             data['round'],
-            data.get('status', 'scheduled')
+            data.get('status', 'scheduled'),
+            knockout_round_number(data['round'])
         ))
 
+        event = {field: data.get(field) for field in MATCH_EVENT_FIELDS}
+        event['status'] = event['status'] or 'scheduled'
+        match_events.publish('match.created', dict(event, id=match_id))
+
         return jsonify({
             'message': 'Match created successfully',
             'match_id': match_id
@@ -111,7 +237,8 @@ def update_match(match_id):
         affected = execute_update('''
             UPDATE matches
             SET match_date = ?, match_day = ?, team_a_id = ?, team_b_id = ?,
-                venue = ?, match_time = ?, round = ?, status = ?
+                venue = ?, match_time = ?, round = ?, status = ?,
+                round_number = CASE WHEN round IS ? THEN round_number ELSE ? END
             WHERE id = ?
         ''', (
             data.get('match_date'),
@@ -122,43 +249,157 @@ def update_match(match_id):
             data.get('match_time'),
             data.get('round'),
             data.get('status'),
+            data.get('round'),
+            knockout_round_number(data.get('round')),
             match_id
         ))
 
         if affected == 0:
             return jsonify({'error': 'Match not found'}), 404
 
+        event = {field: data.get(field) for field in MATCH_EVENT_FIELDS}
+        match_events.publish('match.updated', dict(event, id=match_id))
+
         return jsonify({'message': 'Match updated successfully'}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+def _optional_int(data, field, minimum, maximum=None):
+    """Integer field of a request body, or None when absent"""
+    value = data.get(field)
+    if value in (None, ''):
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{field} must be an integer')
+    if value < minimum or (maximum is not None and value > maximum):
+        raise ValueError(f'{field} must be between {minimum} and {maximum}' if maximum is not None
+                         else f'{field} must be at least {minimum}')
+    return value
+
+
+INNINGS_FIELDS = ('runs', 'wickets', 'balls', 'overs', 'score')
+
+
+def result_innings(data, side):
+    """(runs, wickets, balls, display text) of one side of a result.
+
+    Takes team_<side>_runs with optional _wickets and _balls or _overs
+    ("19.4"); otherwise team_<side>_score is parsed. Score text that is not
+    a score (e.g. "DNB") is kept as given, without numbers. Returns None
+    when the side is not in data at all, so its stored score is kept.
+    """
+    prefix = f'team_{side}_'
+    if not any(prefix + field in data for field in INNINGS_FIELDS):
+        return None
+    runs = _optional_int(data, prefix + 'runs', 0)
+    if runs is None:
+        text = data.get(prefix + 'score')
+        parsed = parse_score(text)
+        if parsed is None:
+            return None, None, None, text
+        return parsed + (format_score(*parsed),)
+
+    wickets = _optional_int(data, prefix + 'wickets', 0, ALL_OUT_WICKETS) or 0
+    balls = _optional_int(data, prefix + 'balls', 0)
+    if balls is None and data.get(prefix + 'overs') not in (None, ''):
+        balls = overs_to_balls(data[prefix + 'overs'])
+    return runs, wickets, balls, format_score(runs, wickets, balls)
+
+
 @matches_bp.route('/<int:match_id>/result', methods=['PUT'])
 @admin_required
 def update_result(match_id):
-    """Update match result (admin only)"""
+    """Update match result (admin only)
+
+    Each side's score is given as runs, wickets and balls or overs, or as
+    score text that is parsed into them; the stored display text is
+    derived from the numbers. overs_limit (overs per innings) lets a side
+    that was bowled out count its full quota in the net run rate.
+
+    In a generated bracket the winner is advanced into the next round's
+    match by a trigger, in the same transaction.
+    """
     data = request.get_json()
 
     if not data:
         return jsonify({'error': 'No data provided'}), 400
 
+    winner_id = data.get('winner_id')
     try:
-        affected = execute_update('''
-            UPDATE matches
-            SET winner_id = ?, team_a_score = ?, team_b_score = ?,
-                result_summary = ?, status = ?
-            WHERE id = ?
-        ''', (
-            data.get('winner_id'),
-            data.get('team_a_score'),
-            data.get('team_b_score'),
-            data.get('result_summary'),
-            'completed',
-            match_id
-        ))
+        winner_id = int(winner_id) if winner_id not in (None, '') else None
+    except (TypeError, ValueError):
+        return jsonify({'error': 'winner_id must be a team ID'}), 400
 
-        if affected == 0:
-            return jsonify({'error': 'Match not found'}), 404
+    try:
+        team_a = result_innings(data, 'a')
+        team_b = result_innings(data, 'b')
+        overs_limit = _optional_int(data, 'overs_limit', 1, Config.MAX_OVERS_PER_INNINGS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        with transaction() as cursor:
+            match = cursor.execute('''
+                SELECT m.team_a_id, m.team_b_id, m.winner_id, m.parent_match_id,
+                       p.status AS parent_status
+                FROM matches m
+                LEFT JOIN matches p ON m.parent_match_id = p.id
+                WHERE m.id = ?
+            ''', (match_id,)).fetchone()
+
+            if match is None:
+                return jsonify({'error': 'Match not found'}), 404
+            if winner_id is not None and winner_id not in (match['team_a_id'], match['team_b_id']):
+                return jsonify({'error': 'Winner must be one of the two teams'}), 400
+            if match['parent_status'] == 'completed' and winner_id != match['winner_id']:
+                return jsonify({'error': 'The next-round match has already been played'}), 409
+
+            # A side left out of the request keeps its stored score, e.g.
+            # the one kept by the ball-by-ball triggers
+            assignments, params = [], []
+            for side, innings in (('a', team_a), ('b', team_b)):
+                if innings is not None:
+                    assignments.append(f'team_{side}_runs = ?, team_{side}_wickets = ?, '
+                                       f'team_{side}_balls = ?, team_{side}_score = ?')
+                    params.extend(innings)
+            cursor.execute(f'''
+                UPDATE matches
+                SET winner_id = ?, {''.join(assignment + ', ' for assignment in assignments)}
+                    overs_limit = COALESCE(?, overs_limit),
+                    result_summary = ?, status = ?
+                WHERE id = ?
+            ''', (
+                winner_id,
+                *params,
+                overs_limit,
+                data.get('result_summary'),
+                'completed',
+                match_id
+            ))
+            scores = cursor.execute(
+                'SELECT team_a_score, team_b_score FROM matches WHERE id = ?', (match_id,)
+            ).fetchone()
+
+            parent = None
+            if match['parent_match_id'] is not None:
+                parent = cursor.execute(
+                    'SELECT id, team_a_id, team_b_id FROM matches WHERE id = ?',
+                    (match['parent_match_id'],)
+                ).fetchone()
+
+        match_events.publish('match.result', {
+            'id': match_id,
+            'status': 'completed',
+            'winner_id': winner_id,
+            'team_a_score': scores['team_a_score'],
+            'team_b_score': scores['team_b_score'],
+            'result_summary': data.get('result_summary')
+        })
+        if parent is not None:
+            match_events.publish('match.updated', dict(parent))
 
         return jsonify({'message': 'Match result updated successfully'}), 200
     except Exception as e:
@@ -170,11 +411,15 @@ def update_result(match_id):
 def delete_match(match_id):
     """Delete match (admin only)"""
     try:
-        affected = execute_delete('DELETE FROM matches WHERE id = ?', (match_id,))
+        # A trigger removes the match's deliveries and reverses their statistics
+        with transaction() as cursor:
+            affected = cursor.execute('DELETE FROM matches WHERE id = ?', (match_id,)).rowcount
 
         if affected == 0:
             return jsonify({'error': 'Match not found'}), 404
 
+        match_events.publish('match.deleted', {'id': match_id})
+
         return jsonify({'message': 'Match deleted successfully'}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1,11 +1,16 @@
 from flask import Blueprint, request, jsonify
 from flask_login import login_required
-from werkzeug.utils import secure_filename
-import os
+import io
+import csv
 import time
 from backend.auth import admin_required
-from backend.database import execute_query, execute_single, execute_insert, execute_update, execute_delete
+from backend.cache import cached_response
+from backend.database import (
+    execute_query, execute_single, execute_update, execute_delete, transaction
+)
 from backend.config import Config
+from backend.images import queue_upload
+from backend.api.listing import ListQueryError, int_arg, list_rows, list_response
 
 players_bp = Blueprint('players', __name__, url_prefix='/api/players')
 
@@ -16,22 +21,73 @@ def allowed_file(filename):
            filename.rsplit('.', 1)[1].lower() in Config.ALLOWED_EXTENSIONS
 
 
+# Output columns of GET /api/players: name -> (SQL expression, join needed)
+PLAYER_LIST_COLUMNS = {
+    'id': ('p.id', None),
+    'name': ('p.name', None),
+    'team_id': ('p.team_id', None),
+    'photo_path': ('p.photo_path', None),
+    'role': ('p.role', None),
+    'jersey_number': ('p.jersey_number', None),
+    'batting_style': ('p.batting_style', None),
+    'bowling_style': ('p.bowling_style', None),
+    'created_at': ('p.created_at', None),
+    'team_name': ('t.name', None),
+    'matches_played': ('ps.matches_played', 'ps'),
+    'runs_scored': ('ps.runs_scored', 'ps'),
+    'wickets_taken': ('ps.wickets_taken', 'ps'),
+    'fours': ('ps.fours', 'ps'),
+    'sixes': ('ps.sixes', 'ps'),
+    'catches': ('ps.catches', 'ps')
+}
+PLAYER_LIST_JOINS = {
+    'ps': 'LEFT JOIN player_statistics ps ON p.id = ps.player_id'
+}
+PLAYER_LIST_ORDER = [('p.created_at', 'DESC'), ('p.id', 'DESC')]
+
+
+PLAYER_LIST_FROM = 'players p JOIN teams t ON p.team_id = t.id'
+
+
+def player_list_filters():
+    """WHERE conditions and parameters for the player list query arguments"""
+    conditions, params = [], []
+
+    team_id = int_arg('team_id')
+    if team_id is not None:
+        conditions.append('p.team_id = ?')
+        params.append(team_id)
+
+    role = request.args.get('role')
+    if role:
+        conditions.append('p.role = ?')
+        params.append(role)
+
+    return conditions, params
+
+
 @players_bp.route('', methods=['GET'])
+@cached_response('players', 'teams', 'player_statistics')
 def get_players():
-    """Get all players"""
-    players = execute_query('''
-        SELECT p.*, t.name as team_name,
-               ps.matches_played, ps.runs_scored, ps.wickets_taken,
-               ps.fours, ps.sixes, ps.catches
-        FROM players p
-        JOIN teams t ON p.team_id = t.id
-        LEFT JOIN player_statistics ps ON p.id = ps.player_id
-        ORDER BY p.created_at DESC
-    ''')
-    return jsonify(players), 200
+    """Get all players, optionally filtered, projected and paginated"""
+    try:
+        conditions, params = player_list_filters()
+        players, next_cursor = list_rows(
+            PLAYER_LIST_COLUMNS,
+            PLAYER_LIST_FROM,
+            PLAYER_LIST_ORDER,
+            joins=PLAYER_LIST_JOINS,
+            conditions=conditions,
+            params=params
+        )
+    except ListQueryError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return list_response(players, next_cursor)
 
 
 @players_bp.route('/<int:player_id>', methods=['GET'])
+@cached_response('players', 'teams', 'player_statistics')
 def get_player(player_id):
     """Get single player with full statistics"""
     player = execute_single('''
@@ -50,6 +106,7 @@ def get_player(player_id):
 
 
 @players_bp.route('/team/<int:team_id>', methods=['GET'])
+@cached_response('players', 'player_statistics')
 def get_team_players(team_id):
     """Get all players for a specific team"""
     players = execute_query('''
@@ -73,23 +130,25 @@ def create_player():
         return jsonify({'error': 'Name, team_id, and role are required'}), 400
 
     try:
-        player_id = execute_insert('''
-            INSERT INTO players (name, team_id, role, jersey_number, batting_style, bowling_style)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            data['name'],
-            data['team_id'],
-            data['role'],
-            data.get('jersey_number'),
-            data.get('batting_style'),
-            data.get('bowling_style')
-        ))
-
-        # Create initial statistics record
-        execute_insert(
-            'INSERT INTO player_statistics (player_id) VALUES (?)',
-            (player_id,)
-        )
+        with transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO players (name, team_id, role, jersey_number, batting_style, bowling_style)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (
+                data['name'],
+                data['team_id'],
+                data['role'],
+                data.get('jersey_number'),
+                data.get('batting_style'),
+                data.get('bowling_style')
+            ))
+            player_id = cursor.lastrowid
+
+            # Create initial statistics record
+            cursor.execute(
+                'INSERT INTO player_statistics (player_id) VALUES (?)',
+                (player_id,)
+            )
 
         return jsonify({
             'message': 'Player created successfully',
@@ -99,6 +158,129 @@ def create_player():
         return jsonify({'error': str(e)}), 500
 
 
+def _read_bulk_rows():
+    """Read player rows from a JSON body, a CSV body or an uploaded CSV file"""
+    if 'file' in request.files:
+        return list(csv.DictReader(io.StringIO(
+            request.files['file'].read().decode('utf-8-sig')
+        )))
+
+    if request.mimetype == 'text/csv':
+        return list(csv.DictReader(io.StringIO(
+            request.get_data(as_text=True).lstrip('\ufeff')
+        )))
+
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('players')
+    return data
+
+
+def _validate_bulk_rows(rows):
+    """Validate import rows, returning (insert parameters, errors)"""
+    # Resolve every referenced team in a single query
+    team_ids = {}
+    for team in execute_query('SELECT id, name FROM teams'):
+        team_ids[team['id']] = team['id']
+        team_ids[team['name'].lower()] = team['id']
+
+    values, errors = [], []
+    for index, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors.append({'row': index, 'error': 'Row must be an object'})
+            continue
+
+        name = (row.get('name') or '').strip()
+        role = (row.get('role') or '').strip()
+        if not name or not role:
+            errors.append({'row': index, 'error': 'Name and role are required'})
+            continue
+
+        team_id = None
+        if row.get('team_id') not in (None, ''):
+            try:
+                team_id = team_ids.get(int(row['team_id']))
+            except (TypeError, ValueError):
+                pass
+        elif row.get('team_name'):
+            team_id = team_ids.get(str(row['team_name']).strip().lower())
+        if team_id is None:
+            errors.append({'row': index, 'error': 'Unknown or missing team'})
+            continue
+
+        jersey_number = row.get('jersey_number')
+        if jersey_number in (None, ''):
+            jersey_number = None
+        else:
+            try:
+                jersey_number = int(jersey_number)
+            except (TypeError, ValueError):
+                errors.append({'row': index, 'error': 'jersey_number must be an integer'})
+                continue
+
+        values.append((
+            name,
+            team_id,
+            role,
+            jersey_number,
+            row.get('batting_style') or None,
+            row.get('bowling_style') or None
+        ))
+
+    return values, errors
+
+
+@players_bp.route('/bulk', methods=['POST'])
+@admin_required
+def bulk_create_players():
+    """Import many players at once as JSON or CSV (admin only)
+
+    Every row is validated before anything is written; players and their
+    statistics rows are then inserted in a single transaction.
+    """
+    try:
+        rows = _read_bulk_rows()
+    except (UnicodeDecodeError, csv.Error):
+        return jsonify({'error': 'Could not parse CSV data'}), 400
+
+    if not isinstance(rows, list) or len(rows) == 0:
+        return jsonify({'error': 'No players provided'}), 400
+
+    if len(rows) > Config.BULK_IMPORT_MAX_ROWS:
+        return jsonify({
+            'error': f'At most {Config.BULK_IMPORT_MAX_ROWS} players per import'
+        }), 400
+
+    values, errors = _validate_bulk_rows(rows)
+    if errors:
+        return jsonify({'error': 'Validation failed', 'errors': errors}), 400
+
+    try:
+        with transaction() as cursor:
+            cursor.executemany('''
+                INSERT INTO players (name, team_id, role, jersey_number, batting_style, bowling_style)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', values)
+
+            # The write lock is held since BEGIN IMMEDIATE, so the new
+            # AUTOINCREMENT ids are the contiguous range ending here
+            last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+            first_id = last_id - len(values) + 1
+
+            cursor.execute('''
+                INSERT INTO player_statistics (player_id)
+                SELECT id FROM players WHERE id BETWEEN ? AND ?
+            ''', (first_id, last_id))
+
+        return jsonify({
+            'message': f'{len(values)} player(s) created successfully',
+            'created_count': len(values),
+            'player_ids': list(range(first_id, last_id + 1))
+        }), 201
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @players_bp.route('/<int:player_id>', methods=['PUT'])
 @admin_required
 def update_player(player_id):
@@ -191,60 +373,63 @@ def upload_photo(player_id):
     if not allowed_file(file.filename):
         return jsonify({'error': 'Invalid file type'}), 400
 
-    try:
-        # Create unique filename
-        filename = secure_filename(file.filename)
-        ext = filename.rsplit('.', 1)[1].lower()
-        unique_filename = f"{player_id}_{int(time.time())}.{ext}"
-        filepath = os.path.join(Config.PLAYER_UPLOAD_FOLDER, unique_filename)
-
-        # Save file
-        file.save(filepath)
-
-        # Update database
-        photo_path = f"uploads/players/{unique_filename}"
+    def record(variants):
         execute_update(
             'UPDATE players SET photo_path = ? WHERE id = ?',
-            (photo_path, player_id)
+            (variants['medium'], player_id)
         )
 
+    try:
+        # Save the upload; resizing and WebP encoding run in the background
+        # and photo_path is switched to the new image once they succeed
+        variants = queue_upload(file, Config.PLAYER_UPLOAD_FOLDER, 'uploads/players',
+                                f"{player_id}_{int(time.time())}", on_success=record)
+
         return jsonify({
-            'message': 'Photo uploaded successfully',
-            'photo_path': photo_path
-        }), 200
+            'message': 'Photo uploaded; it replaces the current photo once processed',
+            'photo_path': variants['medium'],
+            'variants': variants
+        }), 202
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+STAT_FIELDS = ('matches_played', 'runs_scored', 'balls_faced', 'fours', 'sixes', 'wickets_taken',
+               'balls_bowled', 'runs_conceded', 'catches', 'stumpings', 'times_out')
+
+
 @players_bp.route('/<int:player_id>/stats', methods=['PUT'])
 @admin_required
 def update_stats(player_id):
-    """Update player statistics (admin only)"""
+    """Update player statistics (admin only)
+
+    Only the counters present in the request are changed. A counter sent
+    as null is stored as 0: times_out is NOT NULL and the deliveries
+    triggers add to every counter.
+    """
     data = request.get_json()
 
     if not data:
         return jsonify({'error': 'No data provided'}), 400
 
+    fields = [field for field in STAT_FIELDS if field in data]
+    if not fields:
+        return jsonify({'error': f"Provide at least one of: {', '.join(STAT_FIELDS)}"}), 400
     try:
-        affected = execute_update('''
+        values = [int(data[field] or 0) for field in fields]
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Statistics must be whole numbers'}), 400
+    if any(value < 0 for value in values):
+        return jsonify({'error': 'Statistics cannot be negative'}), 400
+
+    try:
+        affected = execute_update(f'''
             UPDATE player_statistics
-            SET matches_played = ?, runs_scored = ?, balls_faced = ?,
-                fours = ?, sixes = ?, wickets_taken = ?, balls_bowled = ?,
-                runs_conceded = ?, catches = ?, stumpings = ?
+            SET {', '.join(f'{field} = ?' for field in fields)}
             WHERE player_id = ?
-        ''', (
-            data.get('matches_played', 0),
-            data.get('runs_scored', 0),
-            data.get('balls_faced', 0),
-            data.get('fours', 0),
-            data.get('sixes', 0),
-            data.get('wickets_taken', 0),
-            data.get('balls_bowled', 0),
-            data.get('runs_conceded', 0),
-            data.get('catches', 0),
-            data.get('stumpings', 0),
-            player_id
-        ))
+        ''', (*values, player_id))
 
         if affected == 0:
             return jsonify({'error': 'Player statistics not found'}), 404
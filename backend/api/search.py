@@ -0,0 +1,94 @@
+from flask import Blueprint, request, jsonify
+import re
+from backend.cache import cached_response
+from backend.database import execute_query
+from backend.config import Config
+from backend.api.listing import ListQueryError, int_arg
+
+search_bp = Blueprint('search', __name__, url_prefix='/api/search')
+
+# bm25 weights per indexed column: a hit in the name outranks the others
+PLAYER_SEARCH_WEIGHTS = (10.0, 2.0, 1.0, 1.0)   # name, role, batting_style, bowling_style
+TEAM_SEARCH_WEIGHTS = (10.0, 3.0, 2.0)          # name, coach_name, home_ground
+
+SEARCH_TYPES = ('players', 'teams')
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def build_match_query(text):
+    """FTS5 query matching rows that contain every term as a prefix.
+
+    Each word of the input becomes a quoted FTS5 string, so operators and
+    punctuation typed by the user are never interpreted. Every term is a
+    prefix match, which lets "vir koh" find "Virat Kohli" while typing.
+    """
+    terms = _TERM_RE.findall(text)[:Config.SEARCH_MAX_TERMS]
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def _weights(weights):
+    return f"bm25({', '.join(str(weight) for weight in weights)})"
+
+
+def search_players(match, limit):
+    """Best-ranked players for an FTS5 query"""
+    return execute_query(f'''
+        WITH hits AS (
+            SELECT rowid, rank FROM players_fts
+            WHERE players_fts MATCH ? AND rank MATCH '{_weights(PLAYER_SEARCH_WEIGHTS)}'
+            ORDER BY rank
+            LIMIT ?
+        )
+        SELECT p.id, p.name, p.role, p.batting_style, p.bowling_style, p.jersey_number,
+               p.photo_path, p.team_id, t.name AS team_name
+        FROM hits
+        JOIN players p ON p.id = hits.rowid
+        JOIN teams t ON t.id = p.team_id
+        ORDER BY hits.rank
+    ''', (match, limit))
+
+
+def search_teams(match, limit):
+    """Best-ranked teams for an FTS5 query"""
+    return execute_query(f'''
+        WITH hits AS (
+            SELECT rowid, rank FROM teams_fts
+            WHERE teams_fts MATCH ? AND rank MATCH '{_weights(TEAM_SEARCH_WEIGHTS)}'
+            ORDER BY rank
+            LIMIT ?
+        )
+        SELECT t.id, t.name, t.logo_path, t.coach_name, t.home_ground, t.player_count
+        FROM hits
+        JOIN teams t ON t.id = hits.rowid
+        ORDER BY hits.rank
+    ''', (match, limit))
+
+
+@search_bp.route('', methods=['GET'])
+@cached_response('players', 'teams')
+def search():
+    """Ranked type-ahead search over players and teams"""
+    try:
+        limit = int_arg('limit') or Config.SEARCH_DEFAULT_LIMIT
+        if limit < 1:
+            raise ListQueryError('limit must be positive')
+        limit = min(limit, Config.SEARCH_MAX_LIMIT)
+    except ListQueryError as e:
+        return jsonify({'error': str(e)}), 400
+
+    search_type = request.args.get('type')
+    if search_type and search_type not in SEARCH_TYPES:
+        return jsonify({'error': f"type must be one of: {', '.join(SEARCH_TYPES)}"}), 400
+
+    query = request.args.get('q', '').strip()
+    match = build_match_query(query)
+    if not match:
+        return jsonify({'error': 'q must contain at least one letter or digit'}), 400
+
+    results = {'query': query}
+    if search_type in (None, 'players'):
+        results['players'] = search_players(match, limit)
+    if search_type in (None, 'teams'):
+        results['teams'] = search_teams(match, limit)
+    return jsonify(results), 200
@@ -1,11 +1,12 @@
 from flask import Blueprint, request, jsonify
 from flask_login import login_required
-from werkzeug.utils import secure_filename
-import os
 import time
 from backend.auth import admin_required
+from backend.cache import cached_response
 from backend.database import execute_query, execute_single, execute_insert, execute_update, execute_delete
 from backend.config import Config
+from backend.images import queue_upload
+from backend.api.listing import ListQueryError, list_rows, list_response
 
 teams_bp = Blueprint('teams', __name__, url_prefix='/api/teams')
 
@@ -16,20 +17,43 @@ def allowed_file(filename):
            filename.rsplit('.', 1)[1].lower() in Config.ALLOWED_EXTENSIONS
 
 
+# Output columns of GET /api/teams: name -> (SQL expression, join needed)
+TEAM_LIST_COLUMNS = {
+    'id': ('t.id', None),
+    'name': ('t.name', None),
+    'logo_path': ('t.logo_path', None),
+    'captain_id': ('t.captain_id', None),
+    'coach_name': ('t.coach_name', None),
+    'home_ground': ('t.home_ground', None),
+    'created_at': ('t.created_at', None),
+    'captain_name': ('p.name', 'captain'),
+    'player_count': ('t.player_count', None)
+}
+TEAM_LIST_JOINS = {
+    'captain': 'LEFT JOIN players p ON t.captain_id = p.id'
+}
+TEAM_LIST_ORDER = [('t.created_at', 'DESC'), ('t.id', 'DESC')]
+
+
 @teams_bp.route('', methods=['GET'])
+@cached_response('teams', 'players')
 def get_teams():
-    """Get all teams"""
-    teams = execute_query('''
-        SELECT t.*, p.name as captain_name,
-               (SELECT COUNT(*) FROM players WHERE team_id = t.id) as player_count
-        FROM teams t
-        LEFT JOIN players p ON t.captain_id = p.id
-        ORDER BY t.created_at DESC
-    ''')
-    return jsonify(teams), 200
+    """Get all teams, optionally projected and paginated"""
+    try:
+        teams, next_cursor = list_rows(
+            TEAM_LIST_COLUMNS,
+            'teams t',
+            TEAM_LIST_ORDER,
+            joins=TEAM_LIST_JOINS
+        )
+    except ListQueryError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return list_response(teams, next_cursor)
 
 
 @teams_bp.route('/<int:team_id>', methods=['GET'])
+@cached_response('teams', 'players')
 def get_team(team_id):
     """Get single team with details"""
     team = execute_single('''
@@ -139,26 +163,24 @@ def upload_logo(team_id):
     if not allowed_file(file.filename):
         return jsonify({'error': 'Invalid file type'}), 400
 
-    try:
-        # Create unique filename
-        filename = secure_filename(file.filename)
-        ext = filename.rsplit('.', 1)[1].lower()
-        unique_filename = f"{team_id}_{int(time.time())}.{ext}"
-        filepath = os.path.join(Config.TEAM_UPLOAD_FOLDER, unique_filename)
-
-        # Save file
-        file.save(filepath)
-
-        # Update database
-        logo_path = f"uploads/teams/{unique_filename}"
+    def record(variants):
         execute_update(
             'UPDATE teams SET logo_path = ? WHERE id = ?',
-            (logo_path, team_id)
+            (variants['medium'], team_id)
         )
 
+    try:
+        # Save the upload; resizing and WebP encoding run in the background
+        # and logo_path is switched to the new image once they succeed
+        variants = queue_upload(file, Config.TEAM_UPLOAD_FOLDER, 'uploads/teams',
+                                f"{team_id}_{int(time.time())}", on_success=record)
+
         return jsonify({
-            'message': 'Logo uploaded successfully',
-            'logo_path': logo_path
-        }), 200
+            'message': 'Logo uploaded; it replaces the current logo once processed',
+            'logo_path': variants['medium'],
+            'variants': variants
+        }), 202
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
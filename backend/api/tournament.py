@@ -1,13 +1,23 @@
 from flask import Blueprint, request, jsonify
 from flask_login import login_required
 from backend.auth import admin_required
-from backend.database import execute_query, execute_single, execute_update, execute_insert
+from backend.cache import cached_response
+from backend.database import execute_query, execute_single, execute_update, transaction
+from backend.bracket import plan_bracket
+from backend.scheduler import plan_group_stage, WEEKDAYS
+from backend.schedule_import import normalize_time
+from backend.config import Config
+from backend.events import match_events
+import re
 from datetime import datetime, timedelta
 
 tournament_bp = Blueprint('tournament', __name__, url_prefix='/api/tournament')
 
+_HHMM_RE = re.compile(r'^([01]\d|2[0-3]):[0-5]\d$')
+
 
 @tournament_bp.route('/settings', methods=['GET'])
+@cached_response('tournament_settings')
 def get_settings():
     """Get tournament settings"""
     settings = execute_single(
@@ -58,6 +68,7 @@ def update_settings():
 
 
 @tournament_bp.route('/bracket', methods=['GET'])
+@cached_response('matches', 'teams')
 def get_bracket():
     """Get tournament bracket structure"""
     matches = execute_query('''
@@ -66,150 +77,310 @@ def get_bracket():
                tb.name as team_b_name, tb.logo_path as team_b_logo,
                w.name as winner_name
         FROM matches m
-        JOIN teams ta ON m.team_a_id = ta.id
-        JOIN teams tb ON m.team_b_id = tb.id
+        LEFT JOIN teams ta ON m.team_a_id = ta.id
+        LEFT JOIN teams tb ON m.team_b_id = tb.id
         LEFT JOIN teams w ON m.winner_id = w.id
-        ORDER BY
-            CASE m.round
-                WHEN 'Final' THEN 4
-                WHEN 'Semi-Final' THEN 3
-                WHEN 'Round 2' THEN 2
-                WHEN 'Round 1' THEN 1
-                ELSE 0
-            END,
-            m.match_date, m.match_time
+        WHERE m.round_number IS NOT NULL
+        ORDER BY m.round_number, m.bracket_position, m.match_date, m.match_time
     ''')
 
-    # Organize matches by round
-    bracket = {
-        'Round 1': [],
-        'Round 2': [],
-        'Semi-Final': [],
-        'Final': []
-    }
-
+    # Organize matches by round; each match carries its round_number
+    bracket = {}
     for match in matches:
-        round_name = match['round']
-        if round_name in bracket:
-            bracket[round_name].append(match)
+        bracket.setdefault(match['round'], []).append(match)
 
     return jsonify(bracket), 200
 
 
+@tournament_bp.route('/standings', methods=['GET'])
+@cached_response('matches', 'teams')
+def get_standings():
+    """Get group stage points tables, optionally for a single group
+
+    Teams level on points are ranked by net run rate, then wins.
+    """
+    query = '''
+        SELECT s.group_name, s.team_id, t.name as team_name, t.logo_path as team_logo,
+               s.played, s.won, s.lost, s.no_result, s.points,
+               s.runs_for, s.balls_for, s.runs_against, s.balls_against, s.net_run_rate
+        FROM standings s
+        JOIN teams t ON s.team_id = t.id
+    '''
+    params = ()
+
+    group = request.args.get('group')
+    if group:
+        query += ' WHERE s.group_name = ?'
+        params = (group,)
+
+    rows = execute_query(
+        query + ' ORDER BY s.group_name, s.points DESC, s.net_run_rate DESC, s.won DESC, s.team_id',
+        params
+    )
+
+    # Organize rows by group, numbering positions within each table
+    standings = {}
+    for row in rows:
+        table = standings.setdefault(row.pop('group_name'), [])
+        row['position'] = len(table) + 1
+        if row['net_run_rate'] is not None:
+            row['net_run_rate'] = round(row['net_run_rate'], 3)
+        table.append(row)
+
+    return jsonify(standings), 200
+
+
 @tournament_bp.route('/generate', methods=['POST'])
 @admin_required
 def generate_bracket():
-    """Auto-generate tournament bracket (admin only)"""
-    data = request.get_json()
+    """Generate a knockout bracket for any number of teams (admin only)
+
+    Optional team_ids lists the teams in seed order; otherwise every team
+    is seeded by group standings (seeding: "standings") or at random.
+    Byes go to the top seeds. The whole bracket is written in one
+    transaction with one batched insert per round; later-round team slots
+    stay empty until update_result advances the winners. clear_existing
+    replaces the current knockout matches (group matches are kept); it is
+    refused once any of them has been started or completed.
+    """
+    data = request.get_json(silent=True)
 
     if not data or not data.get('start_date'):
         return jsonify({'error': 'Start date required'}), 400
 
-    # Get all teams
-    teams = execute_query('SELECT id, name FROM teams ORDER BY RANDOM()')
-    team_count = len(teams)
-
-    if team_count < 2:
+    try:
+        start_date = datetime.strptime(data['start_date'], '%Y-%m-%d')
+    except (TypeError, ValueError):
+        return jsonify({'error': 'start_date must be YYYY-MM-DD'}), 400
+
+    if data.get('team_ids'):
+        team_ids = data['team_ids']
+        if (not isinstance(team_ids, list)
+                or not all(isinstance(team_id, int) for team_id in team_ids)
+                or len(set(team_ids)) != len(team_ids)):
+            return jsonify({'error': 'team_ids must be a list of distinct team IDs'}), 400
+        known = {team['id'] for team in execute_query('SELECT id FROM teams')}
+        if not set(team_ids) <= known:
+            return jsonify({'error': 'Unknown team in team_ids'}), 400
+    elif data.get('seeding') == 'standings':
+        team_ids = [team['id'] for team in execute_query('''
+            SELECT t.id
+            FROM teams t
+            LEFT JOIN (
+                SELECT team_id, SUM(points) AS points, SUM(won) AS won
+                FROM standings GROUP BY team_id
+            ) s ON s.team_id = t.id
+            ORDER BY COALESCE(s.points, 0) DESC, COALESCE(s.won, 0) DESC, t.id
+        ''')]
+    else:
+        team_ids = [team['id'] for team in execute_query('SELECT id FROM teams ORDER BY RANDOM()')]
+
+    if len(team_ids) < 2:
         return jsonify({'error': 'At least 2 teams required'}), 400
 
+    rounds = plan_bracket(team_ids)
+
+    # One match a day, with a two-day break between rounds
+    venue = data.get('venue', 'TBD')
+    match_day_offset = 0
+    for matches in rounds:
+        for match in matches:
+            match_date = start_date + timedelta(days=match_day_offset)
+            match['match_date'] = match_date.strftime('%Y-%m-%d')
+            match['match_day'] = match_date.strftime('%A')
+            match['match_time'] = (data.get('final_time', '18:00') if match['round'] == 'Final'
+                                   else data.get('match_time', '14:00'))
+            match_day_offset += 1
+        match_day_offset += 2
+
     try:
-        # Determine tournament structure based on team count
-        start_date = datetime.strptime(data['start_date'], '%Y-%m-%d')
-        match_day_offset = 0
-
-        # Delete existing matches if requested
-        if data.get('clear_existing'):
-            execute_query('DELETE FROM matches')
-
-        # Generate matches based on team count
-        if team_count <= 4:
-            # Semi-finals only
-            rounds = [('Semi-Final', 2)]
-        elif team_count <= 8:
-            # Quarter-finals + Semi-finals
-            rounds = [('Round 1', 4), ('Semi-Final', 2)]
-        elif team_count <= 16:
-            # Round 1, Round 2, Semi-finals
-            rounds = [('Round 1', 8), ('Round 2', 4), ('Semi-Final', 2)]
-        else:
-            # For more teams, create multiple preliminary rounds
-            rounds = [('Round 1', 16), ('Round 2', 8), ('Semi-Final', 2)]
-
-        # Generate Round 1 matches
-        team_index = 0
-        for round_name, match_count in rounds:
-            if round_name == 'Round 1':
-                for i in range(match_count):
-                    if team_index + 1 < len(teams):
-                        match_date = start_date + timedelta(days=match_day_offset)
-                        day_name = match_date.strftime('%A')
-
-                        execute_insert('''
-                            INSERT INTO matches
-                            (match_date, match_day, team_a_id, team_b_id, round, venue, match_time, status)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', (
-                            match_date.strftime('%Y-%m-%d'),
-                            day_name,
-                            teams[team_index]['id'],
-                            teams[team_index + 1]['id'],
-                            round_name,
-                            data.get('venue', 'TBD'),
-                            data.get('match_time', '14:00'),
-                            'scheduled'
-                        ))
-
-                        team_index += 2
-                        match_day_offset += 1
-
-        # Create placeholder matches for later rounds
-        match_day_offset += 2  # Gap between rounds
-
-        for round_name, match_count in rounds[1:]:
-            for i in range(match_count):
-                match_date = start_date + timedelta(days=match_day_offset)
-                day_name = match_date.strftime('%A')
-
-                # Create placeholder matches (teams TBD)
-                # For now, use first two teams as placeholders
-                execute_insert('''
+        with transaction() as cursor:
+            if data.get('clear_existing'):
+                played = cursor.execute('''
+                    SELECT COUNT(*) FROM matches
+                    WHERE round_number IS NOT NULL AND status != 'scheduled'
+                ''').fetchone()[0]
+                if played:
+                    raise ValueError(f'{played} knockout match(es) have been played; '
+                                     'clear_existing only replaces an unplayed bracket')
+                cursor.execute('DELETE FROM matches WHERE round_number IS NOT NULL')
+
+            # Insert the final first so every match's parent already has an id
+            match_ids = {}
+            for matches in reversed(rounds):
+                cursor.executemany('''
                     INSERT INTO matches
-                    (match_date, match_day, team_a_id, team_b_id, round, venue, match_time, status)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    match_date.strftime('%Y-%m-%d'),
-                    day_name,
-                    teams[0]['id'],  # Placeholder
-                    teams[1]['id'],  # Placeholder
-                    round_name,
-                    data.get('venue', 'TBD'),
-                    data.get('match_time', '14:00'),
-                    'scheduled'
-                ))
-
-                match_day_offset += 1
-
-        # Create Final match
-        match_day_offset += 3
-        final_date = start_date + timedelta(days=match_day_offset)
-        execute_insert('''
-            INSERT INTO matches
-            (match_date, match_day, team_a_id, team_b_id, round, venue, match_time, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            final_date.strftime('%Y-%m-%d'),
-            final_date.strftime('%A'),
-            teams[0]['id'],  # Placeholder
-            teams[1]['id'],  # Placeholder
-            'Final',
-            data.get('venue', 'TBD'),
-            data.get('match_time', '18:00'),
-            'scheduled'
-        ))
+                    (match_date, match_day, team_a_id, team_b_id, round, venue, match_time,
+                     status, round_number, bracket_position, parent_match_id, parent_slot)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, 'scheduled', ?, ?, ?, ?)
+                ''', [(
+                    match['match_date'],
+                    match['match_day'],
+                    match['team_a_id'],
+                    match['team_b_id'],
+                    match['round'],
+                    venue,
+                    match['match_time'],
+                    match['round_number'],
+                    match['bracket_position'],
+                    match_ids.get((match['round_number'] + 1, match['parent_position'])),
+                    match['parent_slot']
+                ) for match in matches])
+
+                # The write lock is held, so the new ids are contiguous
+                last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+                first_id = last_id - len(matches) + 1
+                for offset, match in enumerate(matches):
+                    match_ids[(match['round_number'], match['bracket_position'])] = first_id + offset
+
+        match_events.publish('reset', {'reason': 'bracket generated'})
 
         return jsonify({
             'message': 'Tournament bracket generated successfully',
-            'teams_count': team_count
+            'teams_count': len(team_ids),
+            'matches_created': len(match_ids),
+            'byes': (1 << (len(rounds))) - len(team_ids),
+            'rounds': [matches[0]['round'] for matches in rounds if matches]
         }), 201
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def _schedule_groups(data):
+    """Group name -> team ids from a schedule request.
+
+    Either groups (a name -> team ids object, or a list of team id lists
+    named Group 1, Group 2, ...), or group_count teams groups filled in
+    serpentine order from team_ids (default: every team by id).
+    """
+    groups = data.get('groups')
+    if groups is not None:
+        if isinstance(groups, list):
+            groups = {str(number): team_ids for number, team_ids in enumerate(groups, start=1)}
+        if not isinstance(groups, dict) or not all(
+                isinstance(team_ids, list) and all(isinstance(team_id, int) for team_id in team_ids)
+                for team_ids in groups.values()):
+            raise ValueError('groups must map group names to lists of team IDs')
+        # Standings only cover rounds named "Group ..."
+        return {name if name.startswith('Group') else f'Group {name}': team_ids
+                for name, team_ids in groups.items()}
+
+    group_count = data.get('group_count')
+    if not isinstance(group_count, int) or group_count < 1:
+        raise ValueError('Provide groups or a positive group_count')
+    team_ids = data.get('team_ids') or [team['id'] for team in execute_query('SELECT id FROM teams ORDER BY id')]
+    if not isinstance(team_ids, list) or not all(isinstance(team_id, int) for team_id in team_ids):
+        raise ValueError('team_ids must be a list of team IDs')
+
+    groups = {f'Group {number}': [] for number in range(1, group_count + 1)}
+    names = list(groups)
+    for index, team_id in enumerate(team_ids):
+        lap, position = divmod(index, group_count)
+        groups[names[position if lap % 2 == 0 else group_count - 1 - position]].append(team_id)
+    return groups
+
+
+@tournament_bp.route('/schedule', methods=['POST'])
+@admin_required
+def schedule_group_stage():
+    """Generate a round-robin group stage schedule (admin only)
+
+    Takes groups (or group_count), start_date, daily times, venues,
+    min_rest_minutes between a team's matches, max_matches_per_day per
+    team and optional weekdays, and places every group fixture with
+    backend.scheduler. dry_run returns the schedule without saving it;
+    otherwise it is inserted with one batched insert. clear_existing
+    replaces the requested groups' matches; it is refused while any of
+    them has been started or completed, so recorded results are never
+    deleted.
+    """
+    data = request.get_json(silent=True)
+
+    if not data or not data.get('start_date'):
+        return jsonify({'error': 'Start date required'}), 400
+
+    try:
+        start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return jsonify({'error': 'start_date must be YYYY-MM-DD'}), 400
+
+    times = [normalize_time(value) for value in data.get('times') or ['14:00']]
+    if not all(time and _HHMM_RE.match(time) for time in times):
+        return jsonify({'error': 'times must be daily start times such as "18:00" or "6:40pm"'}), 400
+
+    venues = data.get('venues') or ['TBD']
+    weekdays = data.get('weekdays')
+    min_rest = data.get('min_rest_minutes', 0)
+    max_per_day = data.get('max_matches_per_day')
+    if (not isinstance(venues, list) or not all(isinstance(venue, str) for venue in venues)
+            or (weekdays is not None and not (isinstance(weekdays, list) and set(weekdays) <= set(WEEKDAYS)))
+            or not isinstance(min_rest, int) or min_rest < 0
+            or (max_per_day is not None and (not isinstance(max_per_day, int) or max_per_day < 1))):
+        return jsonify({'error': 'venues must be a list of names, weekdays a list of day names, '
+                                 'min_rest_minutes >= 0 and max_matches_per_day >= 1'}), 400
+
+    try:
+        groups = _schedule_groups(data)
+        known = {team['id'] for team in execute_query('SELECT id FROM teams')}
+        if not {team_id for team_ids in groups.values() for team_id in team_ids} <= known:
+            raise ValueError('Unknown team in groups')
+        matches = plan_group_stage(
+            groups, start_date, times, venues,
+            min_rest_minutes=min_rest,
+            max_matches_per_day=max_per_day,
+            weekdays=weekdays,
+            max_days=Config.SCHEDULE_MAX_DAYS,
+            attempts=Config.SCHEDULE_ATTEMPTS
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    summary = {
+        'groups': groups,
+        'matches_count': len(matches),
+        'first_date': matches[0]['match_date'],
+        'last_date': matches[-1]['match_date'],
+        'playing_days': len({match['match_date'] for match in matches})
+    }
+    if data.get('dry_run'):
+        return jsonify(dict(summary, matches=matches)), 200
+
+    placeholders = ', '.join('?' * len(groups))
+    if not data.get('clear_existing') and execute_single(
+            f'SELECT 1 AS found FROM matches WHERE round IN ({placeholders}) LIMIT 1', list(groups)):
+        return jsonify({'error': 'These groups already have matches; set clear_existing to replace them'}), 400
+
+    try:
+        with transaction() as cursor:
+            if data.get('clear_existing'):
+                played = cursor.execute(f'''
+                    SELECT COUNT(*) FROM matches
+                    WHERE round IN ({placeholders}) AND status != 'scheduled'
+                ''', list(groups)).fetchone()[0]
+                if played:
+                    raise ValueError(f'{played} match(es) in these groups have been played; '
+                                     'clear_existing only replaces unplayed schedules')
+                cursor.execute(f'DELETE FROM matches WHERE round IN ({placeholders})', list(groups))
+            cursor.executemany('''
+                INSERT INTO matches
+                (match_date, match_day, match_time, team_a_id, team_b_id, venue, round, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 'scheduled')
+            ''', [(
+                match['match_date'],
+                match['match_day'],
+                match['match_time'],
+                match['team_a_id'],
+                match['team_b_id'],
+                match['venue'],
+                match['round']
+            ) for match in matches])
+
+        match_events.publish('reset', {'reason': 'group stage scheduled'})
+
+        return jsonify(dict(summary, message='Group stage scheduled successfully')), 201
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -8,33 +8,53 @@ from flask import Flask, send_from_directory, jsonify
 from flask_login import LoginManager
 from flask_cors import CORS
 from backend.config import Config
-from backend.database import init_db
-from backend.models import User
+from backend.database import init_db, close_db, get_pool_stats
+from backend.models import User, user_cache
+from backend.cache import response_cache
+from backend import images, metrics, snapshot
+from backend.assets import StaticAssets
+from backend.json_provider import FastJSONProvider
+from backend.events import match_events
 from backend.auth import auth_bp
 from backend.api.teams import teams_bp
 from backend.api.players import players_bp
 from backend.api.matches import matches_bp
+from backend.api.deliveries import deliveries_bp
 from backend.api.tournament import tournament_bp
+from backend.api.search import search_bp
+from backend.api.leaderboards import leaderboards_bp
+from backend.api.export import export_bp
+from backend.api.dashboard import dashboard_bp
+from backend.api.batch import batch_bp
 
 
 def create_app():
     """Create and configure the Flask application"""
-    app = Flask(__name__,
-                static_folder='../frontend',
-                static_url_path='')
+    # Frontend files are served from the asset manifest below rather than
+    # Flask's static route
+    app = Flask(__name__, static_folder=None)
 
     # Load configuration
     app.config.from_object(Config)
     Config.init_app(app)
 
+    # orjson-backed JSON responses when available
+    app.json = FastJSONProvider(app)
+
     # Initialize CORS
-    CORS(app, supports_credentials=True)
+    CORS(app, supports_credentials=True, expose_headers=['X-Next-Cursor'])
 
     # Initialize Flask-Login
     login_manager = LoginManager()
     login_manager.init_app(app)
     login_manager.login_view = 'login'
 
+    # Return each request's pooled database connection on teardown
+    app.teardown_appcontext(close_db)
+
+    # Per-request SQL and latency metrics, served at /metrics
+    metrics.init_app(app)
+
     @login_manager.user_loader
     def load_user(user_id):
         return User.get_by_id(int(user_id))
@@ -44,34 +64,53 @@ def create_app():
     app.register_blueprint(teams_bp)
     app.register_blueprint(players_bp)
     app.register_blueprint(matches_bp)
+    app.register_blueprint(deliveries_bp)
     app.register_blueprint(tournament_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(leaderboards_bp)
+    app.register_blueprint(export_bp)
+    app.register_blueprint(dashboard_bp)
+    app.register_blueprint(batch_bp)
 
     # Serve frontend pages
+    assets = StaticAssets.load()
+
     @app.route('/')
     def index():
-        return send_from_directory(app.static_folder, 'index.html')
+        return assets.send('index.html')
 
     @app.route('/<path:path>')
     def serve_static(path):
-        if os.path.exists(os.path.join(app.static_folder, path)):
-            return send_from_directory(app.static_folder, path)
-        else:
-            return send_from_directory(app.static_folder, 'index.html')
+        return assets.send(path)
 
     # Serve uploaded files
     @app.route('/uploads/<path:filename>')
     def uploaded_file(filename):
+        # A variant requested right after upload may still be encoding
+        images.wait_for(os.path.join(Config.UPLOAD_FOLDER, filename),
+                        timeout=Config.IMAGE_WAIT_TIMEOUT)
         return send_from_directory(Config.UPLOAD_FOLDER, filename)
 
     # Health check endpoint
     @app.route('/health')
     def health():
-        return jsonify({'status': 'healthy'}), 200
+        return jsonify({
+            'status': 'healthy',
+            'db_pool': get_pool_stats(),
+            'response_cache': response_cache.stats(),
+            'user_cache': user_cache.stats(),
+            'pending_images': images.pending_count(),
+            'live_feed': match_events.stats(),
+            'snapshot': snapshot.get_snapshot_stats()
+        }), 200
 
     # Initialize database
     with app.app_context():
         init_db()
 
+    # Optional in-memory copy of the migrated database for GET requests
+    snapshot.init_app(app)
+
     return app
 
 
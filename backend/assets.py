@@ -0,0 +1,227 @@
+"""
+Build and serve the frontend's static files.
+
+Running this module builds the frontend into Config.STATIC_BUILD_DIR:
+files under css/ and js/ get a content hash in their name, every text
+file gets precompressed .gz and (with the optional brotli package) .br
+siblings, and the HTML pages are rewritten to reference the hashed names.
+A manifest.json describing every servable file is written alongside.
+
+At startup the app loads that manifest into memory (or, without a current
+build, scans frontend/ once), so requests are resolved with a dict lookup.
+Hashed files are served with an immutable Cache-Control; everything else
+is revalidated with its ETag. The best precompressed encoding the client
+accepts is sent.
+"""
+import sys
+import os
+import gzip
+import json
+import hashlib
+import mimetypes
+import re
+import shutil
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import request, send_file
+from backend.config import Config
+
+try:
+    import brotli
+except ImportError:  # optional: without it only .gz files are produced
+    brotli = None
+
+
+MANIFEST_NAME = 'manifest.json'
+
+# Directories whose files are fingerprinted and cached forever
+FINGERPRINT_DIRS = ('css', 'js')
+
+# File types worth precompressing
+COMPRESSIBLE = {'.html', '.css', '.js', '.svg', '.json', '.txt'}
+
+# Preferred order when the client accepts several encodings
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_REFERENCE_RE = re.compile(
+    r'''(?P<attr>(?:href|src)\s*=\s*["'])(?P<path>/?(?:%s)/[^"'?#]+)'''
+    % '|'.join(FINGERPRINT_DIRS)
+)
+
+
+def _source_files(source_dir):
+    """Yield (relative POSIX path, absolute path) for every file under source_dir"""
+    for root, dirs, files in os.walk(source_dir):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            yield os.path.relpath(path, source_dir).replace(os.sep, '/'), path
+
+
+def _latest_mtime(source_dir):
+    """Modification time of the most recently changed source file"""
+    return max((os.path.getmtime(path) for _, path in _source_files(source_dir)), default=0)
+
+
+def _fingerprinted_name(rel_path, data):
+    """style.css -> style.<hash>.css"""
+    stem, ext = os.path.splitext(rel_path)
+    return f'{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+
+
+def _write_file(build_dir, rel_path, data, immutable, files):
+    """Write a file plus its compressed siblings and record it in files"""
+    path = os.path.join(build_dir, *rel_path.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+    encodings = {}
+    if os.path.splitext(rel_path)[1].lower() in COMPRESSIBLE:
+        compressed = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed['br'] = brotli.compress(data, quality=11)
+        for encoding, suffix in ENCODINGS:
+            # Skip encodings that do not actually save bytes
+            if encoding in compressed and len(compressed[encoding]) < len(data):
+                with open(path + suffix, 'wb') as f:
+                    f.write(compressed[encoding])
+                encodings[encoding] = rel_path + suffix
+
+    files[rel_path] = {'encodings': encodings, 'immutable': immutable}
+
+
+def build_assets(source_dir=None, build_dir=None):
+    """Build the frontend into build_dir and return the manifest"""
+    source_dir = source_dir or Config.FRONTEND_DIR
+    build_dir = build_dir or Config.STATIC_BUILD_DIR
+
+    # Build into a staging directory and swap it in at the end, so a
+    # running server never sees a half-written build
+    staging = build_dir + '.tmp'
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    assets, files, pages = {}, {}, []
+    for rel_path, path in _source_files(source_dir):
+        if rel_path.endswith('.html'):
+            pages.append((rel_path, path))
+            continue
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        if rel_path.split('/', 1)[0] in FINGERPRINT_DIRS:
+            hashed = _fingerprinted_name(rel_path, data)
+            assets[rel_path] = hashed
+            _write_file(staging, hashed, data, True, files)
+        # Unhashed copies stay available for pages cached before a deploy
+        _write_file(staging, rel_path, data, False, files)
+
+    def rewrite(match):
+        hashed = assets.get(match.group('path').lstrip('/'))
+        return match.group('attr') + '/' + hashed if hashed else match.group(0)
+
+    for rel_path, path in pages:
+        with open(path, encoding='utf-8') as f:
+            html = _REFERENCE_RE.sub(rewrite, f.read())
+        _write_file(staging, rel_path, html.encode('utf-8'), False, files)
+
+    manifest = {
+        'source_mtime': _latest_mtime(source_dir),
+        'assets': assets,
+        'files': files
+    }
+    with open(os.path.join(staging, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    shutil.rmtree(build_dir, ignore_errors=True)
+    os.replace(staging, build_dir)
+    return manifest
+
+
+class StaticAsset:
+    """A servable file and its precompressed variants"""
+
+    __slots__ = ('path', 'mimetype', 'encodings', 'immutable')
+
+    def __init__(self, path, mimetype, encodings, immutable):
+        self.path = path
+        self.mimetype = mimetype
+        self.encodings = encodings
+        self.immutable = immutable
+
+
+class StaticAssets:
+    """In-memory map from URL path to file, built once at startup"""
+
+    def __init__(self, root, files, fallback='index.html'):
+        self.root = root
+        self.files = {}
+        for rel_path, info in files.items():
+            self.files[rel_path] = StaticAsset(
+                os.path.join(root, *rel_path.split('/')),
+                mimetypes.guess_type(rel_path)[0] or 'application/octet-stream',
+                {encoding: os.path.join(root, *encoded.split('/'))
+                 for encoding, encoded in info['encodings'].items()},
+                info['immutable']
+            )
+        self.fallback = self.files.get(fallback)
+
+    @classmethod
+    def load(cls, build_dir=None, source_dir=None):
+        """Use the build's manifest if it is current, else scan the sources"""
+        build_dir = build_dir or Config.STATIC_BUILD_DIR
+        source_dir = source_dir or Config.FRONTEND_DIR
+
+        manifest_path = os.path.join(build_dir, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest['source_mtime'] >= _latest_mtime(source_dir):
+                return cls(build_dir, manifest['files'])
+            print("Static build is older than frontend/, serving the sources; "
+                  "run backend/assets.py to rebuild")
+
+        files = {rel_path: {'encodings': {}, 'immutable': False}
+                 for rel_path, _ in _source_files(source_dir)}
+        return cls(source_dir, files)
+
+    def send(self, path):
+        """Serve path, falling back to the index page for unknown paths"""
+        asset = self.files.get(path) or self.fallback
+        if asset is None:
+            return 'Not Found', 404
+
+        filename, encoding = asset.path, None
+        for candidate, _ in ENCODINGS:
+            if candidate in asset.encodings and request.accept_encodings[candidate]:
+                filename, encoding = asset.encodings[candidate], candidate
+                break
+
+        response = send_file(filename, mimetype=asset.mimetype, conditional=True, etag=True)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if asset.encodings:
+            response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = (
+            IMMUTABLE_CACHE_CONTROL if asset.immutable else 'no-cache'
+        )
+        return response
+
+
+def main():
+    """Build the frontend assets"""
+    print("Building static assets...")
+    manifest = build_assets()
+    print(f"Fingerprinted {len(manifest['assets'])} assets, "
+          f"wrote {len(manifest['files'])} files to {Config.STATIC_BUILD_DIR}")
+    if brotli is None:
+        print("brotli is not installed; only gzip variants were written")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
 from flask import Blueprint, request, jsonify, session
 from flask_login import login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash
-from backend.models import User
+from backend.models import User, invalidate_user_cache
 from backend.database import execute_insert, execute_query
 from functools import wraps
 
@@ -84,6 +84,7 @@ def register():
             'INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)',
             (data['username'], password_hash, role)
         )
+        invalidate_user_cache(user_id)
         return jsonify({
             'message': 'User created successfully',
             'user_id': user_id
@@ -0,0 +1,98 @@
+"""
+Single-elimination bracket planning.
+
+plan_bracket() lays out a knockout for any number of seeded teams. The
+field is padded to the next power of two with byes, placed by standard
+seeding so the top seeds meet as late as possible and receive the byes.
+A first-round pairing with a bye is not played: that team is placed
+directly in its second-round slot. Every other match records the match
+its winner advances to (parent) and which slot of it ('a' or 'b').
+"""
+
+# Knockout round names that pre-date generated brackets, with the round
+# number the bracket view has always shown them under
+LEGACY_ROUND_NUMBERS = {'Round 1': 1, 'Round 2': 2, 'Semi-Final': 3, 'Final': 4}
+
+
+def knockout_round_number(round_name):
+    """Round number for a manually named knockout round, None for others"""
+    return LEGACY_ROUND_NUMBERS.get(round_name)
+
+
+def round_label(round_number, total_rounds):
+    """Display name of a round: ..., Round 2, Semi-Final, Final"""
+    remaining = total_rounds - round_number
+    if remaining == 0:
+        return 'Final'
+    if remaining == 1:
+        return 'Semi-Final'
+    return f'Round {round_number}'
+
+
+def seed_order(size):
+    """Seed numbers (1-based) in bracket position order for a power-of-two field.
+
+    seed_order(8) == [1, 8, 4, 5, 2, 7, 3, 6]: each seed s meets size + 1 - s
+    in the first round and the top two seeds can only meet in the final.
+    """
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [seed for s in order for seed in (s, total - s)]
+    return order
+
+
+def plan_bracket(team_ids):
+    """Lay out a knockout for team_ids, given in seed order.
+
+    Returns a list of rounds, earliest first. Each round is a list of match
+    dicts with round_number, bracket_position, round, team_a_id, team_b_id
+    (None until the feeding match is decided), and parent_position /
+    parent_slot locating the next-round match (None for the final). Byes
+    do not produce matches.
+    """
+    if len(team_ids) < 2:
+        raise ValueError('At least 2 teams required')
+
+    size = 1
+    while size < len(team_ids):
+        size *= 2
+    total_rounds = size.bit_length() - 1
+
+    # Round 1 slots in bracket order; seeds beyond the field are byes
+    slots = [team_ids[seed - 1] if seed <= len(team_ids) else None
+             for seed in seed_order(size)]
+
+    rounds = []
+    # Teams placed in each round's slots before any match is played
+    entrants = {(1, position): (slots[2 * position], slots[2 * position + 1])
+                for position in range(size // 2)}
+
+    for round_number in range(1, total_rounds + 1):
+        matches = []
+        for position in range(size >> round_number):
+            team_a_id, team_b_id = entrants.get((round_number, position), (None, None))
+            parent = None if round_number == total_rounds else (round_number + 1, position // 2)
+            slot = 'a' if position % 2 == 0 else 'b'
+
+            is_bye = round_number == 1 and (team_a_id is None or team_b_id is None)
+            if is_bye:
+                # The remaining team goes straight into the next round
+                a, b = entrants.get(parent, (None, None))
+                advancing = team_a_id if team_a_id is not None else team_b_id
+                entrants[parent] = (advancing, b) if slot == 'a' else (a, advancing)
+                continue
+
+            matches.append({
+                'round_number': round_number,
+                'bracket_position': position,
+                'round': round_label(round_number, total_rounds),
+                'team_a_id': team_a_id,
+                'team_b_id': team_b_id,
+                'parent_position': None if parent is None else parent[1],
+                'parent_slot': None if parent is None else slot
+            })
+
+        rounds.append(matches)
+
+    return rounds
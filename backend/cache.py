@@ -0,0 +1,153 @@
+"""
+In-process caches.
+
+LRUCache is a small thread-safe LRU map with an optional TTL. The response
+cache built on it keeps fully encoded JSON bodies of public GET endpoints,
+keyed by endpoint, view arguments and query string, and validates each
+entry against the write generations of the tables the endpoint reads (see
+backend.database.get_table_generations), which are shared by all worker
+processes. Every response carries a strong ETag and a Last-Modified date,
+so an unchanged poll is answered with 304 Not Modified without running the
+view's queries or encoding JSON.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+from flask import request, make_response, Response
+from backend.config import Config
+from backend.database import get_table_generations, get_tables_modified
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with optional expiry"""
+
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Return a cached value, or default if missing or expired"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                value, expires = item
+                if expires is None or expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entry if full"""
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        """Remove a single entry"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """Return size and hit/miss counters"""
+        with self._lock:
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+class CachedResponse:
+    """An encoded response body with its validators"""
+
+    __slots__ = ('generation', 'body', 'mimetype', 'headers', 'etag', 'last_modified')
+
+    def __init__(self, generation, body, mimetype, headers, last_modified):
+        self.generation = generation
+        self.body = body
+        self.mimetype = mimetype
+        self.headers = headers
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.last_modified = datetime.fromtimestamp(int(last_modified), tz=timezone.utc)
+
+    def is_fresh_for(self, req):
+        """Check the request's conditional headers against this entry"""
+        if req.if_none_match:
+            return req.if_none_match.contains(self.etag)
+        if req.if_modified_since:
+            return self.last_modified <= req.if_modified_since
+        return False
+
+    def to_response(self, req):
+        """Build a 200 response, or a body-less 304 if the client is current"""
+        if self.is_fresh_for(req):
+            response = Response(status=304)
+        else:
+            response = Response(self.body, status=200, mimetype=self.mimetype)
+            response.headers.extend(self.headers)
+        response.set_etag(self.etag)
+        response.last_modified = self.last_modified
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+
+response_cache = LRUCache(Config.RESPONSE_CACHE_SIZE, ttl=Config.RESPONSE_CACHE_TTL)
+
+# Response headers that are part of the cached representation
+_CACHED_HEADERS = ('X-Next-Cursor',)
+
+
+def cached_response(*tables):
+    """Cache a GET view's 200 responses until one of tables is written"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not Config.RESPONSE_CACHE_ENABLED:
+                return view(*args, **kwargs)
+
+            key = (
+                request.endpoint,
+                tuple(sorted(kwargs.items())),
+                tuple(sorted(request.args.items(multi=True)))
+            )
+            # Read the generation before running the view so a write that
+            # lands mid-request leaves the entry stale rather than wrong.
+            generation = get_table_generations(tables)
+
+            entry = response_cache.get(key)
+            if entry is None or entry.generation != generation:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                entry = CachedResponse(
+                    generation,
+                    response.get_data(),
+                    response.mimetype,
+                    [(name, response.headers[name]) for name in _CACHED_HEADERS
+                     if name in response.headers],
+                    get_tables_modified(tables)
+                )
+                response_cache.set(key, entry)
+
+            return entry.to_response(request)
+        return wrapper
+    return decorator
@@ -11,15 +11,113 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'cricket-tournament-secret-key-change-in-production'
 
     # Database configuration
-    DATABASE_PATH = os.path.join(BASE_DIR, 'database', 'cricket.db')
+    DATABASE_PATH = os.environ.get('DATABASE_PATH') or os.path.join(BASE_DIR, 'database', 'cricket.db')
     SQLALCHEMY_DATABASE_URI = f'sqlite:///{DATABASE_PATH}'
 
+    # Connection pool configuration (per worker process)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))
+    DB_STATEMENT_CACHE_SIZE = int(os.environ.get('DB_STATEMENT_CACHE_SIZE', 128))
+    DB_BUSY_TIMEOUT_MS = int(os.environ.get('DB_BUSY_TIMEOUT_MS', 5000))
+    DB_CACHE_SIZE_KB = int(os.environ.get('DB_CACHE_SIZE_KB', 16384))
+    DB_MMAP_SIZE = int(os.environ.get('DB_MMAP_SIZE', 64 * 1024 * 1024))
+
+    # List endpoint pagination
+    DEFAULT_PAGE_SIZE = 100
+    MAX_PAGE_SIZE = 1000
+
+    # Serve GET requests from an in-memory copy of the database, rebuilt
+    # whenever the file changes (per worker process; see backend/snapshot.py)
+    SNAPSHOT_ENABLED = os.environ.get('SNAPSHOT_ENABLED', '0') == '1'
+
+    # Response cache for public GET endpoints (per worker process).
+    # Entries are invalidated through the write generations that triggers
+    # keep in cache_generations, so writes by any worker are seen; the TTL
+    # only bounds memory held by rarely requested entries.
+    RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', '1') != '0'
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 512))
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 60))
+
+    # JSON encoder for responses: 'auto' uses orjson when it is installed,
+    # 'stdlib' always uses the standard library
+    JSON_ENCODER = os.environ.get('JSON_ENCODER', 'auto')
+
+    # Cache of users loaded for authenticated requests
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 1024))
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 300))
+
+    # GET /api/search
+    SEARCH_DEFAULT_LIMIT = 10
+    SEARCH_MAX_LIMIT = 50
+    SEARCH_MAX_TERMS = 8
+
+    # GET /api/leaderboards/<metric>; rate metrics rank only players with
+    # at least this many balls, dismissals or wickets
+    LEADERBOARD_DEFAULT_LIMIT = 10
+    LEADERBOARD_MAX_LIMIT = 100
+    LEADERBOARD_MIN_BALLS_FACED = 30
+    LEADERBOARD_MIN_DISMISSALS = 1
+    LEADERBOARD_MIN_BALLS_BOWLED = 60
+    LEADERBOARD_MIN_WICKETS = 3
+
+    # Sub-requests accepted by POST /api/batch
+    BATCH_MAX_REQUESTS = 20
+
+    # Fixtures and results listed by GET /api/dashboard
+    DASHBOARD_LIST_SIZE = 5
+
+    # Group-stage scheduler (POST /api/tournament/schedule)
+    SCHEDULE_MAX_DAYS = 366        # calendar days the schedule may span
+    SCHEDULE_ATTEMPTS = 20         # randomized placement passes to choose from
+
+    # Rows fetched per chunk by the streaming /api/export endpoints
+    EXPORT_CHUNK_ROWS = 500
+
+    # Maximum rows accepted by POST /api/players/bulk
+    BULK_IMPORT_MAX_ROWS = 5000
+
+    # Ball-by-ball scoring (POST /api/matches/<id>/deliveries)
+    DELIVERY_BATCH_MAX_ROWS = 600
+    MAX_OVERS_PER_INNINGS = 50
+
+    # Live match feed (GET /api/matches/stream, per worker process)
+    EVENT_QUEUE_SIZE = 64          # undelivered events kept per spectator
+    EVENT_HISTORY_SIZE = 256       # recent events replayable via Last-Event-ID
+    # Spectators are idle connections of the gevent worker; keep this below
+    # --worker-connections (2000 in render.yaml) so API requests always get one
+    EVENT_MAX_SUBSCRIBERS = int(os.environ.get('EVENT_MAX_SUBSCRIBERS', 1500))
+    EVENT_HEARTBEAT_SECONDS = 15
+    EVENT_RETRY_MS = 3000
+
+    # Request and SQL metrics served at /metrics (per worker process)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') != '0'
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))
+    # GET /metrics is a 404 unless it requires this bearer token, or
+    # METRICS_ALLOW_LOCAL serves it to loopback clients (never behind a
+    # reverse proxy on the same host: every request would be local)
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+    METRICS_ALLOW_LOCAL = os.environ.get('METRICS_ALLOW_LOCAL', '0') == '1'
+    METRICS_MAX_STATEMENTS = 500   # distinct normalized statements tracked
+    METRICS_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    METRICS_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000)
+
+    # Frontend sources and the fingerprinted, precompressed build of them
+    FRONTEND_DIR = os.path.join(BASE_DIR, 'frontend')
+    STATIC_BUILD_DIR = os.environ.get('STATIC_BUILD_DIR') or os.path.join(BASE_DIR, 'build', 'frontend')
+
     # Upload configuration
     UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
     TEAM_UPLOAD_FOLDER = os.path.join(UPLOAD_FOLDER, 'teams')
     PLAYER_UPLOAD_FOLDER = os.path.join(UPLOAD_FOLDER, 'players')
     MAX_CONTENT_LENGTH = 5 * 1024 * 1024  # 5MB max file size
-    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+
+    # Uploaded images are re-encoded off the request thread into WebP
+    # variants, each fitted within a square of the given size in pixels
+    IMAGE_INPUT_FORMATS = {'PNG', 'JPEG', 'GIF', 'WEBP'}
+    IMAGE_VARIANTS = {'thumb': 96, 'medium': 320}
+    IMAGE_WEBP_QUALITY = 80
+    IMAGE_WORKERS = int(os.environ.get('IMAGE_WORKERS', 2))
+    IMAGE_WAIT_TIMEOUT = 10  # seconds uploaded_file() waits for a queued variant
 
     # Session configuration
     PERMANENT_SESSION_LIFETIME = timedelta(hours=24)
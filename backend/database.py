@@ -1,16 +1,361 @@
+import os
 import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
+from flask import g, has_app_context
 from werkzeug.security import generate_password_hash
 from backend.config import Config
+from backend.migrations import run_migrations
+
+
+# Called as hook(sql, seconds, rows, is_new) for every statement run on
+# connections opened while it is set (see backend.metrics). A statement is
+# reported with is_new=True once its rows are consumed, the next statement
+# starts on the same thread, or flush_statements() is called; rows fetched
+# from it after that are reported again with is_new=False.
+_statement_hook = None
+_statement_state = threading.local()
+
+
+def set_statement_hook(hook):
+    """Install (or with None, remove) the per-statement instrumentation hook"""
+    global _statement_hook
+    _statement_hook = hook
+
+
+class _Statement:
+    """Time and rows of one statement from execute() until its rows are consumed"""
+    __slots__ = ('sql', 'seconds', 'rows', 'done')
+
+    def __init__(self, sql, seconds):
+        self.sql = sql
+        self.seconds = seconds
+        self.rows = 0
+        self.done = False
+
+
+def _open_statements():
+    statements = getattr(_statement_state, 'open', None)
+    if statements is None:
+        statements = _statement_state.open = []
+    return statements
+
+
+def _finish_statement(statement):
+    statement.done = True
+    statements = _open_statements()
+    if statement in statements:
+        statements.remove(statement)
+    hook = _statement_hook
+    if hook is not None:
+        hook(statement.sql, statement.seconds, statement.rows, True)
+
+
+def flush_statements():
+    """Report every statement on this thread whose rows are still unread"""
+    statements, _statement_state.open = _open_statements(), []
+    for statement in statements:
+        _finish_statement(statement)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times its statements and counts their rows"""
+    _statement = None
+
+    def _run(self, method, sql, *args):
+        flush_statements()
+        started = time.perf_counter()
+        try:
+            method(sql, *args)
+        finally:
+            statement = _Statement(sql, time.perf_counter() - started)
+            if self.description is None:
+                # Nothing to fetch: writes, DDL, PRAGMAs without output
+                statement.rows = max(self.rowcount, 0)
+                _finish_statement(statement)
+            else:
+                self._statement = statement
+                _open_statements().append(statement)
+        return self
+
+    def _fetched(self, seconds, rows, exhausted):
+        statement = self._statement
+        if statement is None:
+            return
+        if statement.done:
+            hook = _statement_hook
+            if hook is not None and (seconds or rows):
+                hook(statement.sql, seconds, rows, False)
+            return
+        statement.seconds += seconds
+        statement.rows += rows
+        if exhausted:
+            _finish_statement(statement)
+
+    def execute(self, sql, parameters=()):
+        return self._run(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(super().executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self._run(super().executescript, sql_script)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(time.perf_counter() - started, int(row is not None), row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(time.perf_counter() - started, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(time.perf_counter() - started, len(rows), True)
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(time.perf_counter() - started, 0, True)
+            raise
+        self._fetched(time.perf_counter() - started, 1, False)
+        return row
+
+    def close(self):
+        self._fetched(0, 0, True)
+        super().close()
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose statements all run on InstrumentedCursors"""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def connection_class():
+    """Connection class for new connections: instrumented while a hook is set"""
+    return InstrumentedConnection if _statement_hook else sqlite3.Connection
 
 
 def get_db_connection():
-    """Create and return a database connection"""
-    conn = sqlite3.connect(Config.DATABASE_PATH)
+    """Create and return a new, fully configured database connection"""
+    conn = sqlite3.connect(
+        Config.DATABASE_PATH,
+        timeout=Config.DB_BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        cached_statements=Config.DB_STATEMENT_CACHE_SIZE,
+        factory=connection_class()
+    )
     conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = NORMAL')
+    conn.execute(f'PRAGMA busy_timeout = {int(Config.DB_BUSY_TIMEOUT_MS)}')
+    conn.execute(f'PRAGMA cache_size = -{int(Config.DB_CACHE_SIZE_KB)}')
+    conn.execute(f'PRAGMA mmap_size = {int(Config.DB_MMAP_SIZE)}')
+    conn.execute('PRAGMA temp_store = MEMORY')
     return conn
 
 
+class ConnectionPool:
+    """Bounded pool of reusable connections, one pool per worker process.
+
+    Connections are kept open between requests so SQLite's page cache and
+    the per-connection prepared statement cache survive across calls.
+    """
+
+    def __init__(self, database_path, size):
+        self.database_path = database_path
+        self.size = size
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+        self.in_use = 0
+
+    def acquire(self):
+        """Check out an idle connection, opening a new one if none is free"""
+        with self._lock:
+            if self._pid != os.getpid():
+                # Connections inherited across fork() must not be reused
+                self._idle.clear()
+                self._pid = os.getpid()
+                self.in_use = 0
+            self.in_use += 1
+            if self._idle:
+                self.hits += 1
+                return self._idle.pop()
+            self.misses += 1
+        return get_db_connection()
+
+    def release(self, conn):
+        """Return a connection to the pool, closing it if the pool is full"""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            self.in_use -= 1
+            if self._pid == os.getpid() and len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+            self.discarded += 1
+        conn.close()
+
+    def close_all(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for conn in idle:
+            conn.close()
+
+    def stats(self):
+        """Return pool counters"""
+        with self._lock:
+            return {
+                'size': self.size,
+                'idle': len(self._idle),
+                'in_use': self.in_use,
+                'hits': self.hits,
+                'misses': self.misses,
+                'discarded': self.discarded
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the connection pool for this process"""
+    global _pool
+    if _pool is None or _pool.database_path != Config.DATABASE_PATH:
+        with _pool_lock:
+            if _pool is None or _pool.database_path != Config.DATABASE_PATH:
+                if _pool is not None:
+                    _pool.close_all()
+                _pool = ConnectionPool(Config.DATABASE_PATH, Config.DB_POOL_SIZE)
+    return _pool
+
+
+def get_pool_stats():
+    """Return connection pool hit/miss counters"""
+    return get_pool().stats()
+
+
+# Per-table write generations, kept in the cache_generations table by
+# triggers (migration 10), so a write is seen by every worker process and
+# writes made by triggers count for the table they change. The rows are
+# re-read only when PRAGMA data_version on a dedicated connection shows
+# that some connection has committed since the last read.
+_generations = {}          # table -> (generation, modified time)
+_generations_version = None
+_generations_conn = None
+_generations_owner = None  # (pid, database path) of _generations_conn
+_generation_lock = threading.Lock()
+
+
+def _current_generations():
+    """Return table -> (generation, modified), re-read after any commit"""
+    global _generations, _generations_version, _generations_conn, _generations_owner
+    with _generation_lock:
+        owner = (os.getpid(), Config.DATABASE_PATH)
+        if _generations_owner != owner:
+            # Not instrumented: the check is bookkeeping, not a query of
+            # the request. Connections inherited across fork() are not reused.
+            _generations_conn = sqlite3.connect(Config.DATABASE_PATH, check_same_thread=False,
+                                                timeout=Config.DB_BUSY_TIMEOUT_MS / 1000)
+            _generations_owner = owner
+            _generations_version = None
+
+        # Read the version first: a commit racing with the read below
+        # leaves the version behind and triggers another read
+        version = _generations_conn.execute('PRAGMA data_version').fetchone()[0]
+        if version != _generations_version:
+            _generations = {
+                table: (generation, modified)
+                for table, generation, modified in _generations_conn.execute(
+                    'SELECT table_name, generation, modified FROM cache_generations'
+                ).fetchall()
+            }
+            _generations_version = version
+        return _generations
+
+
+def get_table_generations(tables):
+    """Return a token that changes whenever any of the tables is written"""
+    generations = _current_generations()
+    return tuple(generations.get(table, (0, 0))[0] for table in tables)
+
+
+def get_tables_modified(tables):
+    """Return the time of the last write to any of the tables"""
+    generations = _current_generations()
+    return max((generations.get(table, (0, 0))[1] for table in tables), default=0)
+
+
+def get_db():
+    """Return the connection bound to the current app context.
+
+    The first call in a request checks a connection out of the pool; every
+    blueprint and the user loader then share it until teardown. A
+    connection bound earlier with use_db() takes its place.
+    """
+    if 'db_conn' not in g:
+        g.db_conn = get_pool().acquire()
+    return g.db_conn
+
+
+def use_db(conn, release):
+    """Bind conn to the current app context; release(conn) runs on teardown"""
+    g.db_conn = conn
+    g.db_release = release
+
+
+def close_db(exc=None):
+    """Return the app context's connection to the pool (or its owner)"""
+    conn = g.pop('db_conn', None)
+    release = g.pop('db_release', None) or get_pool().release
+    if conn is not None:
+        release(conn)
+
+
+@contextmanager
+def _connection():
+    """Yield the request connection, or a pooled one outside of a request"""
+    if has_app_context():
+        yield get_db()
+        return
+
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
 def init_db():
     """Initialize the database with tables"""
     conn = get_db_connection()
@@ -114,6 +459,9 @@ def init_db():
 
     conn.commit()
 
+    # Bring indexes and later schema changes up to date
+    run_migrations(conn)
+
     # Create default admin user if none exists
     cursor.execute('SELECT COUNT(*) FROM users WHERE role = ?', ('admin',))
     if cursor.fetchone()[0] == 0:
@@ -140,59 +488,128 @@ def init_db():
     print("Database initialized successfully")
 
 
+@contextmanager
+def transaction():
+    """Run several statements as a single write transaction.
+
+    Yields a cursor on the shared connection. The write lock is taken up
+    front (BEGIN IMMEDIATE); the transaction commits when the block exits
+    and rolls back if it raises. Inside another transaction() block the
+    statements run in a savepoint instead: they are undone on their own
+    if the inner block raises, and committed with the outer block.
+    """
+    with _connection() as conn:
+        if conn.in_transaction:
+            conn.execute('SAVEPOINT nested_transaction')
+            try:
+                yield conn.cursor()
+            except Exception:
+                conn.execute('ROLLBACK TO nested_transaction')
+                raise
+            finally:
+                conn.execute('RELEASE nested_transaction')
+            return
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn.cursor()
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+@contextmanager
+def read_transaction():
+    """Run several reads against one consistent snapshot.
+
+    Yields the shared connection inside a deferred transaction: in WAL
+    mode every read in the block sees the database as it was at the first
+    one, whatever other connections commit meanwhile. Nothing is written,
+    so the transaction is rolled back when the block exits; writes inside
+    the block fail (PRAGMA query_only) rather than being discarded. Inside
+    a block that already has a transaction open, the reads simply join it.
+    """
+    with _connection() as conn:
+        if conn.in_transaction:
+            yield conn
+            return
+
+        conn.execute('PRAGMA query_only = ON')
+        conn.execute('BEGIN')
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.execute('PRAGMA query_only = OFF')
+
+
 def dict_from_row(row):
     """Convert a sqlite3.Row object to a dictionary"""
     return dict(zip(row.keys(), row)) if row else None
 
 
-def execute_query(query, params=()):
-    """Execute a query and return results"""
-    conn = get_db_connection()
+def _tuple_cursor(conn, query, params):
+    """Execute query on a cursor that returns plain tuples.
+
+    Returns (cursor, column names). Building dicts from the column tuple,
+    read once per cursor, avoids creating a sqlite3.Row and calling its
+    keys() for every row.
+    """
     cursor = conn.cursor()
+    cursor.row_factory = None
     cursor.execute(query, params)
-    results = cursor.fetchall()
-    conn.close()
-    return [dict_from_row(row) for row in results]
+    columns = tuple(column[0] for column in cursor.description or ())
+    return cursor, columns
+
+
+def execute_query(query, params=()):
+    """Execute a query and return results"""
+    with _connection() as conn:
+        cursor, columns = _tuple_cursor(conn, query, params)
+        results = cursor.fetchall()
+    return [dict(zip(columns, row)) for row in results]
 
 
 def execute_single(query, params=()):
     """Execute a query and return a single result"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(query, params)
-    result = cursor.fetchone()
-    conn.close()
-    return dict_from_row(result)
+    with _connection() as conn:
+        cursor, columns = _tuple_cursor(conn, query, params)
+        result = cursor.fetchone()
+    return dict(zip(columns, result)) if result else None
+
+
+def _execute_write(conn, query, params):
+    """Execute a write statement and commit, rolling back on failure.
+
+    Inside a transaction() block the statement joins the open transaction,
+    which commits or rolls back with the block.
+    """
+    if conn.in_transaction:
+        return conn.execute(query, params)
+    try:
+        cursor = conn.execute(query, params)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return cursor
 
 
 def execute_insert(query, params=()):
     """Execute an insert query and return the last row id"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(query, params)
-    last_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return last_id
+    with _connection() as conn:
+        return _execute_write(conn, query, params).lastrowid
 
 
 def execute_update(query, params=()):
     """Execute an update query"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(query, params)
-    conn.commit()
-    affected_rows = cursor.rowcount
-    conn.close()
-    return affected_rows
+    with _connection() as conn:
+        return _execute_write(conn, query, params).rowcount
 
 
 def execute_delete(query, params=()):
     """Execute a delete query"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(query, params)
-    conn.commit()
-    affected_rows = cursor.rowcount
-    conn.close()
-    return affected_rows
+    with _connection() as conn:
+        return _execute_write(conn, query, params).rowcount
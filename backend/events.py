@@ -0,0 +1,149 @@
+"""
+In-process publish/subscribe hub for the live match feed.
+
+Write endpoints publish a compact delta after their transaction commits;
+GET /api/matches/stream relays them to spectators as Server-Sent Events.
+Each event is encoded once and fanned out to bounded per-subscriber
+queues, so an idle spectator costs a queue and a heartbeat, never a
+database query. A subscriber that falls a full queue behind is sent a
+"reset" event (re-fetch everything) instead of blocking publishers.
+
+Recent events are kept in a ring buffer: a reconnecting EventSource sends
+Last-Event-ID and gets the events it missed replayed, or a reset if they
+have already been dropped. Event ids carry a per-process token, so ids
+from before a restart are never mistaken for current ones. The hub lives
+in one worker process; spectators only see writes made by that worker.
+"""
+import json
+import queue
+import threading
+import uuid
+from collections import deque
+from backend.config import Config
+
+
+class TooManySubscribers(Exception):
+    """Raised when the hub is at its subscriber limit"""
+
+
+def _encode(event_id, event_type, data):
+    """Encode one SSE message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event_type}')
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return ('\n'.join(lines) + '\n\n').encode('utf-8')
+
+
+RESET_MESSAGE = _encode(None, 'reset', {})
+
+
+class Subscriber:
+    """One connected spectator's bounded queue of encoded messages"""
+
+    __slots__ = ('queue',)
+
+    def __init__(self, size):
+        self.queue = queue.Queue(maxsize=size)
+
+    def offer(self, message):
+        """Queue a message; on overflow replace the backlog with a reset"""
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            try:
+                while True:
+                    self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.queue.put_nowait(RESET_MESSAGE)
+
+
+class EventHub:
+    """Fan-out of published events to subscriber queues"""
+
+    def __init__(self, queue_size, history_size, max_subscribers):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._token = uuid.uuid4().hex[:8]
+        self._sequence = 0
+        self._history = deque(maxlen=history_size)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def publish(self, event_type, data):
+        """Encode an event once and queue it for every subscriber"""
+        with self._lock:
+            self._sequence += 1
+            message = _encode(f'{self._token}-{self._sequence}', event_type, data)
+            self._history.append((self._sequence, message))
+            self.published += 1
+            for subscriber in self._subscribers:
+                subscriber.offer(message)
+
+    def _missed_since(self, last_event_id):
+        """Messages after last_event_id, or None if they cannot be replayed"""
+        token, _, sequence = (last_event_id or '').partition('-')
+        if token != self._token or not sequence.isdigit():
+            return None
+        sequence = int(sequence)
+        if sequence > self._sequence:
+            return None
+        if sequence < self._sequence and (
+                not self._history or self._history[0][0] > sequence + 1):
+            return None
+        return [message for seq, message in self._history if seq > sequence]
+
+    def subscribe(self, last_event_id=None):
+        """Register a subscriber, replaying what it missed since last_event_id"""
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                raise TooManySubscribers()
+
+            subscriber = Subscriber(self.queue_size)
+            if last_event_id:
+                missed = self._missed_since(last_event_id)
+                if missed is None or len(missed) > self.queue_size:
+                    subscriber.offer(RESET_MESSAGE)
+                else:
+                    for message in missed:
+                        subscriber.offer(message)
+            self._subscribers.add(subscriber)
+            return subscriber
+
+    def unsubscribe(self, subscriber):
+        """Remove a subscriber"""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def stream(self, subscriber, heartbeat):
+        """Yield SSE chunks for a subscriber until the client goes away.
+
+        The caller unsubscribes when the response is closed: a generator
+        that is never iterated (HEAD, early disconnect) never runs a finally.
+        """
+        yield f'retry: {int(Config.EVENT_RETRY_MS)}\n\n'.encode('utf-8')
+        while True:
+            try:
+                yield subscriber.queue.get(timeout=heartbeat)
+            except queue.Empty:
+                # Comment line: keeps proxies from closing an idle stream
+                yield b': keepalive\n\n'
+
+    def stats(self):
+        """Return subscriber and event counters"""
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'published': self.published,
+                'history': len(self._history)
+            }
+
+
+match_events = EventHub(
+    Config.EVENT_QUEUE_SIZE,
+    Config.EVENT_HISTORY_SIZE,
+    Config.EVENT_MAX_SUBSCRIBERS
+)
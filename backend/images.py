@@ -0,0 +1,169 @@
+"""
+Background processing for uploaded team logos and player photos.
+
+The upload handler only streams the file to a temporary path next to its
+final location and queues it. A small worker pool then decodes the image,
+applies and drops the EXIF orientation, resizes it to each of the
+configured variants and writes them as WebP. Variant paths are known up
+front, so the request returns them without waiting for the encoder;
+uploaded_file() waits for a variant that is still being written. The
+row is pointed at the new image only once every variant has been
+written, so a failed encode leaves the previous image in place.
+"""
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageOps, UnidentifiedImageError
+from backend.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Absolute variant path -> Future of the job writing it
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+def _get_executor():
+    """Return the worker pool for this process, starting it on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=Config.IMAGE_WORKERS,
+                    thread_name_prefix='image-worker'
+                )
+    return _executor
+
+
+def variant_name(basename, variant):
+    """File name of one size variant"""
+    return f'{basename}_{variant}.webp'
+
+
+def _render_variants(tmp_path, folder, basename):
+    """Decode an upload and write every size variant as WebP"""
+    written = []
+    try:
+        with Image.open(tmp_path) as source:
+            image = ImageOps.exif_transpose(source)
+            if image.mode not in ('RGB', 'RGBA'):
+                has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+                image = image.convert('RGBA' if has_alpha else 'RGB')
+
+            for variant, size in Config.IMAGE_VARIANTS.items():
+                resized = image.copy()
+                resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+                # Drop EXIF, XMP and other metadata carried over from the upload
+                resized.info = {}
+
+                target = os.path.join(folder, variant_name(basename, variant))
+                partial = f'{target}.part'
+                written.append(partial)
+                resized.save(partial, 'WEBP', quality=Config.IMAGE_WEBP_QUALITY, method=4)
+                os.replace(partial, target)
+                written[-1] = target
+    except Exception:
+        # No half set of variants: nothing will point at them
+        for path in written:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    finally:
+        os.remove(tmp_path)
+
+
+def _process(tmp_path, folder, basename, variants, on_success):
+    """Worker job: render the variants, then hand their URL paths to on_success"""
+    try:
+        _render_variants(tmp_path, folder, basename)
+    except Exception:
+        logger.exception('Encoding upload %s failed; the previous image is kept', basename)
+        raise
+    if on_success is not None:
+        try:
+            on_success(variants)
+        except Exception:
+            logger.exception('Recording upload %s failed', basename)
+            raise
+
+
+def _forget(paths):
+    """Drop finished jobs from the pending map"""
+    def callback(future):
+        with _pending_lock:
+            for path in paths:
+                if _pending.get(path) is future:
+                    del _pending[path]
+    return callback
+
+
+def queue_upload(file, folder, url_prefix, basename, on_success=None):
+    """Stream an uploaded file to disk and queue its variants for encoding.
+
+    Only the image header is read here, to reject files Pillow cannot
+    decode. Returns a dict mapping each variant name to its URL path
+    (url_prefix/basename_variant.webp). on_success(variants) is called
+    from the worker after every variant has been written, and not at all
+    if encoding fails. It runs outside the request, so it must not rely
+    on the app context. Raises ValueError for files that are not images.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=f'{basename}_', suffix='.upload')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            file.save(out)
+        with Image.open(tmp_path) as image:
+            image_format = image.format
+    except (UnidentifiedImageError, OSError):
+        os.remove(tmp_path)
+        raise ValueError('File is not a valid image')
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+    if image_format not in Config.IMAGE_INPUT_FORMATS:
+        os.remove(tmp_path)
+        raise ValueError('Invalid file type')
+
+    variants = {
+        variant: f'{url_prefix}/{variant_name(basename, variant)}'
+        for variant in Config.IMAGE_VARIANTS
+    }
+    targets = [os.path.abspath(os.path.join(folder, variant_name(basename, variant)))
+               for variant in Config.IMAGE_VARIANTS]
+    with _pending_lock:
+        future = _get_executor().submit(_process, tmp_path, folder, basename, variants, on_success)
+        for target in targets:
+            _pending[target] = future
+    future.add_done_callback(_forget(targets))
+
+    return variants
+
+
+def wait_for(path, timeout=None):
+    """Block until a queued variant at path has been written.
+
+    Returns False if the job failed or did not finish in time, True
+    otherwise (including when nothing is pending for path).
+    """
+    with _pending_lock:
+        future = _pending.get(os.path.abspath(path))
+    if future is None:
+        return True
+    try:
+        future.result(timeout=timeout)
+    except Exception:
+        return False
+    return True
+
+
+def pending_count():
+    """Number of variants still being encoded"""
+    with _pending_lock:
+        return len(_pending)
@@ -0,0 +1,78 @@
+"""
+JSON provider for API responses.
+
+Uses orjson when it is installed (and Config.JSON_ENCODER is 'auto'),
+which encodes large row lists several times faster than the standard
+library. Otherwise responses go through one reused stdlib encoder, built
+once with the C speedups, compact separators and UTF-8 output, instead of
+a new json.dumps configuration per response.
+
+Both paths sort keys like Flask's default provider, so response bodies
+(and the response cache's ETags) stay stable. Values orjson cannot encode
+(integers beyond 64 bits, unusual types) fall back to the stdlib path.
+"""
+import json
+from flask.json.provider import DefaultJSONProvider
+from backend.config import Config
+
+try:
+    import orjson
+except ImportError:  # optional: without it the stdlib encoder is used
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider with an optional orjson fast path"""
+
+    ensure_ascii = False
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.use_orjson = orjson is not None and Config.JSON_ENCODER == 'auto'
+        self._encoder = json.JSONEncoder(
+            default=self.default,
+            ensure_ascii=self.ensure_ascii,
+            sort_keys=self.sort_keys,
+            separators=(',', ':')
+        )
+
+    def _orjson_options(self, indent):
+        # Dates and dataclasses go through Flask's default() as they do
+        # with the stdlib encoder
+        options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                   | orjson.OPT_PASSTHROUGH_DATACLASS)
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def encode(self, obj, indent=False):
+        """Serialize obj to UTF-8 bytes"""
+        if self.use_orjson:
+            try:
+                return orjson.dumps(obj, default=self.default, option=self._orjson_options(indent))
+            except TypeError:
+                pass
+        if indent:
+            return super().dumps(obj, indent=2).encode('utf-8')
+        return self._encoder.encode(obj).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        # Custom arguments (e.g. the session serializer's) keep Flask's behaviour
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.encode(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if self.use_orjson and not kwargs:
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                pass  # let the stdlib raise its usual error (or accept NaN and friends)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self.encode(obj, indent) + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,72 @@
+"""
+Consistency checks for denormalized data in the cricket database.
+
+Usage:
+    python backend/maintenance.py           # check and repair
+    python backend/maintenance.py --check   # report only, exit 1 on mismatch
+"""
+import sys
+import os
+import argparse
+
+# Add parent directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.database import get_db_connection, init_db
+
+
+def check_player_counts(conn, repair=True):
+    """Compare teams.player_count with the actual roster sizes.
+
+    Returns the list of mismatched teams; when repair is set, their counts
+    are recomputed and committed.
+    """
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT t.id, t.name, t.player_count, COUNT(p.id) AS actual
+        FROM teams t
+        LEFT JOIN players p ON p.team_id = t.id
+        GROUP BY t.id
+        HAVING t.player_count IS NOT COUNT(p.id)
+    ''')
+    mismatches = [dict(row) for row in cursor.fetchall()]
+
+    if repair and mismatches:
+        cursor.executemany(
+            'UPDATE teams SET player_count = ? WHERE id = ?',
+            [(team['actual'], team['id']) for team in mismatches]
+        )
+        conn.commit()
+
+    return mismatches
+
+
+def main():
+    """Run all consistency checks"""
+    parser = argparse.ArgumentParser(description='Check and repair denormalized data')
+    parser.add_argument('--check', action='store_true',
+                        help='only report mismatches, do not repair them')
+    args = parser.parse_args()
+
+    init_db()
+    conn = get_db_connection()
+
+    try:
+        mismatches = check_player_counts(conn, repair=not args.check)
+        for team in mismatches:
+            print(f"  [!] {team['name']}: player_count {team['player_count']}, "
+                  f"actual {team['actual']}")
+
+        if not mismatches:
+            print("Team player counts are consistent.")
+        elif args.check:
+            print(f"{len(mismatches)} team(s) have inconsistent player counts.")
+            sys.exit(1)
+        else:
+            print(f"Repaired player counts for {len(mismatches)} team(s).")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+"""
+Request and SQL metrics.
+
+init_app() installs the statement hook of backend.database and brackets
+every request: the statements a request runs are counted and timed, and
+the totals are added to per-endpoint counters and histograms when it
+ends. Statements slower than SLOW_QUERY_MS are logged with their
+normalized SQL (literals replaced by ?). GET /metrics serves everything in
+the Prometheus text format, together with connection pool, cache and live
+feed gauges. Like the caches, the numbers are per worker process.
+
+The statements and routes it lists describe the schema, so /metrics
+answers 404 unless METRICS_TOKEN is set (then it requires that bearer
+token) or METRICS_ALLOW_LOCAL opts in to serving loopback clients.
+Behind a reverse proxy on the same host every request comes from
+loopback, so the opt-in is for setups without one.
+"""
+import hmac
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from functools import lru_cache
+from flask import Response, jsonify, request
+from backend.config import Config
+from backend import database, images, snapshot
+from backend.cache import response_cache
+from backend.events import match_events
+from backend.models import user_cache
+
+logger = logging.getLogger(__name__)
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST_RE = re.compile(r'\?(?:\s*,\s*\?)+')
+_SPACE_RE = re.compile(r'\s+')
+MAX_STATEMENT_LENGTH = 200
+LOCAL_ADDRESSES = ('127.0.0.1', '::1')
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql):
+    """Statement text with literals and placeholder lists collapsed to ?"""
+    text = _LITERAL_RE.sub('?', sql)
+    text = _PLACEHOLDER_LIST_RE.sub('?, ...', text)
+    text = _SPACE_RE.sub(' ', text).strip()
+    if len(text) > MAX_STATEMENT_LENGTH:
+        text = text[:MAX_STATEMENT_LENGTH - 3] + '...'
+    return text
+
+
+class Histogram:
+    """Bucketed observations per label set (callers hold the registry lock)"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self._series = {}
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            # Per-bucket counts (the last one is +Inf), sum, count
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self, name, label_names):
+        """Prometheus sample lines with cumulative buckets"""
+        lines = []
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            base = _labels(label_names, labels)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += bucket_count
+                le = bound if isinstance(bound, str) else _number(bound)
+                lines.append(f'{name}_bucket{{{base}{"," if base else ""}le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{base}}} {_number(total)}')
+            lines.append(f'{name}_count{{{base}}} {count}')
+        return lines
+
+
+class RequestMetrics:
+    """Statement totals of the request running on this thread"""
+    __slots__ = ('request', 'started', 'queries', 'db_seconds', 'rows', 'status')
+
+    def __init__(self, req):
+        self.request = req
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.status = 500
+
+
+class MetricsRegistry:
+    """Counters and histograms for requests and SQL statements"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.request_seconds = Histogram(Config.METRICS_LATENCY_BUCKETS)
+        self.request_queries = Histogram(Config.METRICS_QUERY_BUCKETS)
+        self.requests = {}          # (method, route, status) -> count
+        self.endpoint_db = {}       # route -> [queries, seconds, rows]
+        self.statements = {}        # normalized sql -> [calls, seconds, rows]
+        self.slow_queries = 0
+
+    def record_statement(self, sql, seconds, rows, is_new):
+        """Add one statement (or rows fetched from it later) to the totals"""
+        text = normalize_sql(sql)
+        with self._lock:
+            totals = self.statements.get(text)
+            if totals is None:
+                if len(self.statements) >= Config.METRICS_MAX_STATEMENTS:
+                    text = 'other'
+                totals = self.statements.setdefault(text, [0, 0.0, 0])
+            totals[0] += is_new
+            totals[1] += seconds
+            totals[2] += rows
+            if is_new and seconds * 1000 >= Config.SLOW_QUERY_MS:
+                self.slow_queries += 1
+                return True
+        return False
+
+    def record_request(self, method, route, current):
+        """Add a finished request's latency and statement totals"""
+        elapsed = time.perf_counter() - current.started
+        with self._lock:
+            key = (method, route, str(current.status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.request_seconds.observe((method, route), elapsed)
+            self.request_queries.observe((route,), current.queries)
+            totals = self.endpoint_db.setdefault(route, [0, 0.0, 0])
+            totals[0] += current.queries
+            totals[1] += current.db_seconds
+            totals[2] += current.rows
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(samples)
+
+        with self._lock:
+            family('npl_http_requests_total', 'counter', 'Requests by method, route and status.', [
+                f'npl_http_requests_total{{{_labels(("method", "route", "status"), key)}}} {count}'
+                for key, count in sorted(self.requests.items())
+            ])
+            family('npl_http_request_duration_seconds', 'histogram', 'Request latency by route.',
+                   self.request_seconds.render('npl_http_request_duration_seconds', ('method', 'route')))
+            family('npl_http_request_queries', 'histogram', 'SQL statements per request by route.',
+                   self.request_queries.render('npl_http_request_queries', ('route',)))
+
+            for index, (suffix, help_text) in enumerate((
+                ('queries_total', 'SQL statements run by requests to the route.'),
+                ('query_seconds_total', 'Time spent in SQL by requests to the route.'),
+                ('rows_total', 'Rows read or written by requests to the route.'),
+            )):
+                family(f'npl_db_route_{suffix}', 'counter', help_text, [
+                    f'npl_db_route_{suffix}{{{_labels(("route",), (route,))}}} {_number(totals[index])}'
+                    for route, totals in sorted(self.endpoint_db.items())
+                ])
+
+            for index, (suffix, help_text) in enumerate((
+                ('calls_total', 'Executions of the normalized statement.'),
+                ('seconds_total', 'Time spent executing and fetching the normalized statement.'),
+                ('rows_total', 'Rows returned or changed by the normalized statement.'),
+            )):
+                family(f'npl_db_statement_{suffix}', 'counter', help_text, [
+                    f'npl_db_statement_{suffix}{{{_labels(("statement",), (text,))}}} {_number(totals[index])}'
+                    for text, totals in sorted(self.statements.items())
+                ])
+
+            family('npl_db_slow_queries_total', 'counter',
+                   f'Statements slower than {_number(Config.SLOW_QUERY_MS)} ms.',
+                   [f'npl_db_slow_queries_total {self.slow_queries}'])
+
+        pool = database.get_pool_stats()
+        family('npl_db_pool_connections', 'gauge', 'Pooled database connections by state.', [
+            f'npl_db_pool_connections{{state="idle"}} {pool["idle"]}',
+            f'npl_db_pool_connections{{state="in_use"}} {pool["in_use"]}',
+        ])
+        family('npl_db_pool_checkouts_total', 'counter', 'Connection checkouts by whether an idle one was reused.', [
+            f'npl_db_pool_checkouts_total{{result="hit"}} {pool["hits"]}',
+            f'npl_db_pool_checkouts_total{{result="miss"}} {pool["misses"]}',
+        ])
+        family('npl_db_pool_discarded_total', 'counter', 'Connections closed because the pool was full.',
+               [f'npl_db_pool_discarded_total {pool["discarded"]}'])
+
+        caches = {'response': response_cache.stats(), 'user': user_cache.stats()}
+        family('npl_cache_requests_total', 'counter', 'Cache lookups by cache and result.', [
+            f'npl_cache_requests_total{{cache="{name}",result="{result}"}} {stats[key]}'
+            for name, stats in caches.items() for result, key in (('hit', 'hits'), ('miss', 'misses'))
+        ])
+        family('npl_cache_hit_ratio', 'gauge', 'Share of cache lookups answered from the cache.', [
+            f'npl_cache_hit_ratio{{cache="{name}"}} '
+            f'{_number(stats["hits"] / (stats["hits"] + stats["misses"]) if stats["hits"] + stats["misses"] else 0)}'
+            for name, stats in caches.items()
+        ])
+        family('npl_cache_entries', 'gauge', 'Entries held by each cache.', [
+            f'npl_cache_entries{{cache="{name}"}} {stats["size"]}' for name, stats in caches.items()
+        ])
+
+        feed = match_events.stats()
+        family('npl_live_feed_subscribers', 'gauge', 'Open live match feed connections.',
+               [f'npl_live_feed_subscribers {feed["subscribers"]}'])
+        family('npl_live_feed_events_total', 'counter', 'Events published to the live match feed.',
+               [f'npl_live_feed_events_total {feed["published"]}'])
+
+        snapshot_stats = snapshot.get_snapshot_stats()
+        if snapshot_stats is not None:
+            family('npl_db_snapshot_bytes', 'gauge', 'Size of the in-memory read snapshot.',
+                   [f'npl_db_snapshot_bytes {snapshot_stats["bytes"]}'])
+            family('npl_db_snapshot_refreshes_total', 'counter', 'Rebuilds of the in-memory read snapshot.',
+                   [f'npl_db_snapshot_refreshes_total {snapshot_stats["refreshes"]}'])
+            family('npl_db_snapshot_refresh_seconds_total', 'counter',
+                   'Time spent rebuilding the in-memory read snapshot.',
+                   [f'npl_db_snapshot_refresh_seconds_total {_number(snapshot_stats["refresh_seconds"])}'])
+
+        family('npl_pending_images', 'gauge', 'Uploaded images waiting to be encoded.',
+               [f'npl_pending_images {images.pending_count()}'])
+        family('npl_process_start_time_seconds', 'gauge', 'Start time of the worker process.',
+               [f'npl_process_start_time_seconds {_number(self.started)}'])
+
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(names, values):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+metrics = MetricsRegistry()
+_local = threading.local()
+
+
+def current_request():
+    """Statement totals so far of the request running on this thread, or None"""
+    database.flush_statements()
+    return getattr(_local, 'request', None)
+
+
+def _record_statement(sql, seconds, rows, is_new):
+    current = getattr(_local, 'request', None)
+    if current is not None:
+        current.queries += is_new
+        current.db_seconds += seconds
+        current.rows += rows
+    if metrics.record_statement(sql, seconds, rows, is_new):
+        logger.warning('Slow query (%.1f ms, %d rows) in %s: %s', seconds * 1000, rows,
+                       request.endpoint if current is not None else 'background task',
+                       normalize_sql(sql))
+
+
+def init_app(app):
+    """Instrument the app's requests and SQL and register GET /metrics"""
+    if not Config.METRICS_ENABLED:
+        return
+
+    database.set_statement_hook(_record_statement)
+
+    @app.before_request
+    def start_request_metrics():
+        _local.request = RequestMetrics(request._get_current_object())
+
+    @app.after_request
+    def record_status(response):
+        current = current_request()
+        if current is not None:
+            current.status = response.status_code
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(exc=None):
+        # Statements whose rows were never read to the end count now
+        database.flush_statements()
+        current = getattr(_local, 'request', None)
+        if current is not None and current.request is request._get_current_object():
+            # Sub-requests dispatched inside a request (POST /api/batch)
+            # leave their statements in the parent's totals
+            del _local.request
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            metrics.record_request(request.method, route, current)
+
+    @app.route('/metrics')
+    def prometheus_metrics():
+        if Config.METRICS_TOKEN:
+            expected = f'Bearer {Config.METRICS_TOKEN}'
+            if not hmac.compare_digest(request.headers.get('Authorization', ''), expected):
+                response = jsonify({'error': 'Metrics token required'})
+                response.headers['WWW-Authenticate'] = 'Bearer'
+                return response, 401
+        elif not (Config.METRICS_ALLOW_LOCAL and request.remote_addr in LOCAL_ADDRESSES):
+            return jsonify({'error': 'Not found'}), 404
+        # content_type, not mimetype: Flask would append a second charset
+        return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,942 @@
+"""
+Versioned schema migrations for the cricket database.
+
+The schema version is stored in the database header (PRAGMA user_version).
+init_db() creates the baseline tables, then run_migrations() applies every
+step newer than the stored version, in order, each in its own transaction.
+ANALYZE runs after each step so the query planner sees the new indexes.
+"""
+from backend.scores import parse_score
+
+
+def _add_hot_path_indexes(cursor):
+    """Index the access paths used by the list and lookup endpoints"""
+    # One statistics row per player; drop duplicates left by older versions
+    cursor.execute('''
+        DELETE FROM player_statistics
+        WHERE id NOT IN (SELECT MIN(id) FROM player_statistics GROUP BY player_id)
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_player_statistics_player
+        ON player_statistics (player_id)
+    ''')
+
+    # get_matches / get_matches_by_round: filter on round, sort by schedule
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_matches_schedule
+        ON matches (match_date, match_time)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_matches_round_schedule
+        ON matches (round, match_date, match_time)
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_team_a ON matches (team_a_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_team_b ON matches (team_b_id)')
+
+    # get_team / get_team_players: filter on team, sort by jersey number
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_players_team_jersey
+        ON players (team_id, jersey_number)
+    ''')
+
+    # get_players / get_teams: newest first
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_players_created ON players (created_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_teams_created ON teams (created_at)')
+
+
+def _add_standings(cursor):
+    """Materialized group standings maintained by triggers on matches.
+
+    A group match is any match whose round starts with "Group". Completed
+    matches count 2 points for a win and 1 to each side for a no result
+    (completed without a winner). The triggers run inside the statement
+    that changes the match, so standings are always updated in the same
+    transaction as the result.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS standings (
+            group_name TEXT NOT NULL,
+            team_id INTEGER NOT NULL,
+            played INTEGER NOT NULL DEFAULT 0,
+            won INTEGER NOT NULL DEFAULT 0,
+            lost INTEGER NOT NULL DEFAULT 0,
+            no_result INTEGER NOT NULL DEFAULT 0,
+            points INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (group_name, team_id),
+            FOREIGN KEY (team_id) REFERENCES teams(id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_standings_table
+        ON standings (group_name, points DESC, won DESC)
+    ''')
+
+    # Statement templates; {m} is NEW or OLD, {sign} is + or -
+    ensure_rows = '''
+        INSERT OR IGNORE INTO standings (group_name, team_id)
+        SELECT {m}.round, {m}.team_a_id WHERE {m}.round LIKE 'Group%'
+        UNION ALL
+        SELECT {m}.round, {m}.team_b_id WHERE {m}.round LIKE 'Group%';
+    '''
+    apply_result = '''
+        UPDATE standings SET
+            played = played {sign} 1,
+            won = won {sign} ({m}.winner_id IS team_id),
+            lost = lost {sign} ({m}.winner_id IS NOT NULL AND {m}.winner_id IS NOT team_id),
+            no_result = no_result {sign} ({m}.winner_id IS NULL),
+            points = points {sign} (CASE WHEN {m}.winner_id IS team_id THEN 2
+                                         WHEN {m}.winner_id IS NULL THEN 1
+                                         ELSE 0 END)
+        WHERE {m}.status = 'completed' AND {m}.round LIKE 'Group%'
+          AND group_name = {m}.round AND team_id IN ({m}.team_a_id, {m}.team_b_id);
+    '''
+    drop_unused_rows = '''
+        DELETE FROM standings
+        WHERE group_name = OLD.round AND team_id IN (OLD.team_a_id, OLD.team_b_id)
+          AND NOT EXISTS (
+              SELECT 1 FROM matches
+              WHERE round = standings.group_name
+                AND (team_a_id = standings.team_id OR team_b_id = standings.team_id)
+          );
+    '''
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_matches_standings_insert
+        AFTER INSERT ON matches
+        WHEN NEW.round LIKE 'Group%'
+        BEGIN
+            {ensure_rows.format(m='NEW')}
+            {apply_result.format(m='NEW', sign='+')}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_matches_standings_update
+        AFTER UPDATE OF round, team_a_id, team_b_id, status, winner_id ON matches
+        WHEN OLD.round LIKE 'Group%' OR NEW.round LIKE 'Group%'
+        BEGIN
+            {apply_result.format(m='OLD', sign='-')}
+            {ensure_rows.format(m='NEW')}
+            {apply_result.format(m='NEW', sign='+')}
+            {drop_unused_rows}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_matches_standings_delete
+        AFTER DELETE ON matches
+        WHEN OLD.round LIKE 'Group%'
+        BEGIN
+            {apply_result.format(m='OLD', sign='-')}
+            {drop_unused_rows}
+        END
+    ''')
+
+    # Backfill from the matches already in the database
+    cursor.execute('DELETE FROM standings')
+    cursor.execute('''
+        INSERT INTO standings (group_name, team_id, played, won, lost, no_result, points)
+        SELECT round, team_id,
+               SUM(completed),
+               SUM(completed AND winner_id IS team_id),
+               SUM(completed AND winner_id IS NOT NULL AND winner_id IS NOT team_id),
+               SUM(completed AND winner_id IS NULL),
+               SUM(CASE WHEN NOT completed THEN 0
+                        WHEN winner_id IS team_id THEN 2
+                        WHEN winner_id IS NULL THEN 1
+                        ELSE 0 END)
+        FROM (
+            SELECT round, team_a_id AS team_id, status = 'completed' AS completed, winner_id
+            FROM matches WHERE round LIKE 'Group%'
+            UNION ALL
+            SELECT round, team_b_id, status = 'completed', winner_id
+            FROM matches WHERE round LIKE 'Group%'
+        )
+        GROUP BY round, team_id
+    ''')
+
+
+def _add_team_player_count(cursor):
+    """Denormalized roster size on teams, maintained by triggers on players"""
+    cursor.execute('''
+        ALTER TABLE teams ADD COLUMN player_count INTEGER NOT NULL DEFAULT 0
+    ''')
+    cursor.execute('''
+        UPDATE teams
+        SET player_count = (SELECT COUNT(*) FROM players WHERE team_id = teams.id)
+    ''')
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_players_count_insert
+        AFTER INSERT ON players
+        BEGIN
+            UPDATE teams SET player_count = player_count + 1 WHERE id = NEW.team_id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_players_count_delete
+        AFTER DELETE ON players
+        BEGIN
+            UPDATE teams SET player_count = player_count - 1 WHERE id = OLD.team_id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_players_count_transfer
+        AFTER UPDATE OF team_id ON players
+        WHEN OLD.team_id IS NOT NEW.team_id
+        BEGIN
+            UPDATE teams SET player_count = player_count - 1 WHERE id = OLD.team_id;
+            UPDATE teams SET player_count = player_count + 1 WHERE id = NEW.team_id;
+        END
+    ''')
+
+
+def _add_deliveries(cursor):
+    """Ball-by-ball scoring with incrementally maintained totals.
+
+    Each row of deliveries is one ball. Triggers apply it to the batter's,
+    bowler's and fielder's player_statistics, to the match's
+    innings_totals and to the team_a_score/team_b_score text, so posting
+    or removing a ball touches a fixed number of rows. match_appearances
+    counts each player's involvements per match to keep matches_played
+    right. Deliveries are append-only: a correction deletes the ball and
+    posts it again.
+
+    Wides and no-balls are not legal balls; their extras are charged to
+    the bowler, byes and leg byes are not. Only bowled, caught, lbw,
+    stumped and hit wicket are credited to the bowler, and retired hurt
+    is not a wicket.
+    """
+    cursor.execute('''
+        ALTER TABLE player_statistics ADD COLUMN times_out INTEGER NOT NULL DEFAULT 0
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS deliveries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            match_id INTEGER NOT NULL,
+            innings INTEGER NOT NULL,
+            batting_team_id INTEGER NOT NULL,
+            over_number INTEGER NOT NULL,
+            ball INTEGER NOT NULL,
+            striker_id INTEGER NOT NULL,
+            non_striker_id INTEGER,
+            bowler_id INTEGER NOT NULL,
+            runs_batter INTEGER NOT NULL DEFAULT 0,
+            extras INTEGER NOT NULL DEFAULT 0,
+            extra_type TEXT,
+            wicket_kind TEXT,
+            player_out_id INTEGER,
+            fielder_id INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (match_id, innings, over_number, ball),
+            FOREIGN KEY (match_id) REFERENCES matches(id) ON DELETE CASCADE,
+            FOREIGN KEY (batting_team_id) REFERENCES teams(id),
+            FOREIGN KEY (striker_id) REFERENCES players(id),
+            FOREIGN KEY (non_striker_id) REFERENCES players(id),
+            FOREIGN KEY (bowler_id) REFERENCES players(id),
+            FOREIGN KEY (player_out_id) REFERENCES players(id),
+            FOREIGN KEY (fielder_id) REFERENCES players(id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS match_appearances (
+            match_id INTEGER NOT NULL,
+            player_id INTEGER NOT NULL,
+            involvements INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (match_id, player_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS innings_totals (
+            match_id INTEGER NOT NULL,
+            innings INTEGER NOT NULL,
+            batting_team_id INTEGER NOT NULL,
+            deliveries INTEGER NOT NULL DEFAULT 0,
+            runs INTEGER NOT NULL DEFAULT 0,
+            wickets INTEGER NOT NULL DEFAULT 0,
+            legal_balls INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (match_id, innings)
+        ) WITHOUT ROWID
+    ''')
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_match_appearances_insert
+        AFTER INSERT ON match_appearances
+        BEGIN
+            UPDATE player_statistics SET matches_played = matches_played + 1
+            WHERE player_id = NEW.player_id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_match_appearances_delete
+        AFTER DELETE ON match_appearances
+        BEGIN
+            UPDATE player_statistics SET matches_played = matches_played - 1
+            WHERE player_id = OLD.player_id;
+        END
+    ''')
+
+    # Statement templates; {d} is NEW or OLD, {sign} is + or -
+    legal = "({d}.extra_type IS NULL OR {d}.extra_type NOT IN ('wide', 'noball'))"
+    is_wicket = "({d}.wicket_kind IS NOT NULL AND {d}.wicket_kind <> 'retired hurt')"
+    apply_player_stats = f'''
+        UPDATE player_statistics SET
+            runs_scored = runs_scored {{sign}} {{d}}.runs_batter,
+            balls_faced = balls_faced {{sign}} ({{d}}.extra_type IS NOT 'wide'),
+            fours = fours {{sign}} ({{d}}.runs_batter = 4),
+            sixes = sixes {{sign}} ({{d}}.runs_batter = 6)
+        WHERE player_id = {{d}}.striker_id;
+        UPDATE player_statistics SET
+            balls_bowled = balls_bowled {{sign}} {legal},
+            runs_conceded = runs_conceded {{sign}} ({{d}}.runs_batter
+                + CASE WHEN {{d}}.extra_type IN ('wide', 'noball') THEN {{d}}.extras ELSE 0 END),
+            wickets_taken = wickets_taken {{sign}} ({{d}}.wicket_kind IS NOT NULL AND {{d}}.wicket_kind
+                IN ('bowled', 'caught', 'lbw', 'stumped', 'hit wicket'))
+        WHERE player_id = {{d}}.bowler_id;
+        UPDATE player_statistics SET
+            catches = catches {{sign}} ({{d}}.wicket_kind IS 'caught'),
+            stumpings = stumpings {{sign}} ({{d}}.wicket_kind IS 'stumped')
+        WHERE player_id = {{d}}.fielder_id AND {{d}}.wicket_kind IN ('caught', 'stumped');
+        UPDATE player_statistics SET times_out = times_out {{sign}} 1
+        WHERE player_id = {{d}}.player_out_id AND {is_wicket};
+    '''
+    update_score_text = '''
+        UPDATE matches SET
+            team_a_score = CASE WHEN team_a_id = {d}.batting_team_id THEN (
+                SELECT runs || '/' || wickets || ' (' || (legal_balls / 6)
+                       || CASE WHEN legal_balls % 6 THEN '.' || (legal_balls % 6) ELSE '' END || ')'
+                FROM innings_totals WHERE match_id = {d}.match_id AND innings = {d}.innings
+            ) ELSE team_a_score END,
+            team_b_score = CASE WHEN team_b_id = {d}.batting_team_id THEN (
+                SELECT runs || '/' || wickets || ' (' || (legal_balls / 6)
+                       || CASE WHEN legal_balls % 6 THEN '.' || (legal_balls % 6) ELSE '' END || ')'
+                FROM innings_totals WHERE match_id = {d}.match_id AND innings = {d}.innings
+            ) ELSE team_b_score END
+        WHERE id = {d}.match_id AND {d}.innings <= 2;
+    '''
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_deliveries_insert
+        AFTER INSERT ON deliveries
+        BEGIN
+            {apply_player_stats.format(d='NEW', sign='+')}
+
+            INSERT INTO match_appearances (match_id, player_id, involvements)
+            SELECT NEW.match_id, player_id, 1
+            FROM (SELECT NEW.striker_id AS player_id UNION SELECT NEW.non_striker_id
+                  UNION SELECT NEW.bowler_id UNION SELECT NEW.fielder_id)
+            WHERE player_id IS NOT NULL
+            ON CONFLICT (match_id, player_id) DO UPDATE SET involvements = involvements + 1;
+
+            INSERT INTO innings_totals (match_id, innings, batting_team_id,
+                                        deliveries, runs, wickets, legal_balls)
+            VALUES (NEW.match_id, NEW.innings, NEW.batting_team_id, 1,
+                    NEW.runs_batter + NEW.extras, {is_wicket.format(d='NEW')}, {legal.format(d='NEW')})
+            ON CONFLICT (match_id, innings) DO UPDATE SET
+                deliveries = deliveries + 1,
+                runs = runs + excluded.runs,
+                wickets = wickets + excluded.wickets,
+                legal_balls = legal_balls + excluded.legal_balls;
+
+            {update_score_text.format(d='NEW')}
+
+            UPDATE matches SET status = 'in_progress'
+            WHERE id = NEW.match_id AND status = 'scheduled';
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_deliveries_delete
+        AFTER DELETE ON deliveries
+        BEGIN
+            {apply_player_stats.format(d='OLD', sign='-')}
+
+            UPDATE match_appearances SET involvements = involvements - 1
+            WHERE match_id = OLD.match_id AND player_id IN
+                  (OLD.striker_id, OLD.non_striker_id, OLD.bowler_id, OLD.fielder_id);
+            DELETE FROM match_appearances
+            WHERE match_id = OLD.match_id AND involvements <= 0 AND player_id IN
+                  (OLD.striker_id, OLD.non_striker_id, OLD.bowler_id, OLD.fielder_id);
+
+            UPDATE innings_totals SET
+                deliveries = deliveries - 1,
+                runs = runs - (OLD.runs_batter + OLD.extras),
+                wickets = wickets - {is_wicket.format(d='OLD')},
+                legal_balls = legal_balls - {legal.format(d='OLD')}
+            WHERE match_id = OLD.match_id AND innings = OLD.innings;
+            DELETE FROM innings_totals
+            WHERE match_id = OLD.match_id AND innings = OLD.innings AND deliveries <= 0;
+
+            {update_score_text.format(d='OLD')}
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_deliveries_append_only
+        BEFORE UPDATE ON deliveries
+        BEGIN
+            SELECT RAISE(ABORT, 'deliveries are append-only; delete the ball and post it again');
+        END
+    ''')
+
+    # Foreign keys are not enforced, so remove a deleted match's balls
+    # explicitly; the delete trigger above reverses their statistics.
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_matches_delete_deliveries
+        AFTER DELETE ON matches
+        BEGIN
+            DELETE FROM deliveries WHERE match_id = OLD.id;
+        END
+    ''')
+
+
+def _add_bracket_links(cursor):
+    """Knockout bracket tree on matches.
+
+    Team slots become nullable so later-round matches can wait for their
+    winners, and each match can point at the match its winner advances to
+    (parent_match_id, parent_slot 'a' or 'b'). round_number and
+    bracket_position give the bracket order directly. SQLite cannot drop
+    NOT NULL in place, so the table is rebuilt; its own indexes and
+    triggers are recreated from sqlite_master.
+    """
+    cursor.execute('''
+        SELECT type, sql FROM sqlite_master
+        WHERE tbl_name = 'matches' AND type IN ('index', 'trigger') AND sql IS NOT NULL
+        ORDER BY type, name
+    ''')
+    dependents = cursor.fetchall()
+    row = cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'matches'").fetchone()
+    sequence = row[0] if row else 0
+
+    cursor.execute('''
+        CREATE TABLE matches_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            match_date DATE NOT NULL,
+            match_day TEXT NOT NULL,
+            team_a_id INTEGER,
+            team_b_id INTEGER,
+            venue TEXT,
+            match_time TEXT,
+            round TEXT NOT NULL,
+            status TEXT DEFAULT 'scheduled',
+            winner_id INTEGER,
+            team_a_score TEXT,
+            team_b_score TEXT,
+            result_summary TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            round_number INTEGER,
+            bracket_position INTEGER,
+            parent_match_id INTEGER,
+            parent_slot TEXT CHECK (parent_slot IN ('a', 'b')),
+            FOREIGN KEY (team_a_id) REFERENCES teams(id),
+            FOREIGN KEY (team_b_id) REFERENCES teams(id),
+            FOREIGN KEY (winner_id) REFERENCES teams(id),
+            FOREIGN KEY (parent_match_id) REFERENCES matches(id)
+        )
+    ''')
+    columns = ('id, match_date, match_day, team_a_id, team_b_id, venue, match_time, round, '
+               'status, winner_id, team_a_score, team_b_score, result_summary, created_at')
+    cursor.execute(f'INSERT INTO matches_new ({columns}) SELECT {columns} FROM matches')
+    cursor.execute('DROP TABLE matches')
+
+    # Triggers on other tables refer to matches by name; the legacy rename
+    # leaves them alone instead of failing to resolve them mid-rebuild.
+    cursor.execute('PRAGMA legacy_alter_table = ON')
+    cursor.execute('ALTER TABLE matches_new RENAME TO matches')
+    cursor.execute('PRAGMA legacy_alter_table = OFF')
+    cursor.execute(
+        "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'matches'", (sequence,)
+    )
+
+    for _, sql in dependents:
+        cursor.execute(sql)
+
+    # Knockout rounds created before this version, in the order the old
+    # bracket endpoint sorted them
+    cursor.execute('''
+        UPDATE matches SET round_number = CASE round
+            WHEN 'Round 1' THEN 1
+            WHEN 'Round 2' THEN 2
+            WHEN 'Semi-Final' THEN 3
+            WHEN 'Final' THEN 4
+        END
+        WHERE round IN ('Round 1', 'Round 2', 'Semi-Final', 'Final')
+    ''')
+    cursor.execute('''
+        UPDATE matches SET bracket_position = (
+            SELECT position FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY round_number ORDER BY match_date, match_time, id
+                ) - 1 AS position
+                FROM matches WHERE round_number IS NOT NULL
+            ) ordered
+            WHERE ordered.id = matches.id
+        )
+        WHERE round_number IS NOT NULL
+    ''')
+
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_matches_bracket
+        ON matches (round_number, bracket_position)
+        WHERE round_number IS NOT NULL
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_parent ON matches (parent_match_id)')
+
+    # Advance a knockout winner into the next round's slot
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_matches_advance_winner
+        AFTER UPDATE OF winner_id ON matches
+        WHEN NEW.parent_match_id IS NOT NULL AND NEW.winner_id IS NOT OLD.winner_id
+        BEGIN
+            UPDATE matches SET
+                team_a_id = CASE WHEN NEW.parent_slot = 'a' THEN NEW.winner_id ELSE team_a_id END,
+                team_b_id = CASE WHEN NEW.parent_slot = 'b' THEN NEW.winner_id ELSE team_b_id END
+            WHERE id = NEW.parent_match_id;
+        END
+    ''')
+
+
+def _add_search_index(cursor):
+    """Full-text indexes over player and team text columns.
+
+    players_fts and teams_fts are external-content FTS5 tables: they store
+    only the inverted index and read column values from the source table
+    by rowid. Prefix indexes on 2 and 3 characters keep type-ahead queries
+    from scanning the whole term list. Triggers keep both in step with every
+    insert, update and delete.
+    """
+    indexes = (
+        ('players_fts', 'players', ('name', 'role', 'batting_style', 'bowling_style')),
+        ('teams_fts', 'teams', ('name', 'coach_name', 'home_ground')),
+    )
+
+    for fts, source, columns in indexes:
+        column_list = ', '.join(columns)
+        new_values = ', '.join(f'NEW.{column}' for column in columns)
+        old_values = ', '.join(f'OLD.{column}' for column in columns)
+
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {column_list},
+                content = '{source}',
+                content_rowid = 'id',
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3'
+            )
+        ''')
+        cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert
+            AFTER INSERT ON {source}
+            BEGIN
+                INSERT INTO {fts} (rowid, {column_list}) VALUES (NEW.id, {new_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete
+            AFTER DELETE ON {source}
+            BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column_list})
+                VALUES ('delete', OLD.id, {old_values});
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_update
+            AFTER UPDATE OF {column_list} ON {source}
+            BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column_list})
+                VALUES ('delete', OLD.id, {old_values});
+                INSERT INTO {fts} (rowid, {column_list}) VALUES (NEW.id, {new_values});
+            END
+        ''')
+
+
+def _add_leaderboard_columns(cursor):
+    """Derived rate columns on player_statistics and one index per leaderboard.
+
+    Strike rate, batting average, economy and bowling average are stored
+    generated columns, NULL while their denominator is zero. SQLite can
+    only add virtual generated columns in place, so the table is rebuilt
+    the same way as matches in version 5. Each leaderboard index starts
+    with the ranked value and the player id tiebreak, followed by the
+    qualifying and displayed counters, so a top-N query walks one index in
+    order and stops after N qualifying rows.
+    """
+    cursor.execute('''
+        SELECT type, sql FROM sqlite_master
+        WHERE tbl_name = 'player_statistics' AND type IN ('index', 'trigger') AND sql IS NOT NULL
+        ORDER BY type, name
+    ''')
+    dependents = cursor.fetchall()
+    row = cursor.execute(
+        "SELECT seq FROM sqlite_sequence WHERE name = 'player_statistics'"
+    ).fetchone()
+    sequence = row[0] if row else 0
+
+    cursor.execute('''
+        CREATE TABLE player_statistics_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            player_id INTEGER NOT NULL,
+            matches_played INTEGER DEFAULT 0,
+            runs_scored INTEGER DEFAULT 0,
+            balls_faced INTEGER DEFAULT 0,
+            fours INTEGER DEFAULT 0,
+            sixes INTEGER DEFAULT 0,
+            wickets_taken INTEGER DEFAULT 0,
+            balls_bowled INTEGER DEFAULT 0,
+            runs_conceded INTEGER DEFAULT 0,
+            catches INTEGER DEFAULT 0,
+            stumpings INTEGER DEFAULT 0,
+            times_out INTEGER NOT NULL DEFAULT 0,
+            strike_rate REAL GENERATED ALWAYS AS (
+                CASE WHEN balls_faced > 0 THEN runs_scored * 100.0 / balls_faced END
+            ) STORED,
+            batting_average REAL GENERATED ALWAYS AS (
+                CASE WHEN times_out > 0 THEN runs_scored * 1.0 / times_out END
+            ) STORED,
+            economy REAL GENERATED ALWAYS AS (
+                CASE WHEN balls_bowled > 0 THEN runs_conceded * 6.0 / balls_bowled END
+            ) STORED,
+            bowling_average REAL GENERATED ALWAYS AS (
+                CASE WHEN wickets_taken > 0 THEN runs_conceded * 1.0 / wickets_taken END
+            ) STORED,
+            FOREIGN KEY (player_id) REFERENCES players(id) ON DELETE CASCADE
+        )
+    ''')
+    columns = ('id, player_id, matches_played, runs_scored, balls_faced, fours, sixes, '
+               'wickets_taken, balls_bowled, runs_conceded, catches, stumpings, times_out')
+    cursor.execute(
+        f'INSERT INTO player_statistics_new ({columns}) SELECT {columns} FROM player_statistics'
+    )
+    cursor.execute('DROP TABLE player_statistics')
+
+    # The deliveries triggers update player_statistics by name
+    cursor.execute('PRAGMA legacy_alter_table = ON')
+    cursor.execute('ALTER TABLE player_statistics_new RENAME TO player_statistics')
+    cursor.execute('PRAGMA legacy_alter_table = OFF')
+    cursor.execute(
+        "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'player_statistics'",
+        (sequence,)
+    )
+
+    for _, sql in dependents:
+        cursor.execute(sql)
+
+    leaderboard_indexes = {
+        'runs': 'runs_scored DESC, player_id, matches_played, balls_faced',
+        'wickets': 'wickets_taken DESC, player_id, matches_played, balls_bowled',
+        'sixes': 'sixes DESC, player_id, matches_played',
+        'catches': 'catches DESC, player_id, matches_played',
+        'strike_rate': 'strike_rate DESC, player_id, balls_faced, matches_played, runs_scored',
+        'batting_average': 'batting_average DESC, player_id, times_out, matches_played, runs_scored',
+        'economy': 'economy, player_id, balls_bowled, matches_played, wickets_taken',
+        'bowling_average': 'bowling_average, player_id, wickets_taken, matches_played, runs_conceded',
+    }
+    for name, index_columns in leaderboard_indexes.items():
+        cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_leaders_{name}
+            ON player_statistics ({index_columns})
+        ''')
+
+
+def _add_status_schedule_index(cursor):
+    """Index matches by status in schedule order.
+
+    Serves the dashboard's per-status counts (a scan of the index alone),
+    its upcoming fixtures (forward from today within 'scheduled') and its
+    latest results (backward within 'completed').
+    """
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_matches_status_schedule
+        ON matches (status, match_date, match_time)
+    ''')
+
+
+def _add_structured_scores(cursor):
+    """Typed innings scores on matches and net run rate in standings.
+
+    Each side's innings gets runs, wickets and legal balls columns, filled
+    from the existing score text, plus the match's overs_limit. Triggers on
+    innings_totals keep them current for ball-by-ball matches. standings
+    gains runs and balls for and against, which the rebuilt match triggers
+    maintain alongside the points, and a virtual net_run_rate column:
+
+        runs_for / overs_faced - runs_against / overs_bowled
+
+    A side bowled out counts its full overs_limit (when set) as overs
+    faced. Only completed matches with both innings scored count, so no
+    results and text-only scores leave the rate untouched. The points
+    table index now orders by net run rate after points.
+    """
+    for side in ('a', 'b'):
+        for column in ('runs', 'wickets', 'balls'):
+            cursor.execute(f'ALTER TABLE matches ADD COLUMN team_{side}_{column} INTEGER')
+    cursor.execute('ALTER TABLE matches ADD COLUMN overs_limit INTEGER')
+
+    rows = cursor.execute('''
+        SELECT id, team_a_score, team_b_score FROM matches
+        WHERE team_a_score IS NOT NULL OR team_b_score IS NOT NULL
+    ''').fetchall()
+    updates = []
+    for match_id, team_a_score, team_b_score in rows:
+        team_a = parse_score(team_a_score) or (None, None, None)
+        team_b = parse_score(team_b_score) or (None, None, None)
+        if team_a[0] is not None or team_b[0] is not None:
+            updates.append(team_a + team_b + (match_id,))
+    cursor.executemany('''
+        UPDATE matches SET
+            team_a_runs = ?, team_a_wickets = ?, team_a_balls = ?,
+            team_b_runs = ?, team_b_wickets = ?, team_b_balls = ?
+        WHERE id = ?
+    ''', updates)
+
+    # Ball-by-ball matches: the first two innings are the two sides' scores.
+    # {t} is NEW or OLD; {runs}, {wickets}, {balls} the values to store
+    set_side_scores = '''
+        UPDATE matches SET
+            team_a_runs = CASE WHEN team_a_id = {t}.batting_team_id THEN {runs} ELSE team_a_runs END,
+            team_a_wickets = CASE WHEN team_a_id = {t}.batting_team_id THEN {wickets} ELSE team_a_wickets END,
+            team_a_balls = CASE WHEN team_a_id = {t}.batting_team_id THEN {balls} ELSE team_a_balls END,
+            team_b_runs = CASE WHEN team_b_id = {t}.batting_team_id THEN {runs} ELSE team_b_runs END,
+            team_b_wickets = CASE WHEN team_b_id = {t}.batting_team_id THEN {wickets} ELSE team_b_wickets END,
+            team_b_balls = CASE WHEN team_b_id = {t}.batting_team_id THEN {balls} ELSE team_b_balls END
+        WHERE id = {t}.match_id;
+    '''
+    for event in ('INSERT', 'UPDATE'):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_innings_totals_score_{event.lower()}
+            AFTER {event} ON innings_totals
+            WHEN NEW.innings <= 2
+            BEGIN
+                {set_side_scores.format(t='NEW', runs='NEW.runs', wickets='NEW.wickets',
+                                        balls='NEW.legal_balls')}
+            END
+        ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_innings_totals_score_delete
+        AFTER DELETE ON innings_totals
+        WHEN OLD.innings <= 2
+        BEGIN
+            {set_side_scores.format(t='OLD', runs='NULL', wickets='NULL', balls='NULL')}
+        END
+    ''')
+
+    for column in ('runs_for', 'balls_for', 'runs_against', 'balls_against'):
+        cursor.execute(f'ALTER TABLE standings ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0')
+    cursor.execute('''
+        ALTER TABLE standings ADD COLUMN net_run_rate REAL GENERATED ALWAYS AS (
+            CASE WHEN balls_for > 0 AND balls_against > 0
+                 THEN runs_for * 6.0 / balls_for - runs_against * 6.0 / balls_against END
+        ) VIRTUAL
+    ''')
+    cursor.execute('DROP INDEX IF EXISTS idx_standings_table')
+    cursor.execute('''
+        CREATE INDEX idx_standings_table
+        ON standings (group_name, points DESC, net_run_rate DESC, won DESC)
+    ''')
+
+    # Statement templates; {m} is NEW, OLD or a table alias, {sign} is + or -
+    counts_rate = ('({m}.team_a_runs IS NOT NULL AND {m}.team_b_runs IS NOT NULL '
+                   'AND {m}.team_a_balls > 0 AND {m}.team_b_balls > 0)')
+    faced = {
+        side: (f'(CASE WHEN {{m}}.team_{side}_wickets >= 10 AND {{m}}.overs_limit IS NOT NULL '
+               f'THEN {{m}}.overs_limit * 6 ELSE {{m}}.team_{side}_balls END)')
+        for side in ('a', 'b')
+    }
+
+    def for_team(team_a_value, team_b_value):
+        """The standings row's own value: 0 unless the match counts for the rate"""
+        return (f'(CASE WHEN NOT {counts_rate} THEN 0 '
+                f'WHEN team_id = {{m}}.team_a_id THEN {team_a_value} ELSE {team_b_value} END)')
+
+    # Fires under the innings_totals upsert of a delivery too, where an OR
+    # IGNORE clause would be overridden, so existing rows are skipped instead
+    ensure_rows = '''
+        INSERT INTO standings (group_name, team_id)
+        SELECT {m}.round, teams.id
+        FROM (SELECT {m}.team_a_id AS id UNION SELECT {m}.team_b_id) AS teams
+        WHERE {m}.round LIKE 'Group%' AND teams.id IS NOT NULL AND NOT EXISTS (
+            SELECT 1 FROM standings
+            WHERE group_name = {m}.round AND team_id = teams.id
+        );
+    '''
+    apply_result = f'''
+        UPDATE standings SET
+            played = played {{sign}} 1,
+            won = won {{sign}} ({{m}}.winner_id IS team_id),
+            lost = lost {{sign}} ({{m}}.winner_id IS NOT NULL AND {{m}}.winner_id IS NOT team_id),
+            no_result = no_result {{sign}} ({{m}}.winner_id IS NULL),
+            points = points {{sign}} (CASE WHEN {{m}}.winner_id IS team_id THEN 2
+                                         WHEN {{m}}.winner_id IS NULL THEN 1
+                                         ELSE 0 END),
+            runs_for = runs_for {{sign}} {for_team('{m}.team_a_runs', '{m}.team_b_runs')},
+            balls_for = balls_for {{sign}} {for_team(faced['a'], faced['b'])},
+            runs_against = runs_against {{sign}} {for_team('{m}.team_b_runs', '{m}.team_a_runs')},
+            balls_against = balls_against {{sign}} {for_team(faced['b'], faced['a'])}
+        WHERE {{m}}.status = 'completed' AND {{m}}.round LIKE 'Group%'
+          AND group_name = {{m}}.round AND team_id IN ({{m}}.team_a_id, {{m}}.team_b_id);
+    '''
+    drop_unused_rows = '''
+        DELETE FROM standings
+        WHERE group_name = OLD.round AND team_id IN (OLD.team_a_id, OLD.team_b_id)
+          AND NOT EXISTS (
+              SELECT 1 FROM matches
+              WHERE round = standings.group_name
+                AND (team_a_id = standings.team_id OR team_b_id = standings.team_id)
+          );
+    '''
+
+    for trigger in ('insert', 'update', 'delete'):
+        cursor.execute(f'DROP TRIGGER IF EXISTS trg_matches_standings_{trigger}')
+    cursor.execute(f'''
+        CREATE TRIGGER trg_matches_standings_insert
+        AFTER INSERT ON matches
+        WHEN NEW.round LIKE 'Group%'
+        BEGIN
+            {ensure_rows.format(m='NEW')}
+            {apply_result.format(m='NEW', sign='+')}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER trg_matches_standings_update
+        AFTER UPDATE OF round, team_a_id, team_b_id, status, winner_id,
+                        team_a_runs, team_a_wickets, team_a_balls,
+                        team_b_runs, team_b_wickets, team_b_balls, overs_limit ON matches
+        WHEN OLD.round LIKE 'Group%' OR NEW.round LIKE 'Group%'
+        BEGIN
+            {apply_result.format(m='OLD', sign='-')}
+            {ensure_rows.format(m='NEW')}
+            {apply_result.format(m='NEW', sign='+')}
+            {drop_unused_rows}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER trg_matches_standings_delete
+        AFTER DELETE ON matches
+        WHEN OLD.round LIKE 'Group%'
+        BEGIN
+            {apply_result.format(m='OLD', sign='-')}
+            {drop_unused_rows}
+        END
+    ''')
+
+    # Backfill the run rate totals from the completed group matches
+    for side, other in (('a', 'b'), ('b', 'a')):
+        cursor.execute(f'''
+            UPDATE standings SET
+                runs_for = runs_for + totals.runs,
+                balls_for = balls_for + totals.balls,
+                runs_against = runs_against + totals.conceded,
+                balls_against = balls_against + totals.bowled
+            FROM (
+                SELECT round, team_{side}_id AS team_id,
+                       SUM(team_{side}_runs) AS runs,
+                       SUM({faced[side].format(m='m')}) AS balls,
+                       SUM(team_{other}_runs) AS conceded,
+                       SUM({faced[other].format(m='m')}) AS bowled
+                FROM matches m
+                WHERE status = 'completed' AND round LIKE 'Group%'
+                  AND {counts_rate.format(m='m')}
+                GROUP BY round, team_{side}_id
+            ) AS totals
+            WHERE standings.group_name = totals.round AND standings.team_id = totals.team_id
+        ''')
+
+
+# Tables whose writes invalidate cached responses and users
+GENERATION_TABLES = ('users', 'teams', 'players', 'matches', 'player_statistics',
+                     'tournament_settings', 'standings', 'deliveries', 'innings_totals',
+                     'match_appearances')
+
+_NOW_EPOCH = "(julianday('now') - 2440587.5) * 86400.0"
+
+
+def track_generations(cursor, table):
+    """Bump table's row in cache_generations on every insert, update and delete"""
+    cursor.execute(f'''
+        INSERT OR IGNORE INTO cache_generations (table_name, generation, modified)
+        VALUES (?, 0, {_NOW_EPOCH})
+    ''', (table,))
+    for event in ('INSERT', 'UPDATE', 'DELETE'):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_generation_{event.lower()}
+            AFTER {event} ON {table}
+            BEGIN
+                UPDATE cache_generations
+                SET generation = generation + 1, modified = {_NOW_EPOCH}
+                WHERE table_name = '{table}';
+            END
+        ''')
+
+
+def _add_cache_generations(cursor):
+    """Write generations per table, shared by every worker process.
+
+    The response and user caches validate entries against these counters
+    (backend.database.get_table_generations). Triggers bump them in the
+    writing transaction, so every worker sees a write as soon as it
+    commits, whichever process made it and whether the table was written
+    by a statement or by another table's trigger (standings, player_count,
+    innings_totals). Tables added by later migrations call
+    track_generations() for themselves.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS cache_generations (
+            table_name TEXT PRIMARY KEY,
+            generation INTEGER NOT NULL DEFAULT 0,
+            modified REAL NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    for table in GENERATION_TABLES:
+        track_generations(cursor, table)
+
+
+# Ordered (version, description, upgrade function) steps. Never edit or
+# reorder an applied step; append a new one instead.
+MIGRATIONS = [
+    (1, 'Indexes for hot query paths', _add_hot_path_indexes),
+    (2, 'Materialized group standings', _add_standings),
+    (3, 'Maintained team player counts', _add_team_player_count),
+    (4, 'Ball-by-ball deliveries and innings totals', _add_deliveries),
+    (5, 'Knockout bracket links on matches', _add_bracket_links),
+    (6, 'Full-text search over players and teams', _add_search_index),
+    (7, 'Leaderboard rates and indexes on player statistics', _add_leaderboard_columns),
+    (8, 'Match status and schedule index', _add_status_schedule_index),
+    (9, 'Structured innings scores and net run rate', _add_structured_scores),
+    (10, 'Shared cache write generations', _add_cache_generations),
+]
+
+
+def get_schema_version(conn):
+    """Return the schema version recorded in the database"""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def run_migrations(conn):
+    """Apply all pending migrations and return the resulting version"""
+    if conn.in_transaction:
+        conn.commit()
+
+    for version, description, upgrade in MIGRATIONS:
+        if get_schema_version(conn) >= version:
+            continue
+
+        # BEGIN IMMEDIATE serializes workers that start at the same time;
+        # re-check the version once the write lock is held.
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            cursor = conn.cursor()
+            upgrade(cursor)
+            cursor.execute(f'PRAGMA user_version = {int(version)}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        conn.execute('ANALYZE')
+        conn.commit()
+        print(f"Applied migration {version}: {description}")
+
+    return get_schema_version(conn)
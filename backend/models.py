@@ -1,19 +1,40 @@
 from werkzeug.security import check_password_hash
-from backend.database import execute_single
+from backend.config import Config
+from backend.cache import LRUCache
+from backend.database import execute_single, get_table_generations
+
+# Users loaded by the Flask-Login user loader, keyed by id. Each entry keeps
+# the users table generation it was read at, so any write to users, by any
+# worker process, invalidates it.
+user_cache = LRUCache(Config.USER_CACHE_SIZE, ttl=Config.USER_CACHE_TTL)
+
+USER_COLUMNS = 'id, username, password_hash, role, created_at'
+
+
+def invalidate_user_cache(user_id=None):
+    """Drop one cached user, or all of them"""
+    if user_id is None:
+        user_cache.clear()
+    else:
+        user_cache.pop(user_id)
 
 
 class User:
     """User model for authentication"""
 
+    __slots__ = ('id', 'username', 'password_hash', 'role', 'created_at')
+
+    # Flask-Login flags, the same for every loaded user
+    is_authenticated = True
+    is_active = True
+    is_anonymous = False
+
     def __init__(self, id, username, password_hash, role, created_at):
         self.id = id
         self.username = username
         self.password_hash = password_hash
         self.role = role
         self.created_at = created_at
-        self.is_authenticated = True
-        self.is_active = True
-        self.is_anonymous = False
 
     def get_id(self):
         """Return user ID as string for Flask-Login"""
@@ -29,20 +50,27 @@ class User:
 
     @staticmethod
     def get_by_id(user_id):
-        """Get user by ID"""
+        """Get user by ID, served from the user cache when current"""
+        generation = get_table_generations(('users',))
+        cached = user_cache.get(user_id)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+
         user_data = execute_single(
-            'SELECT * FROM users WHERE id = ?',
+            f'SELECT {USER_COLUMNS} FROM users WHERE id = ?',
             (user_id,)
         )
         if user_data:
-            return User(**user_data)
+            user = User(**user_data)
+            user_cache.set(user_id, (generation, user))
+            return user
         return None
 
     @staticmethod
     def get_by_username(username):
         """Get user by username"""
         user_data = execute_single(
-            'SELECT * FROM users WHERE username = ?',
+            f'SELECT {USER_COLUMNS} FROM users WHERE username = ?',
             (username,)
         )
         if user_data:
@@ -0,0 +1,293 @@
+"""
+Import the tournament schedule from the NPL workbook or the extracted JSON.
+
+read_workbook_matches() streams the schedule sheet with openpyxl's read-only
+row iterator; read_json_matches() reads npl7_complete_data.json. Both yield
+the same normalized match dicts, which import_schedule() writes with
+executemany on the caller's transaction - either as a fresh load or as an
+upsert that only touches matches whose schedule changed and never
+overwrites results already entered.
+"""
+import re
+import unicodedata
+from datetime import datetime, date, time
+from backend.bracket import knockout_round_number
+
+try:
+    import openpyxl
+except ImportError:  # optional: only needed to read the workbook directly
+    openpyxl = None
+
+
+_TIME_RE = re.compile(
+    r'^(\d{1,2})(?:[:.](\d{2}))?(?::(\d{2}))?\s*(?:([ap])\.?\s*m\.?)?$',
+    re.IGNORECASE
+)
+
+
+def normalize_time(value):
+    """Normalize schedule times ("13:00:00", "6:40pm", time objects) to HH:MM"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        value = value.time()
+    if isinstance(value, time):
+        return value.strftime('%H:%M')
+    if isinstance(value, (int, float)):
+        # Excel stores bare times as a fraction of a day
+        minutes = round(float(value) % 1 * 24 * 60)
+        return f'{minutes // 60 % 24:02d}:{minutes % 60:02d}'
+
+    text = str(value).strip()
+    match = _TIME_RE.match(text)
+    if not match:
+        return text or None
+
+    hour, minute = int(match.group(1)), int(match.group(2) or 0)
+    meridiem = match.group(4)
+    if meridiem:
+        hour = hour % 12 + (12 if meridiem.lower() == 'p' else 0)
+    if hour > 23 or minute > 59:
+        return text
+    return f'{hour:02d}:{minute:02d}'
+
+
+def normalize_date(value):
+    """Return a schedule date as YYYY-MM-DD, or None if it is not a date"""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str):
+        for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d/%m/%Y'):
+            try:
+                return datetime.strptime(value.strip(), fmt).strftime('%Y-%m-%d')
+            except ValueError:
+                continue
+    return None
+
+
+def round_name(group):
+    """Map the sheet's group column to a round name ("1" -> "Group 1")"""
+    if group is None or str(group).strip() in ('', 'N/A'):
+        return 'Group Stage'
+    if isinstance(group, float) and group.is_integer():
+        group = int(group)
+    text = str(group).strip()
+    return f'Group {text}' if text.isdigit() else text
+
+
+def team_key(name):
+    """Matching key for team names: accents, case, spacing and punctuation ignored"""
+    text = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]', '', text.lower())
+
+
+def display_name(name):
+    """Title-case an all-caps sheet name, keeping tokens such as JF17 as is"""
+    words = str(name).split()
+    return ' '.join(
+        word if any(ch.isdigit() for ch in word) else word.capitalize()
+        for word in words
+    )
+
+
+def _match(match_date, day, match_time, group, team_a, team_b, result):
+    """Build a normalized match dict"""
+    match_date = normalize_date(match_date)
+    if isinstance(day, str) and day.strip() and not day.startswith('=') and day.strip() != 'TBD':
+        day = day.strip()
+    else:
+        day = datetime.strptime(match_date, '%Y-%m-%d').strftime('%A')
+
+    return {
+        'match_date': match_date,
+        'match_day': day,
+        'match_time': normalize_time(match_time),
+        'round': round_name(group),
+        'team_a': str(team_a).strip(),
+        'team_b': str(team_b).strip(),
+        'result': str(result).strip() if result else None
+    }
+
+
+def read_workbook_matches(path):
+    """Stream matches from the schedule workbook.
+
+    The header row (Date, Day, Time, Group, Teams, vs, Teams, Result) is
+    located on the first sheet that has one; rows without a date or both
+    teams are skipped.
+    """
+    if openpyxl is None:
+        raise RuntimeError('openpyxl is required to read the schedule workbook')
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            columns = None
+            for row in sheet.iter_rows(values_only=True):
+                if columns is None:
+                    labels = [str(cell).strip().lower() if cell is not None else '' for cell in row]
+                    if 'date' in labels and labels.count('teams') >= 2:
+                        team_columns = [i for i, label in enumerate(labels) if label == 'teams']
+                        columns = {
+                            'date': labels.index('date'),
+                            'day': labels.index('day') if 'day' in labels else None,
+                            'time': labels.index('time') if 'time' in labels else None,
+                            'group': labels.index('group') if 'group' in labels else None,
+                            'team_a': team_columns[0],
+                            'team_b': team_columns[1],
+                            'result': labels.index('result') if 'result' in labels else None
+                        }
+                    continue
+
+                def cell(name):
+                    index = columns[name]
+                    return row[index] if index is not None and index < len(row) else None
+
+                if normalize_date(cell('date')) is None or not cell('team_a') or not cell('team_b'):
+                    continue
+
+                yield _match(cell('date'), cell('day'), cell('time'), cell('group'),
+                             cell('team_a'), cell('team_b'), cell('result'))
+
+            if columns is not None:
+                return
+    finally:
+        workbook.close()
+
+
+def read_json_matches(npl_data):
+    """Yield normalized matches from the extracted NPL JSON data"""
+    for match in npl_data['matches']:
+        if normalize_date(match.get('date')) is None:
+            continue
+        yield _match(match['date'], match.get('day'), match.get('time'),
+                     match.get('group'), match['team_a'], match['team_b'],
+                     match.get('result'))
+
+
+class TeamResolver:
+    """Resolve schedule team names to team ids, creating missing teams"""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.ids = {}
+        self.created = {}
+        cursor.execute('SELECT id, name FROM teams')
+        for team_id, name in cursor.fetchall():
+            self.ids.setdefault(team_key(name), team_id)
+
+    def lookup(self, name):
+        """Return the id of an existing team, tolerating small spelling drift"""
+        key = team_key(name)
+        if key in self.ids:
+            return self.ids[key]
+
+        # "TF PLATFORM" vs "TF PLATFORMS": accept a unique near-prefix match
+        candidates = {team_id for k, team_id in self.ids.items()
+                      if (k.startswith(key) or key.startswith(k)) and abs(len(k) - len(key)) <= 2}
+        if len(candidates) == 1:
+            self.ids[key] = candidates.pop()
+            return self.ids[key]
+        return None
+
+    def resolve(self, name):
+        """Return the team id for name, creating the team if needed"""
+        team_id = self.lookup(name)
+        if team_id is None:
+            self.cursor.execute(
+                'INSERT INTO teams (name, coach_name, home_ground) VALUES (?, ?, ?)',
+                (display_name(name), 'TBD', 'TBD')
+            )
+            team_id = self.cursor.lastrowid
+            self.ids[team_key(name)] = team_id
+            self.created[display_name(name)] = team_id
+        return team_id
+
+
+def _identity(round_name, team_a_id, team_b_id):
+    """Key identifying a fixture regardless of home/away order"""
+    return (round_name, min(team_a_id, team_b_id), max(team_a_id, team_b_id))
+
+
+def import_schedule(conn, matches, upsert=False):
+    """Write normalized matches on the caller's transaction.
+
+    In upsert mode fixtures are matched to existing rows by round and team
+    pair; only rows whose date, day, time or team order changed are
+    updated, and a sheet result is only applied to a match that has no
+    result yet. Returns a summary dict including the created teams.
+    """
+    cursor = conn.cursor()
+    teams = TeamResolver(cursor)
+
+    rows = []
+    for match in matches:
+        team_a_id = teams.resolve(match['team_a'])
+        team_b_id = teams.resolve(match['team_b'])
+        winner_id = teams.lookup(match['result']) if match['result'] else None
+        if winner_id not in (team_a_id, team_b_id):
+            winner_id = None
+        rows.append((match, team_a_id, team_b_id, winner_id))
+
+    existing = {}
+    if upsert:
+        cursor.execute('''
+            SELECT id, round, team_a_id, team_b_id, match_date, match_day,
+                   match_time, status, winner_id
+            FROM matches
+            ORDER BY id
+        ''')
+        for row in cursor.fetchall():
+            existing.setdefault(_identity(row[1], row[2], row[3]), []).append(row)
+
+    inserts, updates, results = [], [], []
+    unchanged = 0
+    for match, team_a_id, team_b_id, winner_id in rows:
+        schedule = (match['match_date'], match['match_day'], match['match_time'],
+                    team_a_id, team_b_id)
+        candidates = existing.get(_identity(match['round'], team_a_id, team_b_id))
+
+        if not candidates:
+            inserts.append(schedule + ('TBD', match['round'],
+                                       'completed' if winner_id else 'scheduled',
+                                       winner_id, knockout_round_number(match['round'])))
+            continue
+
+        current = candidates.pop(0)
+        changed = False
+        if (current[4], current[5], current[6], current[2], current[3]) != schedule:
+            updates.append(schedule + (current[0],))
+            changed = True
+        if winner_id and current[8] is None and current[7] != 'completed':
+            results.append((winner_id, current[0]))
+            changed = True
+        if not changed:
+            unchanged += 1
+
+    if inserts:
+        cursor.executemany('''
+            INSERT INTO matches (match_date, match_day, match_time, team_a_id, team_b_id,
+                                 venue, round, status, winner_id, round_number)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', inserts)
+    if updates:
+        cursor.executemany('''
+            UPDATE matches
+            SET match_date = ?, match_day = ?, match_time = ?, team_a_id = ?, team_b_id = ?
+            WHERE id = ?
+        ''', updates)
+    if results:
+        cursor.executemany('''
+            UPDATE matches SET winner_id = ?, status = 'completed'
+            WHERE id = ? AND winner_id IS NULL
+        ''', results)
+
+    return {
+        'inserted': len(inserts),
+        'updated': len(updates),
+        'results_applied': len(results),
+        'unchanged': unchanged,
+        'teams_created': teams.created
+    }
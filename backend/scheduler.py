@@ -0,0 +1,187 @@
+"""
+Group-stage fixture scheduling.
+
+plan_group_stage() turns groups of teams into a dated round-robin. Each
+group's fixtures come from the circle method, so every team plays once
+per round and is listed first in about half its matches. The fixtures are then placed
+into the calendar's slots (playing days x daily start times x venues)
+under these constraints:
+
+  - a team never plays two matches starting less than min_rest_minutes
+    apart (the NPL sheet runs 20-minute matches at 18:00/18:20/18:40),
+    and never two matches at the same time
+  - a team plays at most max_matches_per_day matches on one day
+
+Placement is a greedy constructive search over the slots in time order:
+each slot takes the feasible fixture from the earliest round that is most
+constrained (its teams have the most matches left), preferring teams that
+have waited longest. The search is repeated with randomized tie-breaks
+and the schedule that finishes earliest (then with the fewest teams
+playing twice on a day) is kept. Runs are seeded, so the same input
+always gives the same schedule.
+"""
+import random
+from datetime import timedelta
+
+WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+
+def round_robin(team_ids):
+    """Circle-method rounds for one group; each round is a list of (team_a, team_b).
+
+    Each pair is listed with the team that has been listed first less
+    often in front, so every team is team A in about half its matches.
+    """
+    teams = list(team_ids)
+    if len(teams) % 2:
+        teams.append(None)  # the team drawn against None rests that round
+
+    size = len(teams)
+    listed_first = dict.fromkeys(team_ids, 0)
+    rounds = []
+    for _ in range(size - 1):
+        pairs = []
+        for i in range(size // 2):
+            a, b = teams[i], teams[size - 1 - i]
+            if a is None or b is None:
+                continue
+            if listed_first[b] < listed_first[a]:
+                a, b = b, a
+            listed_first[a] += 1
+            pairs.append((a, b))
+        rounds.append(pairs)
+        # Keep the first team fixed and rotate the rest
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return rounds
+
+
+def _minutes(match_time):
+    hour, minute = match_time.split(':')
+    return int(hour) * 60 + int(minute)
+
+
+def _playing_days(start_date, weekdays, max_days):
+    """(day index, date) of every playing day within max_days of start_date"""
+    for offset in range(max_days):
+        day = start_date + timedelta(days=offset)
+        if weekdays is None or WEEKDAYS[day.weekday()] in weekdays:
+            yield offset, day
+
+
+def _place(fixtures, days, times, venues, min_rest, max_per_day, rng):
+    """One greedy pass; returns (placements, score) or None if the calendar runs out"""
+    pending = list(fixtures)
+    if rng is not None:
+        rng.shuffle(pending)
+        pending.sort(key=lambda fixture: fixture[1])
+
+    remaining = {}
+    for _, _, team_a, team_b in pending:
+        remaining[team_a] = remaining.get(team_a, 0) + 1
+        remaining[team_b] = remaining.get(team_b, 0) + 1
+    last_start = {}
+    played_today = {}
+    doubles = 0
+    placements = []
+    slot_number = 0
+
+    for day_index, day in days:
+        played_today.clear()
+        for match_time in times:
+            start = day_index * 1440 + _minutes(match_time)
+            busy = set()
+            for venue in venues:
+                slot_number += 1
+                best, best_key = None, None
+                for index, (group, round_index, team_a, team_b) in enumerate(pending):
+                    if team_a in busy or team_b in busy:
+                        continue
+                    if start - last_start.get(team_a, -min_rest) < min_rest or \
+                            start - last_start.get(team_b, -min_rest) < min_rest:
+                        continue
+                    if max_per_day is not None and (played_today.get(team_a, 0) >= max_per_day
+                                                    or played_today.get(team_b, 0) >= max_per_day):
+                        continue
+                    key = (
+                        round_index,
+                        -(remaining[team_a] + remaining[team_b]),
+                        min(last_start.get(team_a, -1), last_start.get(team_b, -1)),
+                        rng.random() if rng is not None else index
+                    )
+                    if best_key is None or key < best_key:
+                        best, best_key = index, key
+                if best is None:
+                    continue
+
+                group, _, team_a, team_b = pending.pop(best)
+                for team in (team_a, team_b):
+                    remaining[team] -= 1
+                    last_start[team] = start
+                    played_today[team] = played_today.get(team, 0) + 1
+                    if played_today[team] == 2:
+                        doubles += 1
+                busy.update((team_a, team_b))
+                placements.append((day, match_time, venue, group, team_a, team_b))
+
+            if not pending:
+                return placements, (slot_number, doubles)
+    return None
+
+
+def plan_group_stage(groups, start_date, times, venues=('TBD',), min_rest_minutes=0,
+                     max_matches_per_day=None, weekdays=None, max_days=366, attempts=20, seed=1):
+    """Schedule a round-robin within each group.
+
+    groups maps round names ("Group 1", ...) to team ids; times are the
+    daily start times as HH:MM and venues the grounds available at each
+    of them. weekdays, if given, restricts play to those day names.
+    Returns match dicts (match_date, match_day, match_time, venue, round,
+    team_a_id, team_b_id) in playing order. Raises ValueError for invalid
+    input or when the fixtures do not fit into max_days.
+    """
+    if not groups:
+        raise ValueError('At least one group is required')
+    if not times:
+        raise ValueError('At least one daily time slot is required')
+    if not venues:
+        raise ValueError('At least one venue is required')
+    if weekdays is not None and not set(weekdays) & set(WEEKDAYS):
+        raise ValueError('weekdays must include at least one day name')
+
+    seen = set()
+    fixtures = []
+    for group, team_ids in groups.items():
+        if len(team_ids) < 2:
+            raise ValueError(f'{group} needs at least 2 teams')
+        if seen & set(team_ids) or len(set(team_ids)) != len(team_ids):
+            raise ValueError('Each team can only appear once across the groups')
+        seen.update(team_ids)
+        for round_index, pairs in enumerate(round_robin(team_ids)):
+            fixtures.extend((group, round_index, a, b) for a, b in pairs)
+
+    times = sorted(set(times), key=_minutes)
+    days = list(_playing_days(start_date, weekdays, max_days))
+
+    best = None
+    rng = random.Random(seed)
+    for attempt in range(max(1, attempts)):
+        result = _place(fixtures, days, times, venues, min_rest_minutes, max_matches_per_day,
+                        rng if attempt else None)
+        if result is not None and (best is None or result[1] < best[1]):
+            best = result
+            if best[1] == (len(fixtures), 0):
+                break  # no empty slot before the last match and no doubles
+
+    if best is None:
+        raise ValueError(f'{len(fixtures)} matches do not fit into {max_days} days '
+                         'with these slots and rest constraints')
+
+    return [{
+        'match_date': day.isoformat(),
+        'match_day': WEEKDAYS[day.weekday()],
+        'match_time': match_time,
+        'venue': venue,
+        'round': group,
+        'team_a_id': team_a,
+        'team_b_id': team_b
+    } for day, match_time, venue, group, team_a, team_b in best[0]]
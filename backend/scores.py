@@ -0,0 +1,72 @@
+"""
+Innings scores as runs, wickets and legal balls.
+
+Matches store each side's innings both as typed columns (team_a_runs,
+team_a_wickets, team_a_balls, ...) and as the display text shown on the
+site, "145/7 (19.4)". format_score() derives the text from the numbers in
+the same shape as the ball-by-ball triggers write it; parse_score() reads
+the numbers back out of text typed by hand ("145/7 (19.4 ov)", "145-7",
+"98 all out (17.2)").
+"""
+import re
+
+ALL_OUT_WICKETS = 10
+
+_SCORE_RE = re.compile(
+    r'^\s*(\d+)\s*(?:[/-]\s*(\d+)|\s+all\s*out)?\s*'
+    r'(?:\(\s*(\d+)(?:\.(\d))?\s*(?:ov(?:ers?|s)?\.?)?\s*\))?\s*$',
+    re.IGNORECASE
+)
+
+
+def overs_to_balls(overs):
+    """Legal balls in an overs figure such as "19.4" (or 19.4 or 20)"""
+    text = str(overs).strip()
+    match = re.match(r'^(\d+)(?:\.(\d))?$', text)
+    if not match or int(match.group(2) or 0) > 5:
+        raise ValueError(f'Invalid overs: {overs}')
+    return int(match.group(1)) * 6 + int(match.group(2) or 0)
+
+
+def balls_to_overs(balls):
+    """Overs figure for a number of legal balls: 118 -> "19.4", 120 -> "20" """
+    return f'{balls // 6}.{balls % 6}' if balls % 6 else str(balls // 6)
+
+
+def format_score(runs, wickets, balls):
+    """Display text for an innings: "145/7 (19.4)", or "145/7" without balls"""
+    text = f'{runs}/{wickets if wickets is not None else 0}'
+    if balls is not None:
+        text += f' ({balls_to_overs(balls)})'
+    return text
+
+
+def parse_score(text):
+    """(runs, wickets, balls) read from score text, or None if it is not a score.
+
+    A score without a wicket count is taken as 0 wickets, "all out" as 10;
+    balls is None when the overs are not given.
+    """
+    if text is None:
+        return None
+    match = _SCORE_RE.match(str(text))
+    if not match:
+        return None
+
+    runs = int(match.group(1))
+    if match.group(2) is not None:
+        wickets = int(match.group(2))
+    elif re.search(r'all\s*out', str(text), re.IGNORECASE):
+        wickets = ALL_OUT_WICKETS
+    else:
+        wickets = 0
+    if wickets > ALL_OUT_WICKETS:
+        return None
+
+    balls = None
+    if match.group(3) is not None:
+        extra = int(match.group(4) or 0)
+        if extra > 5:
+            return None
+        balls = int(match.group(3)) * 6 + extra
+    return runs, wickets, balls
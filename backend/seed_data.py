@@ -4,12 +4,15 @@ Seed script to populate NPL Cricket Tournament database with NPL Season 7 data
 import sys
 import os
 import json
+import argparse
 
 # Add parent directory to Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from backend.database import get_db_connection, init_db
-from datetime import datetime, timedelta
+from backend.schedule_import import read_json_matches, read_workbook_matches, import_schedule
+
+SCHEDULE_WORKBOOK = os.path.join(os.path.dirname(__file__), '..', 'NPL 7 II Updated Schedule.xlsx')
 
 
 def clear_existing_data(conn):
@@ -21,7 +24,6 @@ def clear_existing_data(conn):
     cursor.execute('DELETE FROM matches')
     cursor.execute('DELETE FROM players')
     cursor.execute('DELETE FROM teams')
-    conn.commit()
     print("Existing data cleared.")
 
 
@@ -32,34 +34,29 @@ def load_npl7_data():
         return json.load(f)
 
 
-def seed_teams(conn, npl_data):
-    """Seed teams data from NPL 7"""
+def seed_teams(conn, team_names):
+    """Seed teams by name, returning a name -> id mapping"""
     cursor = conn.cursor()
+    team_names = list(team_names)
 
-    teams = npl_data['teams']
-
-    print(f"\nSeeding {len(teams)} teams...")
-    team_ids = {}
-
-    for team_name in teams:
-        cursor.execute(
-            '''INSERT INTO teams (name, coach_name, home_ground)
-               VALUES (?, ?, ?)''',
-            (team_name, 'TBD', 'TBD')
-        )
-        team_id = cursor.lastrowid
-        team_ids[team_name] = team_id
-        print(f"  [+] Added: {team_name}")
+    print(f"\nSeeding {len(team_names)} teams...")
+    cursor.executemany(
+        '''INSERT INTO teams (name, coach_name, home_ground)
+           VALUES (?, ?, ?)''',
+        [(team_name, 'TBD', 'TBD') for team_name in team_names]
+    )
 
-    conn.commit()
-    return team_ids
+    cursor.execute('SELECT id, name FROM teams')
+    team_ids = {row['name']: row['id'] for row in cursor.fetchall()}
+    print(f"  [+] Added {len(team_names)} teams")
+    return {name: team_ids[name] for name in team_names}
 
 
-def seed_players(conn, team_ids):
-    """Seed players data for all teams"""
+def seed_players(conn, team_ids, squad_size=11):
+    """Seed a squad (11 players by default) with empty statistics for each team"""
     cursor = conn.cursor()
 
-    # Player templates (11 players per team)
+    # Player templates, cycled for squads larger than 11
     player_templates = [
         {'role': 'Batsman', 'batting_style': 'Right-hand', 'bowling_style': None},
         {'role': 'Batsman', 'batting_style': 'Left-hand', 'bowling_style': None},
@@ -78,100 +75,54 @@ def seed_players(conn, team_ids):
     last_names = ['Sharma', 'Thapa', 'Gurung', 'Rai', 'Bajracharya', 'Tamang', 'Poudel', 'Chaudhary', 'Bhandari', 'Karki', 'Shrestha']
 
     print("\nSeeding players...")
-    player_count = 0
-
-    for idx, (team_name, team_id) in enumerate(team_ids.items()):
-        print(f"  Adding players for {team_name}...")
-
-        for jersey_num, template in enumerate(player_templates, start=1):
-            player_name = f"{first_names[jersey_num - 1]} {last_names[(idx + jersey_num) % len(last_names)]}"
-
-            cursor.execute(
-                '''INSERT INTO players (name, team_id, role, jersey_number, batting_style, bowling_style)
-                   VALUES (?, ?, ?, ?, ?, ?)''',
-                (player_name, team_id, template['role'], jersey_num,
-                 template['batting_style'], template['bowling_style'])
-            )
+    players = []
+    for idx, team_id in enumerate(team_ids.values()):
+        for jersey_num in range(1, squad_size + 1):
+            template = player_templates[(jersey_num - 1) % len(player_templates)]
+            player_name = f"{first_names[(jersey_num - 1) % len(first_names)]} {last_names[(idx + jersey_num) % len(last_names)]}"
+            players.append((player_name, team_id, template['role'], jersey_num,
+                            template['batting_style'], template['bowling_style']))
+
+    cursor.executemany(
+        '''INSERT INTO players (name, team_id, role, jersey_number, batting_style, bowling_style)
+           VALUES (?, ?, ?, ?, ?, ?)''',
+        players
+    )
 
-            player_id = cursor.lastrowid
+    # Add initial statistics for every player that has none yet
+    cursor.execute(
+        '''INSERT INTO player_statistics (player_id)
+           SELECT p.id FROM players p
+           LEFT JOIN player_statistics ps ON ps.player_id = p.id
+           WHERE ps.id IS NULL'''
+    )
 
-            # Add initial statistics for each player
-            cursor.execute(
-                '''INSERT INTO player_statistics (player_id, matches_played, runs_scored,
-                   balls_faced, fours, sixes, wickets_taken, balls_bowled, runs_conceded, catches, stumpings)
-                   VALUES (?, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)''',
-                (player_id,)
-            )
+    # Set captain (first player of each team)
+    cursor.executemany(
+        'UPDATE teams SET captain_id = (SELECT MIN(id) FROM players WHERE team_id = ?) WHERE id = ?',
+        [(team_id, team_id) for team_id in team_ids.values()]
+    )
 
-            player_count += 1
+    print(f"  [+] Added {len(players)} players across {len(team_ids)} teams")
 
-        # Set captain (first player of each team)
-        cursor.execute(
-            'UPDATE teams SET captain_id = (SELECT id FROM players WHERE team_id = ? LIMIT 1) WHERE id = ?',
-            (team_id, team_id)
-        )
 
-    conn.commit()
-    print(f"  [+] Added {player_count} players across all teams")
+def load_schedule(source):
+    """Return normalized matches from the workbook or the extracted JSON"""
+    if source == 'xlsx':
+        print(f"\nStreaming schedule from {os.path.basename(SCHEDULE_WORKBOOK)}...")
+        return list(read_workbook_matches(SCHEDULE_WORKBOOK))
 
+    print("\nLoading NPL 7 data from Excel extraction...")
+    return list(read_json_matches(load_npl7_data()))
 
-def seed_matches(conn, team_ids, npl_data):
-    """Seed match schedule from NPL 7 data"""
-    cursor = conn.cursor()
 
-    matches = npl_data['matches']
-
-    print(f"\nSeeding {len(matches)} matches...")
-
-    matches_added = 0
-    for match_data in matches:
-        team_a_name = match_data['team_a']
-        team_b_name = match_data['team_b']
-
-        # Get team IDs
-        team_a_id = team_ids.get(team_a_name)
-        team_b_id = team_ids.get(team_b_name)
-
-        if not team_a_id or not team_b_id:
-            print(f"  [!] Skipping match: {team_a_name} vs {team_b_name} (team not found)")
-            continue
-
-        # Parse date
-        try:
-            if isinstance(match_data['date'], str):
-                match_date = datetime.strptime(match_data['date'], '%Y-%m-%d %H:%M:%S')
-            else:
-                match_date = match_data['date']
-        except:
-            match_date = datetime(2025, 11, 17)  # Default date
-
-        # Determine round based on group
-        group = match_data.get('group', 'N/A')
-        round_name = f"Group {group}" if group != 'N/A' else "Group Stage"
-
-        # Get winner ID if result exists
-        winner_id = None
-        result_text = match_data.get('result')
-        if result_text:
-            winner_id = team_ids.get(result_text)
-
-        # Determine status
-        status = 'completed' if result_text else 'scheduled'
-
-        cursor.execute(
-            '''INSERT INTO matches (match_date, match_day, team_a_id, team_b_id,
-               venue, match_time, round, status, winner_id)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-            (match_date.strftime('%Y-%m-%d'),
-             match_data.get('day', 'TBD'),
-             team_a_id, team_b_id,
-             'TBD', match_data.get('time', 'TBD'),
-             round_name, status, winner_id)
-        )
-        matches_added += 1
-
-    conn.commit()
-    print(f"  [+] Added {matches_added} matches")
+def seed_matches(conn, matches, upsert=False):
+    """Seed (or upsert) the match schedule"""
+    print(f"\n{'Upserting' if upsert else 'Seeding'} {len(matches)} matches...")
+    summary = import_schedule(conn, matches, upsert=upsert)
+    print(f"  [+] {summary['inserted']} inserted, {summary['updated']} updated, "
+          f"{summary['results_applied']} results applied, {summary['unchanged']} unchanged")
+    return summary
 
 
 def update_tournament_settings(conn):
@@ -190,12 +141,19 @@ def update_tournament_settings(conn):
            WHERE id = 1''',
         ('NPL Season 7', 24, 'Group Stage + Knockout', '2025-11-17', '2025-11-30')
     )
-    conn.commit()
     print("  [+] Tournament settings updated")
 
 
 def main():
     """Main seeding function"""
+    parser = argparse.ArgumentParser(description='Seed the NPL Season 7 database')
+    parser.add_argument('--source', choices=['json', 'xlsx'], default='json',
+                        help='read the schedule from the extracted JSON (default) '
+                             'or stream it from the schedule workbook')
+    parser.add_argument('--upsert', action='store_true',
+                        help='update the existing schedule in place, keeping entered results')
+    args = parser.parse_args()
+
     print("="*60)
     print("NPL Season 7 - Database Seed Script")
     print("="*60)
@@ -205,32 +163,41 @@ def main():
     init_db()
     print("Database tables initialized.")
 
-    # Load NPL 7 data
-    print("\nLoading NPL 7 data from Excel extraction...")
-    npl_data = load_npl7_data()
-    print(f"Loaded {len(npl_data['teams'])} teams and {len(npl_data['matches'])} matches")
+    matches = load_schedule(args.source)
 
     conn = get_db_connection()
 
     try:
-        # Clear existing data
-        clear_existing_data(conn)
-
-        # Seed data
-        team_ids = seed_teams(conn, npl_data)
-        seed_players(conn, team_ids)
-        seed_matches(conn, team_ids, npl_data)
-        update_tournament_settings(conn)
+        # Everything below runs as a single transaction
+        conn.execute('BEGIN IMMEDIATE')
+
+        if args.upsert:
+            summary = seed_matches(conn, matches, upsert=True)
+            if summary['teams_created']:
+                seed_players(conn, summary['teams_created'])
+        else:
+            clear_existing_data(conn)
+            team_ids = {}
+            if args.source == 'json':
+                team_ids = seed_teams(conn, load_npl7_data()['teams'])
+            summary = seed_matches(conn, matches)
+            team_ids.update(summary['teams_created'])
+            seed_players(conn, team_ids)
+            update_tournament_settings(conn)
+
+        conn.commit()
 
         print("\n" + "="*60)
         print("Database seeded successfully!")
         print("="*60)
         print("\nSummary:")
-        print(f"  - {len(team_ids)} Teams added")
-        print(f"  - {len(team_ids) * 11} Players added (11 per team)")
-        print(f"  - {len(npl_data['matches'])} Matches scheduled")
-        print(f"  - Tournament: NPL Season 7")
-        print(f"  - Format: Group Stage + Knockout")
+        if summary['teams_created'] or not args.upsert:
+            print(f"  - {len(summary['teams_created'])} Teams created from the schedule")
+        print(f"  - {summary['inserted']} Matches inserted, {summary['updated']} updated")
+        print(f"  - {summary['results_applied']} Results applied")
+        if not args.upsert:
+            print(f"  - Tournament: NPL Season 7")
+            print(f"  - Format: Group Stage + Knockout")
         print("="*60)
 
     except Exception as e:
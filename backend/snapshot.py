@@ -0,0 +1,187 @@
+"""
+In-memory read snapshot (optional, SNAPSHOT_ENABLED).
+
+Each worker process copies the database file into a shared-cache
+in-memory database with the sqlite3 backup API when the app starts. GET
+and HEAD requests then read from that copy through their own small pool
+of connections, so public reads never touch the disk; every other method
+keeps using the on-disk database, so writes stay durable.
+
+At the start of each read request the snapshot compares the file's
+PRAGMA data_version, read on a dedicated watcher connection, with the
+version it was built from. The version changes whenever any other
+connection, in this process or another, commits, and the snapshot is then
+rebuilt before the request runs: a write is visible to the next read.
+Rebuilds make a complete new copy and swap it in, so requests already
+reading the previous copy finish on it undisturbed.
+
+Snapshot connections are query_only: a stray write fails instead of
+being lost with the copy.
+"""
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from flask import g, request
+from backend.config import Config
+from backend import database
+
+READ_METHODS = ('GET', 'HEAD')
+
+_names = itertools.count(1)
+
+
+class SnapshotCopy:
+    """One in-memory copy of the database and its idle reader connections.
+
+    The copy lives as long as any connection to it is open: the anchor
+    connection holds it while it is current, and readers still checked out
+    after it is replaced keep it alive until they are released.
+    """
+
+    def __init__(self, source):
+        self.uri = f'file:npl-snapshot-{os.getpid()}-{next(_names)}?mode=memory&cache=shared'
+        self.anchor = self.connect()
+        source.backup(self.anchor)
+        self.size = self.anchor.execute('PRAGMA page_count').fetchone()[0] * \
+            self.anchor.execute('PRAGMA page_size').fetchone()[0]
+        self.anchor.execute('PRAGMA query_only = ON')
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self.retired = False
+
+    def connect(self):
+        """Open a connection to this copy"""
+        conn = sqlite3.connect(
+            self.uri,
+            uri=True,
+            check_same_thread=False,
+            cached_statements=Config.DB_STATEMENT_CACHE_SIZE,
+            factory=database.connection_class()
+        )
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def acquire(self):
+        """Check out a reader connection, opening one if none is idle"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        conn = self.connect()
+        conn.execute('PRAGMA query_only = ON')
+        return conn
+
+    def release(self, conn):
+        """Keep a reader for reuse, or close it once the copy is replaced"""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if not self.retired and len(self._idle) < Config.DB_POOL_SIZE:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def retire(self):
+        """Close the anchor and idle readers; checked-out readers close on release"""
+        with self._lock:
+            self.retired = True
+            idle, self._idle = self._idle, deque()
+        for conn in idle:
+            conn.close()
+        self.anchor.close()
+
+
+class ReadSnapshot:
+    """The current in-memory copy of one database file, rebuilt when the file changes"""
+
+    def __init__(self, database_path):
+        self.database_path = database_path
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._watcher = None
+        self.current = None
+        self.version = None
+        self.refreshes = 0
+        self.refresh_seconds = 0.0
+        self.refreshed_at = None
+
+    def _refresh(self):
+        """Copy the database file into a new in-memory copy and swap it in"""
+        started = time.perf_counter()
+        if self._watcher is None:
+            # Not instrumented: the version check is bookkeeping, not a
+            # query of the request
+            self._watcher = sqlite3.connect(self.database_path, check_same_thread=False,
+                                            timeout=Config.DB_BUSY_TIMEOUT_MS / 1000)
+        # Read the version first: a commit racing with the copy leaves the
+        # version behind and triggers another rebuild
+        version = self._watcher.execute('PRAGMA data_version').fetchone()[0]
+        copy = SnapshotCopy(self._watcher)
+
+        previous, self.current, self.version = self.current, copy, version
+        if previous is not None:
+            previous.retire()
+        self.refreshes += 1
+        self.refresh_seconds += time.perf_counter() - started
+        self.refreshed_at = time.time()
+
+    def acquire(self):
+        """Return (copy, connection) for a read, rebuilding the copy if the file changed"""
+        with self._lock:
+            if self._pid != os.getpid():
+                # Connections inherited across fork() must not be reused
+                self._pid = os.getpid()
+                self._watcher = self.current = self.version = None
+            if self.current is None or \
+                    self._watcher.execute('PRAGMA data_version').fetchone()[0] != self.version:
+                self._refresh()
+            copy = self.current
+        return copy, copy.acquire()
+
+    def stats(self):
+        """Return refresh counters and the size of the current copy"""
+        with self._lock:
+            return {
+                'bytes': self.current.size if self.current else 0,
+                'refreshes': self.refreshes,
+                'refresh_seconds': round(self.refresh_seconds, 3),
+                'refreshed_at': self.refreshed_at
+            }
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot():
+    """Return this process's snapshot of Config.DATABASE_PATH"""
+    global _snapshot
+    if _snapshot is None or _snapshot.database_path != Config.DATABASE_PATH:
+        with _snapshot_lock:
+            if _snapshot is None or _snapshot.database_path != Config.DATABASE_PATH:
+                _snapshot = ReadSnapshot(Config.DATABASE_PATH)
+    return _snapshot
+
+
+def get_snapshot_stats():
+    """Return snapshot counters, or None when the mode is off"""
+    return get_snapshot().stats() if Config.SNAPSHOT_ENABLED else None
+
+
+def init_app(app):
+    """Serve GET and HEAD requests from the in-memory snapshot"""
+    if not Config.SNAPSHOT_ENABLED:
+        return
+
+    # Load the copy now rather than on the first request
+    snapshot = get_snapshot()
+    copy, conn = snapshot.acquire()
+    copy.release(conn)
+
+    @app.before_request
+    def use_snapshot():
+        if request.method in READ_METHODS and 'db_conn' not in g:
+            copy, conn = get_snapshot().acquire()
+            database.use_db(conn, copy.release)
@@ -0,0 +1,13 @@
+"""
+Benchmarks and load tests for the tournament API.
+
+league.py generates synthetic leagues of configurable size on top of the
+seed_data functions, app.py is an app factory that counts SQL statements
+per request, and run.py drives every blueprint through the Flask test
+client and/or a threaded HTTP load generator against gunicorn, writing
+latency percentiles, throughput and queries per request as JSON.
+compare.py diffs two result files.
+
+    python -m benchmarks.run --profile small
+    python -m benchmarks.compare before.json after.json
+"""
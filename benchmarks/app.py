@@ -0,0 +1,25 @@
+"""
+App factory for benchmark runs.
+
+Identical to backend.app.create_app() with metrics enabled, except that
+every response carries the number of SQL statements its request ran in an
+X-Query-Count header, so the load generator can report queries per
+request for an out-of-process server too.
+"""
+from backend.config import Config
+from backend import metrics
+from backend.app import create_app as create_backend_app
+
+
+def create_app():
+    """Create the application with per-request query counts in the response"""
+    Config.METRICS_ENABLED = True
+    app = create_backend_app()
+
+    @app.after_request
+    def add_query_count(response):
+        current = metrics.current_request()
+        response.headers['X-Query-Count'] = str(current.queries if current else 0)
+        return response
+
+    return app
@@ -0,0 +1,88 @@
+"""
+Compare two benchmark result files.
+
+Prints p50/p95 latency, throughput and queries per request of every
+endpoint measured in both runs, with the relative change. Latency changes
+beyond --threshold percent are marked as better (-) or worse (+).
+
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+
+
+def load(path):
+    """Read a result file written by benchmarks.run"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def change(before, after):
+    """Relative change in percent, None if either side is missing"""
+    if before in (None, 0) or after is None:
+        return None
+    return (after - before) / before * 100
+
+
+def describe(meta):
+    """One-line summary of a run"""
+    return (f"{meta.get('commit') or 'unknown'} @ {meta.get('timestamp')} "
+            f"({meta.get('profile')}, cache {'on' if meta.get('response_cache') else 'off'})")
+
+
+def main():
+    """Print per-endpoint deltas between two runs"""
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files')
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='percent change in p50 latency flagged as a difference')
+    args = parser.parse_args()
+
+    before, after = load(args.before), load(args.after)
+    print(f"before: {describe(before['meta'])}")
+    print(f"after:  {describe(after['meta'])}")
+
+    regressions = 0
+    for mode in ('client', 'http'):
+        old_results = before['results'].get(mode)
+        new_results = after['results'].get(mode)
+        if not old_results or not new_results:
+            continue
+
+        print(f"\n{mode}")
+        print(f"  {'endpoint':28s} {'p50 ms':>19s} {'p95 ms':>19s} {'req/s':>17s} {'queries':>13s}")
+        for name in old_results:
+            if name not in new_results:
+                continue
+            old, new = old_results[name], new_results[name]
+            p50 = change(old['p50_ms'], new['p50_ms'])
+            flag = ' '
+            if p50 is not None and abs(p50) >= args.threshold:
+                flag = '+' if p50 > 0 else '-'
+                regressions += p50 > 0
+            print(f"{flag} {name:28s} "
+                  f"{_pair(old['p50_ms'], new['p50_ms'], p50):>19s} "
+                  f"{_pair(old['p95_ms'], new['p95_ms'], change(old['p95_ms'], new['p95_ms'])):>19s} "
+                  f"{_pair(old['throughput_rps'], new['throughput_rps'], None):>17s} "
+                  f"{_pair(old['queries_per_request'], new['queries_per_request'], None):>13s}")
+
+    print(f"\n{regressions} endpoint(s) slower by {args.threshold:g}% or more at p50")
+
+
+def _pair(old, new, percent):
+    """Format 'old -> new (+x%)'"""
+    text = f"{_number(old)}->{_number(new)}"
+    if percent is not None:
+        text += f" {percent:+.0f}%"
+    return text
+
+
+def _number(value):
+    if value is None:
+        return '-'
+    return f'{value:g}' if value >= 100 or value == int(value) else f'{value:.2f}'
+
+
+if __name__ == '__main__':
+    main()
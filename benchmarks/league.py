@@ -0,0 +1,101 @@
+"""
+Synthetic league generator.
+
+Builds a league of any size with the seed_data functions: teams are
+seeded by name, several seasons of group round-robins are imported
+through the schedule importer (so standings are maintained by the same
+triggers as in production), then squads are added to every team. All of
+it runs in one transaction.
+"""
+import random
+from datetime import date, timedelta
+from backend.database import init_db, get_db_connection
+from backend.seed_data import clear_existing_data, seed_teams, seed_players, seed_matches
+
+# Named league sizes; matches per season = groups * C(group_size, 2)
+PROFILES = {
+    'small': {'teams': 24, 'squad_size': 11, 'seasons': 1, 'group_size': 6},
+    'medium': {'teams': 500, 'squad_size': 16, 'seasons': 3, 'group_size': 6},
+    'large': {'teams': 5000, 'squad_size': 22, 'seasons': 3, 'group_size': 6},
+}
+
+MATCH_TIMES = ('10:00', '14:00', '18:00')
+
+
+def team_names(count):
+    """Distinct synthetic team names"""
+    return [f'League Team {number:05d}' for number in range(1, count + 1)]
+
+
+def season_matches(season, names, group_size, rng, completed_ratio):
+    """Round-robin group matches for one season as normalized match dicts"""
+    start = date(2020 + season, 1, 1)
+    shuffled = names[:]
+    rng.shuffle(shuffled)
+
+    fixtures = []
+    for group_number, first in enumerate(range(0, len(shuffled), group_size), start=1):
+        group = shuffled[first:first + group_size]
+        round_name = f'Group S{season}-{group_number}'
+        for i, team_a in enumerate(group):
+            for team_b in group[i + 1:]:
+                fixtures.append((round_name, team_a, team_b))
+
+    matches = []
+    per_day = max(len(MATCH_TIMES), len(fixtures) // 300 + 1)
+    for index, (round_name, team_a, team_b) in enumerate(fixtures):
+        match_date = start + timedelta(days=index // per_day)
+        result = None
+        if rng.random() < completed_ratio:
+            result = rng.choice((team_a, team_b))
+        matches.append({
+            'match_date': match_date.isoformat(),
+            'match_day': match_date.strftime('%A'),
+            'match_time': MATCH_TIMES[index % len(MATCH_TIMES)],
+            'round': round_name,
+            'team_a': team_a,
+            'team_b': team_b,
+            'result': result
+        })
+    return matches
+
+
+def generate_league(profile='small', seed=7, **overrides):
+    """Replace the database contents with a synthetic league.
+
+    overrides replace individual PROFILES settings. Returns the settings
+    used plus row counts.
+    """
+    settings = dict(PROFILES[profile], **overrides)
+    rng = random.Random(seed)
+    names = team_names(settings['teams'])
+
+    matches = []
+    for season in range(settings['seasons']):
+        # Earlier seasons are finished, the latest is half played
+        completed = 1.0 if season < settings['seasons'] - 1 else 0.5
+        matches.extend(season_matches(season, names, settings['group_size'], rng, completed))
+
+    init_db()
+    conn = get_db_connection()
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        clear_existing_data(conn)
+        team_ids = seed_teams(conn, names)
+        seed_matches(conn, matches)
+        seed_players(conn, team_ids, squad_size=settings['squad_size'])
+        conn.commit()
+
+        conn.execute('ANALYZE')
+        conn.commit()
+        counts = {
+            table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+            for table in ('teams', 'players', 'matches', 'standings')
+        }
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    return {'profile': profile, 'settings': settings, 'rows': counts}
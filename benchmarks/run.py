@@ -0,0 +1,377 @@
+"""
+Benchmark runner.
+
+Generates (or reuses) a synthetic league database, then measures every
+scenario below in one or both modes:
+
+  client  sequential requests through the Flask test client, in process
+  http    concurrent keep-alive requests from a thread pool against a
+          local gunicorn serving benchmarks.app:create_app()
+
+Results (p50/p95/p99/mean latency in ms, throughput in requests/s,
+queries per request and error count per endpoint) are written as JSON
+together with the commit, profile and settings of the run.
+
+    python -m benchmarks.run --profile medium --mode both --requests 500
+"""
+import sys
+import os
+import argparse
+import http.client
+import json
+import platform
+import random
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from backend.config import Config
+from benchmarks.league import PROFILES, generate_league
+
+ADMIN_CREDENTIALS = {'username': 'admin', 'password': 'admin123'}
+
+
+class Sample:
+    """Ids drawn from the benchmark database to build request paths"""
+
+    def __init__(self, database_path, seed):
+        conn = sqlite3.connect(database_path)
+        try:
+            def column(query):
+                return [row[0] for row in conn.execute(query)]
+
+            self.team_ids = column('SELECT id FROM teams')
+            self.player_ids = column('SELECT id FROM players')
+            self.player_names = column('SELECT DISTINCT name FROM players')
+            self.match_ids = column('SELECT id FROM matches')
+            self.groups = column('SELECT DISTINCT group_name FROM standings')
+            self.rounds = column('SELECT DISTINCT round FROM matches')
+            self.results = [tuple(row) for row in conn.execute(
+                'SELECT id, team_a_id, team_b_id FROM matches '
+                'WHERE team_a_id IS NOT NULL AND team_b_id IS NOT NULL'
+            )]
+        finally:
+            conn.close()
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def pick(self, values):
+        with self._lock:
+            return self.rng.choice(values)
+
+
+def _result_request(sample):
+    match_id, team_a_id, team_b_id = sample.pick(sample.results)
+    return 'PUT', f'/api/matches/{match_id}/result', {
+        'winner_id': sample.pick((team_a_id, team_b_id)),
+        'team_a_score': '150/6 (20)',
+        'team_b_score': '140/9 (20)',
+        'result_summary': 'Benchmark result'
+    }
+
+
+# name -> (needs admin session, request builder returning (method, path, json body))
+SCENARIOS = {
+    'auth.login': (False, lambda s: ('POST', '/api/auth/login', ADMIN_CREDENTIALS)),
+    'auth.check': (True, lambda s: ('GET', '/api/auth/check', None)),
+    'teams.list': (False, lambda s: ('GET', '/api/teams', None)),
+    'teams.list_page': (False, lambda s: ('GET', '/api/teams?limit=50', None)),
+    'teams.get': (False, lambda s: ('GET', f'/api/teams/{s.pick(s.team_ids)}', None)),
+    'players.list': (False, lambda s: ('GET', '/api/players', None)),
+    'players.list_page': (False, lambda s: ('GET', '/api/players?limit=100', None)),
+    'players.by_team': (False, lambda s: ('GET', f'/api/players/team/{s.pick(s.team_ids)}', None)),
+    'players.get': (False, lambda s: ('GET', f'/api/players/{s.pick(s.player_ids)}', None)),
+    'matches.list': (False, lambda s: ('GET', '/api/matches', None)),
+    'matches.list_page': (False, lambda s: ('GET', '/api/matches?limit=100', None)),
+    'matches.by_team': (False, lambda s: ('GET', f'/api/matches?team_id={s.pick(s.team_ids)}', None)),
+    'matches.get': (False, lambda s: ('GET', f'/api/matches/{s.pick(s.match_ids)}', None)),
+    'matches.round': (False, lambda s: ('GET', f'/api/matches/round/{quote(s.pick(s.rounds))}', None)),
+    'matches.result': (True, _result_request),
+    'search.prefix': (False, lambda s: ('GET', f'/api/search?q={quote(s.pick(s.player_names)[:3])}', None)),
+    'search.name': (False, lambda s: ('GET', f'/api/search?q={quote(s.pick(s.player_names))}', None)),
+    'leaderboards.runs': (False, lambda s: ('GET', '/api/leaderboards/runs', None)),
+    'leaderboards.economy': (False, lambda s: ('GET', '/api/leaderboards/economy?limit=50', None)),
+    'tournament.settings': (False, lambda s: ('GET', '/api/tournament/settings', None)),
+    'tournament.bracket': (False, lambda s: ('GET', '/api/tournament/bracket', None)),
+    'tournament.standings': (False, lambda s: ('GET', '/api/tournament/standings', None)),
+    'tournament.standings_group': (
+        False, lambda s: ('GET', f'/api/tournament/standings?group={quote(s.pick(s.groups))}', None)
+    ),
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(latencies, queries, errors, elapsed):
+    """Aggregate one endpoint's measurements"""
+    latencies = sorted(latencies)
+    count = len(latencies)
+    return {
+        'requests': count,
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3) if count else None,
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3) if count else None,
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3) if count else None,
+        'mean_ms': round(sum(latencies) / count * 1000, 3) if count else None,
+        'throughput_rps': round(count / elapsed, 1) if elapsed else None,
+        'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None
+    }
+
+
+def run_client(sample, scenarios, requests, warmup):
+    """Measure each scenario sequentially through the Flask test client"""
+    from benchmarks.app import create_app
+
+    app = create_app()
+    anonymous = app.test_client()
+    admin = app.test_client()
+    admin.post('/api/auth/login', json=ADMIN_CREDENTIALS)
+
+    results = {}
+    for name in scenarios:
+        needs_admin, build = SCENARIOS[name]
+        client = admin if needs_admin else anonymous
+
+        latencies, queries, errors = [], [], 0
+        started = time.perf_counter()
+        for i in range(warmup + requests):
+            method, path, body = build(sample)
+            t0 = time.perf_counter()
+            response = client.open(path, method=method, json=body)
+            response.get_data()
+            elapsed = time.perf_counter() - t0
+            if i < warmup:
+                started = time.perf_counter()
+                continue
+            latencies.append(elapsed)
+            queries.append(int(response.headers.get('X-Query-Count', 0)))
+            if response.status_code >= 400:
+                errors += 1
+        results[name] = summarize(latencies, queries, errors, time.perf_counter() - started)
+        print(f"  client {name:28s} p50 {results[name]['p50_ms']!s:>9} ms  "
+              f"q/req {results[name]['queries_per_request']}")
+    return results
+
+
+def _login_cookie(port):
+    """Log in over HTTP and return the session cookie"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    conn.request('POST', '/api/auth/login', body=json.dumps(ADMIN_CREDENTIALS),
+                 headers={'Content-Type': 'application/json'})
+    response = conn.getresponse()
+    response.read()
+    cookie = response.getheader('Set-Cookie', '')
+    conn.close()
+    return cookie.split(';', 1)[0]
+
+
+def _http_worker(port, sample, build, count, cookie):
+    """Issue count requests over one keep-alive connection"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    latencies, queries, errors = [], [], 0
+    for _ in range(count):
+        method, path, body = build(sample)
+        headers = {'Cookie': cookie} if cookie else {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        t0 = time.perf_counter()
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            continue
+        latencies.append(time.perf_counter() - t0)
+        queries.append(int(response.getheader('X-Query-Count', 0)))
+        if response.status >= 400:
+            errors += 1
+    conn.close()
+    return latencies, queries, errors
+
+
+def start_gunicorn(database_path, port, workers, threads, env_overrides):
+    """Start gunicorn on the benchmark app and wait until it answers"""
+    env = dict(os.environ, DATABASE_PATH=database_path, PYTHONPATH=ROOT, **env_overrides)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}',
+         '--workers', str(workers), '--worker-class', 'gthread', '--threads', str(threads),
+         '--log-level', 'warning', 'benchmarks.app:create_app()'],
+        cwd=ROOT, env=env
+    )
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('gunicorn exited during startup')
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                conn.close()
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError('gunicorn did not start within 60 seconds')
+
+
+def run_http(sample, scenarios, requests, warmup, concurrency, port, workers, threads,
+             database_path, env_overrides):
+    """Measure each scenario under concurrent load against gunicorn"""
+    process = start_gunicorn(database_path, port, workers, threads, env_overrides)
+    try:
+        cookie = _login_cookie(port)
+        results = {}
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for name in scenarios:
+                needs_admin, build = SCENARIOS[name]
+                session = cookie if needs_admin else None
+
+                if warmup:
+                    _http_worker(port, sample, build, warmup, session)
+
+                shares = [requests // concurrency + (i < requests % concurrency)
+                          for i in range(concurrency)]
+                started = time.perf_counter()
+                futures = [pool.submit(_http_worker, port, sample, build, share, session)
+                           for share in shares if share]
+                latencies, queries, errors = [], [], 0
+                for future in futures:
+                    lat, qs, err = future.result()
+                    latencies.extend(lat)
+                    queries.extend(qs)
+                    errors += err
+                results[name] = summarize(latencies, queries, errors,
+                                          time.perf_counter() - started)
+                print(f"  http   {name:28s} p50 {results[name]['p50_ms']!s:>9} ms  "
+                      f"{results[name]['throughput_rps']!s:>8} req/s  errors {errors}")
+        return results
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def git_revision():
+    """Current commit, marked -dirty if the tree has local changes"""
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               cwd=ROOT, capture_output=True, text=True).stdout.strip()
+        return revision + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    """Run the benchmarks"""
+    parser = argparse.ArgumentParser(description='Benchmark the tournament API')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='small')
+    parser.add_argument('--teams', type=int, help='override the profile team count')
+    parser.add_argument('--seasons', type=int, help='override the profile season count')
+    parser.add_argument('--database', help='benchmark database path (default: a temporary file)')
+    parser.add_argument('--reuse', action='store_true',
+                        help='use the existing --database instead of generating a league')
+    parser.add_argument('--mode', choices=['client', 'http', 'both'], default='client')
+    parser.add_argument('--requests', type=int, default=200, help='measured requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=10, help='unmeasured requests per endpoint')
+    parser.add_argument('--concurrency', type=int, default=8, help='HTTP client threads')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=1, help='gunicorn workers')
+    parser.add_argument('--threads', type=int, default=32, help='gunicorn threads per worker')
+    parser.add_argument('--no-cache', action='store_true', help='disable the response cache')
+    parser.add_argument('--snapshot', action='store_true', help='serve reads from the in-memory snapshot')
+    parser.add_argument('--only', help='comma-separated scenario names or blueprint prefixes')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', help='result file (default: benchmarks/results/<time>-<commit>.json)')
+    args = parser.parse_args()
+
+    scenarios = list(SCENARIOS)
+    if args.only:
+        wanted = [item.strip() for item in args.only.split(',') if item.strip()]
+        scenarios = [name for name in scenarios
+                     if any(name == item or name.startswith(item + '.') for item in wanted)]
+
+    database_path = os.path.abspath(
+        args.database or os.path.join(tempfile.mkdtemp(prefix='npl-bench-'), 'bench.db')
+    )
+    Config.DATABASE_PATH = database_path
+    env_overrides = {}
+    if args.no_cache:
+        Config.RESPONSE_CACHE_ENABLED = False
+        env_overrides['RESPONSE_CACHE_ENABLED'] = '0'
+    if args.snapshot:
+        Config.SNAPSHOT_ENABLED = True
+        env_overrides['SNAPSHOT_ENABLED'] = '1'
+
+    league = None
+    if not args.reuse:
+        overrides = {key: value for key, value in
+                     (('teams', args.teams), ('seasons', args.seasons)) if value}
+        print(f"Generating {args.profile} league in {database_path}...")
+        started = time.perf_counter()
+        league = generate_league(args.profile, seed=args.seed, **overrides)
+        league['seconds'] = round(time.perf_counter() - started, 2)
+        print(f"Generated {league['rows']} in {league['seconds']}s")
+
+    sample = Sample(database_path, args.seed)
+    results = {}
+    if args.mode in ('client', 'both'):
+        print("\nFlask test client:")
+        results['client'] = run_client(sample, scenarios, args.requests, args.warmup)
+    if args.mode in ('http', 'both'):
+        print(f"\ngunicorn ({args.workers} worker(s) x {args.threads} threads, "
+              f"{args.concurrency} client threads):")
+        results['http'] = run_http(sample, scenarios, args.requests, args.warmup,
+                                   args.concurrency, args.port, args.workers, args.threads,
+                                   database_path, env_overrides)
+
+    revision = git_revision()
+    report = {
+        'meta': {
+            'commit': revision,
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'profile': args.profile,
+            'league': league,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'gunicorn': {'workers': args.workers, 'threads': args.threads},
+            'response_cache': not args.no_cache,
+            'snapshot': args.snapshot,
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version
+        },
+        'results': results
+    }
+
+    output = args.output or os.path.join(
+        ROOT, 'benchmarks', 'results',
+        f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{revision or 'unknown'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Serialization micro-benchmark.
+
+Measures the two costs of a large list response outside the HTTP stack,
+on the full /api/players and /api/matches lists of a synthetic league
+(10k+ rows of each by default):
+
+  rows    building dicts from the result set: sqlite3.Row with
+          dict(zip(row.keys(), row)) per row (before) against plain tuples
+          zipped with the column names read once per cursor (after)
+  encode  the JSON body: Flask's default provider (before) against
+          backend.json_provider with the stdlib encoder and with orjson
+  total   rows + encode, before against after
+
+Each step runs --repeat times; the best and median times are reported.
+
+    python -m benchmarks.serialization --teams 700 --seasons 6
+"""
+import sys
+import os
+import argparse
+import sqlite3
+import statistics
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from flask.json.provider import DefaultJSONProvider
+from backend.config import Config
+from backend.database import get_db_connection, _tuple_cursor
+from backend import json_provider
+from backend.json_provider import FastJSONProvider
+from backend.api.listing import parse_fields, select_query
+from backend.api.players import PLAYER_LIST_COLUMNS, PLAYER_LIST_FROM, PLAYER_LIST_ORDER, PLAYER_LIST_JOINS
+from backend.api.matches import MATCH_LIST_COLUMNS, MATCH_LIST_FROM, MATCH_LIST_ORDER, MATCH_LIST_JOINS
+from benchmarks.league import PROFILES, generate_league
+
+# path -> (columns, FROM clause, ORDER BY, optional joins) of its list query
+ENDPOINTS = {
+    '/api/players': (PLAYER_LIST_COLUMNS, PLAYER_LIST_FROM, PLAYER_LIST_ORDER, PLAYER_LIST_JOINS),
+    '/api/matches': (MATCH_LIST_COLUMNS, MATCH_LIST_FROM, MATCH_LIST_ORDER, MATCH_LIST_JOINS),
+}
+
+
+def timed(function, repeat):
+    """(best ms, median ms, last result) of repeat calls"""
+    times = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        times.append((time.perf_counter() - started) * 1000)
+    return min(times), statistics.median(times), result
+
+
+def rows_before(conn, query):
+    """Row dicts the way execute_query built them before"""
+    conn.row_factory = sqlite3.Row
+    return [dict(zip(row.keys(), row)) for row in conn.execute(query).fetchall()]
+
+
+def rows_after(conn, query):
+    """Row dicts from tuples and the column names of the cursor"""
+    cursor, columns = _tuple_cursor(conn, query, ())
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def list_query(app, path):
+    """The SQL behind path's full, unpaginated list"""
+    columns, base_from, order_by, joins = ENDPOINTS[path]
+    with app.test_request_context(path):
+        return select_query(columns, parse_fields(columns), base_from, order_by, joins)
+
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark row building and JSON encoding')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='medium')
+    parser.add_argument('--teams', type=int, default=700, help='league teams (16 players each)')
+    parser.add_argument('--seasons', type=int, default=6, help='seasons of group matches')
+    parser.add_argument('--database', help='benchmark database path (default: a temporary file)')
+    parser.add_argument('--reuse', action='store_true',
+                        help='use the existing --database instead of generating a league')
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    Config.DATABASE_PATH = os.path.abspath(
+        args.database or os.path.join(tempfile.mkdtemp(prefix='npl-bench-'), 'bench.db')
+    )
+    if not args.reuse:
+        print(f"Generating {args.profile} league in {Config.DATABASE_PATH}...")
+        league = generate_league(args.profile, seed=args.seed, teams=args.teams, seasons=args.seasons)
+        print(f"Generated {league['rows']}")
+
+    # Measure plain connections, without the metrics statement hook
+    Config.METRICS_ENABLED = False
+    from backend.app import create_app
+    app = create_app()
+    default_provider = DefaultJSONProvider(app)
+    stdlib_provider = FastJSONProvider(app)
+    stdlib_provider.use_orjson = False
+    fast_provider = FastJSONProvider(app)
+
+    encoders = [('flask default', default_provider), ('stdlib', stdlib_provider)]
+    if fast_provider.use_orjson:
+        encoders.append(('orjson', fast_provider))
+    else:
+        print("orjson is not installed; only the stdlib encoder is measured")
+
+    conn = get_db_connection()
+    print(f"\n{'endpoint':<14} {'step':<22} {'best ms':>9} {'median ms':>10}  notes")
+    for path in ENDPOINTS:
+        query = list_query(app, path)
+
+        def report(step, best, median, notes=''):
+            print(f"{path:<14} {step:<22} {best:>9.1f} {median:>10.1f}  {notes}")
+
+        before_best, before_median, rows = timed(lambda: rows_before(conn, query), args.repeat)
+        report('rows: sqlite3.Row', before_best, before_median, f'{len(rows)} rows')
+        after_best, after_median, rows = timed(lambda: rows_after(conn, query), args.repeat)
+        report('rows: column tuple', after_best, after_median,
+               f'{before_median / after_median:.2f}x')
+
+        with app.app_context():
+            baseline = None
+            for name, provider in encoders:
+                best, median, response = timed(lambda: provider.response(rows).get_data(), args.repeat)
+                baseline = baseline or median
+                report(f'encode: {name}', best, median,
+                       f'{len(response) / 1024:.0f} KiB, {baseline / median:.2f}x')
+
+            before_best, before_median, _ = timed(
+                lambda: default_provider.response(rows_before(conn, query)).get_data(), args.repeat)
+            report('total: before', before_best, before_median)
+            after_best, after_median, _ = timed(
+                lambda: fast_provider.response(rows_after(conn, query)).get_data(), args.repeat)
+            report('total: after', after_best, after_median, f'{before_median / after_median:.2f}x')
+    conn.close()
+
+    encoder = 'orjson' if fast_provider.use_orjson else 'stdlib'
+    print(f"\nResponses use the {encoder} encoder "
+          f"(JSON_ENCODER={Config.JSON_ENCODER}, orjson {'available' if json_provider.orjson else 'missing'})")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,9 @@ echo "Creating necessary directories..."
 mkdir -p database
 mkdir -p uploads
 
+echo "Building static assets..."
+python backend/assets.py
+
 echo "Initializing database..."
 python backend/seed_data.py
 
@@ -34,19 +34,15 @@ function closeModal(modalId) {
 // Load Statistics
 async function loadStats() {
     try {
-        const [teamsRes, playersRes, matchesRes] = await Promise.all([
-            fetch('/api/teams'),
-            fetch('/api/players'),
-            fetch('/api/matches')
-        ]);
-
-        teams = await teamsRes.json();
-        players = await playersRes.json();
-        matches = await matchesRes.json();
-
-        document.getElementById('statTeams').textContent = teams.length;
-        document.getElementById('statPlayers').textContent = players.length;
-        document.getElementById('statMatches').textContent = matches.length;
+        // The viewer's local date decides which fixtures are "today"
+        const now = new Date();
+        const today = new Date(now.getTime() - now.getTimezoneOffset() * 60000).toISOString().slice(0, 10);
+        const response = await fetch(`/api/dashboard?date=${today}`);
+        const dashboard = await response.json();
+
+        document.getElementById('statTeams').textContent = dashboard.totals.teams;
+        document.getElementById('statPlayers').textContent = dashboard.totals.players;
+        document.getElementById('statMatches').textContent = dashboard.totals.matches;
     } catch (error) {
         console.error('Failed to load stats:', error);
     }
@@ -316,7 +312,7 @@ async function loadMatches() {
         tbody.innerHTML = matches.map(match => `
             <tr>
                 <td>${formatDate(match.match_date)}</td>
-                <td><strong>${match.team_a_name} vs ${match.team_b_name}</strong></td>
+                <td><strong>${match.team_a_name || 'TBD'} vs ${match.team_b_name || 'TBD'}</strong></td>
                 <td>${match.venue || 'TBD'}</td>
                 <td>${match.round}</td>
                 <td>${match.status}</td>
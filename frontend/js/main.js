@@ -80,6 +80,31 @@ function showError(message) {
     alert(`Error: ${message}`);
 }
 
+// Fetch several GET endpoints in one round trip; resolves to their bodies in order.
+// Items that failed come back as {error} objects.
+async function fetchBatch(paths) {
+    const response = await fetch(`${API_BASE}/api/batch`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        credentials: 'include',
+        body: JSON.stringify({ requests: paths })
+    });
+    const data = await response.json();
+    if (!response.ok) throw new Error(data.error || 'Batch request failed');
+    return data.responses.map(item => item.status === 200 ? item.body : (item.body || { error: `HTTP ${item.status}` }));
+}
+
+// Subscribe to the live match feed; onChange(type, data) runs for every event
+function subscribeMatchUpdates(onChange) {
+    if (!window.EventSource) return null;
+
+    const source = new EventSource(`${API_BASE}/api/matches/stream`);
+    ['match.created', 'match.updated', 'match.result', 'match.score', 'match.deleted', 'reset'].forEach(type => {
+        source.addEventListener(type, event => onChange(type, JSON.parse(event.data)));
+    });
+    return source;
+}
+
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', () => {
     updateNavigation();
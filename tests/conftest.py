@@ -0,0 +1,118 @@
+"""
+Shared fixtures: every test gets an app on a fresh database in a
+temporary directory, migrated by init_db() like a new deployment.
+"""
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.config import Config
+from backend.cache import response_cache
+from backend.models import user_cache
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'DATABASE_PATH', str(tmp_path / 'cricket.db'))
+    monkeypatch.setattr(Config, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+    monkeypatch.setattr(Config, 'TEAM_UPLOAD_FOLDER', str(tmp_path / 'uploads' / 'teams'))
+    monkeypatch.setattr(Config, 'PLAYER_UPLOAD_FOLDER', str(tmp_path / 'uploads' / 'players'))
+    # Caches are per process and keyed without the database path
+    response_cache.clear()
+    user_cache.clear()
+
+    from backend.app import create_app
+    app = create_app()
+    app.config['TESTING'] = True
+    yield app
+    response_cache.clear()
+    user_cache.clear()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin(client):
+    """A test client logged in as the default admin"""
+    response = client.post('/api/auth/login', json={'username': 'admin', 'password': 'admin123'})
+    assert response.status_code == 200, response.data
+    return client
+
+
+@pytest.fixture
+def db(app):
+    """A connection of its own to the test database"""
+    from backend.database import get_db_connection
+    conn = get_db_connection()
+    yield conn
+    conn.close()
+
+
+def create_team(client, name):
+    response = client.post('/api/teams', json={'name': name})
+    assert response.status_code == 201, response.data
+    return response.get_json()['team_id']
+
+
+def create_player(client, name, team_id, role='Batsman'):
+    response = client.post('/api/players', json={'name': name, 'team_id': team_id, 'role': role})
+    assert response.status_code == 201, response.data
+    return response.get_json()['player_id']
+
+
+def create_match(client, team_a_id, team_b_id, round_name='Group 1', match_date='2025-11-17'):
+    response = client.post('/api/matches', json={
+        'match_date': match_date, 'match_day': 'Monday', 'match_time': '18:00',
+        'team_a_id': team_a_id, 'team_b_id': team_b_id, 'round': round_name
+    })
+    assert response.status_code == 201, response.data
+    return response.get_json()['match_id']
+
+
+STANDINGS_COLUMNS = ('played', 'won', 'lost', 'no_result', 'points',
+                     'runs_for', 'balls_for', 'runs_against', 'balls_against')
+
+
+def stored_standings(db):
+    """The standings table as {(group, team_id): (played, ..., balls_against)}"""
+    rows = db.execute(f'SELECT group_name, team_id, {", ".join(STANDINGS_COLUMNS)} FROM standings')
+    return {(row[0], row[1]): tuple(row[2:]) for row in rows}
+
+
+def expected_standings(db):
+    """Standings recomputed from the matches table, in the shape of stored_standings()"""
+    table = {}
+    rows = db.execute('''
+        SELECT round, team_a_id, team_b_id, status, winner_id, overs_limit,
+               team_a_runs, team_a_wickets, team_a_balls, team_b_runs, team_b_wickets, team_b_balls
+        FROM matches WHERE round LIKE 'Group%'
+    ''')
+    for (group, team_a, team_b, status, winner, overs_limit,
+         a_runs, a_wickets, a_balls, b_runs, b_wickets, b_balls) in rows:
+        innings = {}
+        if (a_runs is not None and b_runs is not None
+                and (a_balls or 0) > 0 and (b_balls or 0) > 0):
+            faced = {
+                side: overs_limit * 6 if wickets >= 10 and overs_limit is not None else balls
+                for side, wickets, balls in (('a', a_wickets, a_balls), ('b', b_wickets, b_balls))
+            }
+            innings = {team_a: (a_runs, faced['a'], b_runs, faced['b']),
+                       team_b: (b_runs, faced['b'], a_runs, faced['a'])}
+        for team in (team_a, team_b):
+            row = table.setdefault((group, team), [0] * len(STANDINGS_COLUMNS))
+            if status != 'completed':
+                continue
+            won, no_result = winner == team, winner is None
+            row[0] += 1
+            row[1] += won
+            row[2] += not won and not no_result
+            row[3] += no_result
+            row[4] += 2 if won else 1 if no_result else 0
+            for index, value in enumerate(innings.get(team, (0, 0, 0, 0)), start=5):
+                row[index] += value
+    return {key: tuple(row) for key, row in table.items()}
@@ -0,0 +1,28 @@
+from conftest import create_player, create_team
+
+
+def test_write_by_another_connection_invalidates_cached_response(admin, db):
+    team_id = create_team(admin, 'Lahore')
+    assert admin.get('/api/teams').get_json()[0]['name'] == 'Lahore'
+
+    # Another worker process writes through its own connection
+    db.execute('UPDATE teams SET name = ? WHERE id = ?', ('Karachi', team_id))
+    db.commit()
+
+    assert admin.get('/api/teams').get_json()[0]['name'] == 'Karachi'
+
+
+def test_trigger_maintained_columns_invalidate_cached_response(admin, db):
+    team_id = create_team(admin, 'Lahore')
+    assert admin.get(f'/api/teams/{team_id}').get_json()['player_count'] == 0
+
+    generation = db.execute(
+        "SELECT generation FROM cache_generations WHERE table_name = 'teams'"
+    ).fetchone()[0]
+    create_player(admin, 'Babar', team_id)
+
+    # player_count is kept by a trigger on players, which bumps 'teams' too
+    assert db.execute(
+        "SELECT generation FROM cache_generations WHERE table_name = 'teams'"
+    ).fetchone()[0] > generation
+    assert admin.get(f'/api/teams/{team_id}').get_json()['player_count'] == 1
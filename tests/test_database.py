@@ -0,0 +1,66 @@
+import sqlite3
+
+import pytest
+
+from backend.database import (
+    execute_insert, execute_query, execute_single, read_transaction, transaction
+)
+
+
+def team_names():
+    return [row['name'] for row in execute_query('SELECT name FROM teams ORDER BY name')]
+
+
+@pytest.fixture
+def ctx(app):
+    with app.app_context():
+        yield
+
+
+def test_nested_transaction_commits_with_the_outer_block(ctx, db):
+    with pytest.raises(RuntimeError):
+        with transaction() as cursor:
+            cursor.execute("INSERT INTO teams (name) VALUES ('Lahore')")
+            with transaction() as inner:
+                inner.execute("INSERT INTO teams (name) VALUES ('Karachi')")
+            # Nothing is visible to other connections until the outer block ends
+            assert db.execute('SELECT COUNT(*) FROM teams').fetchone()[0] == 0
+            raise RuntimeError('abort')
+
+    assert team_names() == []
+
+
+def test_failed_nested_transaction_rolls_back_only_its_savepoint(ctx):
+    with transaction() as cursor:
+        cursor.execute("INSERT INTO teams (name) VALUES ('Lahore')")
+        with pytest.raises(sqlite3.IntegrityError):
+            with transaction() as inner:
+                inner.execute("INSERT INTO teams (name) VALUES ('Karachi')")
+                inner.execute("INSERT INTO teams (name) VALUES ('Lahore')")
+
+    assert team_names() == ['Lahore']
+
+
+def test_write_helpers_join_an_open_transaction(ctx):
+    with pytest.raises(RuntimeError):
+        with transaction():
+            execute_insert("INSERT INTO teams (name) VALUES ('Lahore')")
+            raise RuntimeError('abort')
+
+    assert team_names() == []
+
+
+def test_read_transaction_rejects_writes_and_joins_open_transactions(ctx):
+    with read_transaction():
+        with pytest.raises(sqlite3.OperationalError):
+            with transaction() as cursor:
+                cursor.execute("INSERT INTO teams (name) VALUES ('Lahore')")
+
+    with transaction() as cursor:
+        cursor.execute("INSERT INTO teams (name) VALUES ('Karachi')")
+        with read_transaction():
+            assert execute_single('SELECT COUNT(*) AS n FROM teams')['n'] == 1
+
+    assert team_names() == ['Karachi']
+    execute_insert("INSERT INTO teams (name) VALUES ('Lahore')")
+    assert team_names() == ['Karachi', 'Lahore']
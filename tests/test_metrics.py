@@ -0,0 +1,27 @@
+"""Access to GET /metrics"""
+from backend.config import Config
+
+
+def test_hidden_without_token(client, monkeypatch):
+    monkeypatch.setattr(Config, 'METRICS_TOKEN', '')
+    monkeypatch.setattr(Config, 'METRICS_ALLOW_LOCAL', False)
+    # The test client connects from 127.0.0.1, like a same-host proxy
+    assert client.get('/metrics').status_code == 404
+
+
+def test_local_opt_in(client, monkeypatch):
+    monkeypatch.setattr(Config, 'METRICS_TOKEN', '')
+    monkeypatch.setattr(Config, 'METRICS_ALLOW_LOCAL', True)
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'text/plain; version=0.0.4; charset=utf-8'
+    assert client.get('/metrics', environ_base={'REMOTE_ADDR': '10.0.0.5'}).status_code == 404
+
+
+def test_bearer_token(client, monkeypatch):
+    monkeypatch.setattr(Config, 'METRICS_TOKEN', 's3cret')
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    response = client.get('/metrics', headers={'Authorization': 'Bearer s3cret'},
+                          environ_base={'REMOTE_ADDR': '10.0.0.5'})
+    assert response.status_code == 200
@@ -0,0 +1,99 @@
+"""Schema migrations on a fresh, a seeded and a pre-migration database"""
+import sys
+
+import pytest
+
+from backend import migrations, seed_data
+from backend.config import Config
+from backend.database import get_db_connection, init_db
+from backend.migrations import GENERATION_TABLES, MIGRATIONS, get_schema_version, run_migrations
+from conftest import expected_standings, stored_standings
+
+LATEST = MIGRATIONS[-1][0]
+
+
+def schema(db):
+    return db.execute('SELECT type, name, sql FROM sqlite_master ORDER BY type, name').fetchall()
+
+
+def assert_up_to_date(db):
+    before = schema(db)
+    assert get_schema_version(db) == LATEST
+    assert run_migrations(db) == LATEST
+    assert schema(db) == before
+    assert db.execute('PRAGMA foreign_key_check').fetchall() == []
+    assert stored_standings(db) == expected_standings(db)
+    assert db.execute('''
+        SELECT COUNT(*) FROM teams
+        WHERE player_count != (SELECT COUNT(*) FROM players WHERE team_id = teams.id)
+    ''').fetchone()[0] == 0
+    assert sorted(row[0] for row in db.execute('SELECT table_name FROM cache_generations')) \
+        == sorted(GENERATION_TABLES)
+
+
+def test_versions_are_ordered():
+    versions = [version for version, _, _ in MIGRATIONS]
+    assert versions == list(range(1, len(MIGRATIONS) + 1))
+
+
+def test_fresh_database_is_up_to_date(db):
+    assert_up_to_date(db)
+
+
+def test_seeded_database_is_up_to_date(app, monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['seed_data.py'])
+    seed_data.main()
+
+    conn = get_db_connection()
+    try:
+        assert conn.execute('SELECT COUNT(*) FROM teams').fetchone()[0] == 24
+        assert conn.execute("SELECT COUNT(*) FROM matches WHERE status = 'completed'").fetchone()[0] > 0
+        assert_up_to_date(conn)
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def legacy_db(tmp_path, monkeypatch):
+    """A database created before any migration existed, holding results"""
+    monkeypatch.setattr(Config, 'DATABASE_PATH', str(tmp_path / 'legacy.db'))
+    with monkeypatch.context() as patch:
+        patch.setattr(migrations, 'MIGRATIONS', [])
+        init_db()
+
+    conn = get_db_connection()
+    conn.executemany('INSERT INTO teams (id, name) VALUES (?, ?)', [(1, 'A'), (2, 'B'), (3, 'C')])
+    conn.executemany('INSERT INTO players (name, team_id, role) VALUES (?, ?, ?)',
+                     [('A1', 1, 'Batsman'), ('A2', 1, 'Bowler'), ('B1', 2, 'Batsman')])
+    conn.executemany('''
+        INSERT INTO matches (match_date, match_day, team_a_id, team_b_id, round, status,
+                             winner_id, team_a_score, team_b_score)
+        VALUES ('2025-11-17', 'Monday', ?, ?, ?, ?, ?, ?, ?)
+    ''', [
+        (1, 2, 'Group 1', 'completed', 1, '150/6 (20)', '120 all out (18.2)'),
+        (2, 3, 'Group 1', 'completed', None, None, None),
+        (1, 3, 'Group 1', 'scheduled', None, None, None),
+        (1, 2, 'Final', 'completed', 2, '100/1 (10)', '101/2 (9)'),
+    ])
+    conn.commit()
+    assert get_schema_version(conn) == 0
+    yield conn
+    conn.close()
+
+
+def test_migrations_backfill_existing_data(legacy_db):
+    assert run_migrations(legacy_db) == LATEST
+    assert_up_to_date(legacy_db)
+
+    standings = stored_standings(legacy_db)
+    assert standings == {
+        ('Group 1', 1): (1, 1, 0, 0, 2, 150, 120, 120, 110),
+        ('Group 1', 2): (2, 0, 1, 1, 1, 120, 110, 150, 120),
+        ('Group 1', 3): (1, 0, 0, 1, 1, 0, 0, 0, 0),
+    }
+    net_run_rate = legacy_db.execute(
+        "SELECT net_run_rate FROM standings WHERE group_name = 'Group 1' AND team_id = 1"
+    ).fetchone()[0]
+    assert net_run_rate == pytest.approx(150 / 20 - 120 / (110 / 6))
+    assert [row[0] for row in legacy_db.execute('SELECT player_count FROM teams ORDER BY id')] \
+        == [2, 1, 0]
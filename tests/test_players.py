@@ -0,0 +1,41 @@
+"""PUT /api/players/<id>/stats"""
+from conftest import create_player, create_team
+
+
+def stats(db, player_id):
+    return db.execute('''
+        SELECT runs_scored, balls_faced, fours, times_out, batting_average
+        FROM player_statistics WHERE player_id = ?
+    ''', (player_id,)).fetchone()
+
+
+def test_partial_payload_keeps_other_counters(admin, db):
+    player_id = create_player(admin, 'P', create_team(admin, 'A'))
+    response = admin.put(f'/api/players/{player_id}/stats',
+                         json={'runs_scored': 120, 'balls_faced': 90, 'fours': 10, 'times_out': 3})
+    assert response.status_code == 200, response.data
+
+    # The admin form never sends times_out
+    response = admin.put(f'/api/players/{player_id}/stats', json={'runs_scored': 150})
+    assert response.status_code == 200, response.data
+    assert tuple(stats(db, player_id)) == (150, 90, 10, 3, 50.0)
+
+    leaders = admin.get('/api/leaderboards/batting_average').get_json()['leaders']
+    assert [(row['player_id'], row['value'], row['times_out']) for row in leaders] == [(player_id, 50.0, 3)]
+
+
+def test_null_counter_is_stored_as_zero(admin, db):
+    player_id = create_player(admin, 'P', create_team(admin, 'A'))
+    admin.put(f'/api/players/{player_id}/stats', json={'runs_scored': 40, 'times_out': 2})
+
+    response = admin.put(f'/api/players/{player_id}/stats', json={'times_out': None})
+    assert response.status_code == 200, response.data
+    assert tuple(stats(db, player_id)) == (40, 0, 0, 0, None)
+
+
+def test_invalid_payloads(admin):
+    player_id = create_player(admin, 'P', create_team(admin, 'A'))
+    assert admin.put(f'/api/players/{player_id}/stats', json={'unknown': 1}).status_code == 400
+    assert admin.put(f'/api/players/{player_id}/stats', json={'fours': 'many'}).status_code == 400
+    assert admin.put(f'/api/players/{player_id}/stats', json={'fours': -1}).status_code == 400
+    assert admin.put('/api/players/9999/stats', json={'fours': 1}).status_code == 404
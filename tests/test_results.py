@@ -0,0 +1,68 @@
+"""PUT /api/matches/<id>/result and the scores it stores"""
+from conftest import create_match, create_player, create_team
+
+
+def match_row(db, match_id):
+    return db.execute('''
+        SELECT team_a_score, team_a_runs, team_a_wickets, team_a_balls,
+               team_b_score, team_b_runs, team_b_wickets, team_b_balls, winner_id, status
+        FROM matches WHERE id = ?
+    ''', (match_id,)).fetchone()
+
+
+def test_structured_and_text_scores(admin, db):
+    team_a, team_b = create_team(admin, 'A'), create_team(admin, 'B')
+    match_id = create_match(admin, team_a, team_b)
+
+    response = admin.put(f'/api/matches/{match_id}/result', json={
+        'winner_id': team_a,
+        'team_a_runs': 160, 'team_a_wickets': 5, 'team_a_overs': '20',
+        'team_b_score': '120 all out (18.2)'
+    })
+    assert response.status_code == 200, response.data
+
+    row = match_row(db, match_id)
+    assert tuple(row)[:8] == ('160/5 (20)', 160, 5, 120, '120/10 (18.2)', 120, 10, 110)
+
+
+def test_invalid_overs_rejected(admin):
+    team_a, team_b = create_team(admin, 'A'), create_team(admin, 'B')
+    match_id = create_match(admin, team_a, team_b)
+    response = admin.put(f'/api/matches/{match_id}/result',
+                         json={'team_a_runs': 10, 'team_a_overs': '19.7'})
+    assert response.status_code == 400
+
+
+def test_result_without_scores_keeps_ball_by_ball_score(admin, db):
+    team_a, team_b = create_team(admin, 'A'), create_team(admin, 'B')
+    batters = [create_player(admin, f'A{i}', team_a) for i in range(2)]
+    bowler = create_player(admin, 'B0', team_b, role='Bowler')
+    match_id = create_match(admin, team_a, team_b)
+
+    balls = [dict(innings=1, over=0, ball=number, striker_id=batters[0], non_striker_id=batters[1],
+                  bowler_id=bowler, runs=4) for number in range(1, 8)]
+    response = admin.post(f'/api/matches/{match_id}/deliveries', json={'deliveries': balls})
+    assert response.status_code == 201, response.data
+    before = match_row(db, match_id)
+    assert tuple(before)[:4] == ('28/0 (1.1)', 28, 0, 7)
+
+    response = admin.put(f'/api/matches/{match_id}/result', json={'winner_id': team_a})
+    assert response.status_code == 200, response.data
+
+    after = match_row(db, match_id)
+    assert tuple(after)[:8] == tuple(before)[:8]
+    assert (after['winner_id'], after['status']) == (team_a, 'completed')
+
+
+def test_result_for_one_side_keeps_the_other(admin, db):
+    team_a, team_b = create_team(admin, 'A'), create_team(admin, 'B')
+    match_id = create_match(admin, team_a, team_b)
+    admin.put(f'/api/matches/{match_id}/result',
+              json={'team_a_score': '150/6 (20)', 'team_b_score': '140/9 (20)'})
+
+    response = admin.put(f'/api/matches/{match_id}/result',
+                         json={'winner_id': team_a, 'team_b_score': '141/9 (20)'})
+    assert response.status_code == 200, response.data
+
+    row = match_row(db, match_id)
+    assert tuple(row)[:8] == ('150/6 (20)', 150, 6, 120, '141/9 (20)', 141, 9, 120)
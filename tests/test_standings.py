@@ -0,0 +1,97 @@
+"""Group standings and net run rate kept by the match triggers"""
+import pytest
+
+from conftest import (
+    create_match, create_player, create_team, expected_standings, stored_standings
+)
+
+
+def put_result(client, match_id, **result):
+    response = client.put(f'/api/matches/{match_id}/result', json=result)
+    assert response.status_code == 200, response.data
+
+
+def standings_row(client, group, team_id):
+    table = client.get(f'/api/tournament/standings?group={group}').get_json().get(group, [])
+    return next((row for row in table if row['team_id'] == team_id), None)
+
+
+@pytest.fixture
+def league(admin):
+    teams = [create_team(admin, name) for name in ('A', 'B', 'C')]
+    matches = [create_match(admin, teams[0], teams[1]), create_match(admin, teams[1], teams[2])]
+    return teams, matches
+
+
+def test_result_insert_update_delete(admin, db, league):
+    (team_a, team_b, team_c), (first, second) = league
+    put_result(admin, second, winner_id=None)
+
+    put_result(admin, first, winner_id=team_a, overs_limit=20,
+               team_a_score='160/5 (20)', team_b_score='120 all out (18.2)')
+    assert stored_standings(db) == expected_standings(db)
+    row = standings_row(admin, 'Group 1', team_a)
+    assert (row['played'], row['won'], row['points'], row['position']) == (1, 1, 2, 1)
+    # B was bowled out, so it is charged its full 20 overs
+    assert (row['runs_for'], row['balls_for'], row['runs_against'], row['balls_against']) \
+        == (160, 120, 120, 120)
+    assert row['net_run_rate'] == 2.0
+
+    # A corrected result replaces the old one rather than adding to it
+    put_result(admin, first, winner_id=team_b,
+               team_a_score='165/8 (20)', team_b_score='170/3 (19)')
+    assert stored_standings(db) == expected_standings(db)
+    row = standings_row(admin, 'Group 1', team_b)
+    assert (row['played'], row['won'], row['no_result'], row['points'], row['position']) \
+        == (2, 1, 1, 3, 1)
+    assert row['net_run_rate'] == round(170 / 19 - 165 / 20, 3)
+    assert standings_row(admin, 'Group 1', team_a)['points'] == 0
+
+    response = admin.delete(f'/api/matches/{first}')
+    assert response.status_code == 200, response.data
+    assert stored_standings(db) == expected_standings(db)
+    assert standings_row(admin, 'Group 1', team_a) is None
+    row = standings_row(admin, 'Group 1', team_b)
+    assert (row['played'], row['points'], row['net_run_rate']) == (1, 1, None)
+    assert standings_row(admin, 'Group 1', team_c)['points'] == 1
+
+
+def test_moving_a_match_to_another_group(admin, db, league):
+    (team_a, team_b, _), (first, _) = league
+    put_result(admin, first, winner_id=team_a, team_a_score='100/2 (10)', team_b_score='90/9 (10)')
+
+    response = admin.put(f'/api/matches/{first}', json={
+        'match_date': '2025-11-17', 'match_day': 'Monday', 'match_time': '18:00',
+        'team_a_id': team_a, 'team_b_id': team_b, 'round': 'Group 2', 'status': 'completed'
+    })
+    assert response.status_code == 200, response.data
+    assert stored_standings(db) == expected_standings(db)
+    assert standings_row(admin, 'Group 1', team_a) is None
+    assert standings_row(admin, 'Group 2', team_a)['points'] == 2
+    assert standings_row(admin, 'Group 1', team_b)['played'] == 0
+
+
+def test_ball_by_ball_scores_feed_the_net_run_rate(admin, db, league):
+    (team_a, team_b, _), (first, _) = league
+    batters = {team: [create_player(admin, f'{team}-{i}', team) for i in range(2)]
+               for team in (team_a, team_b)}
+    bowlers = {team_a: batters[team_b][0], team_b: batters[team_a][0]}
+
+    def over(innings, batting, runs):
+        return [dict(innings=innings, over=0, ball=number, striker_id=batters[batting][0],
+                     non_striker_id=batters[batting][1], bowler_id=bowlers[batting], runs=runs)
+                for number in range(1, 7)]
+
+    response = admin.post(f'/api/matches/{first}/deliveries',
+                          json={'deliveries': over(1, team_a, 4) + over(2, team_b, 1)})
+    assert response.status_code == 201, response.data
+    delivery_ids = response.get_json()['delivery_ids']
+    put_result(admin, first, winner_id=team_a)
+    assert stored_standings(db) == expected_standings(db)
+    assert standings_row(admin, 'Group 1', team_a)['net_run_rate'] == 24.0 - 6.0
+
+    response = admin.delete(f'/api/matches/{first}/deliveries/{delivery_ids[-1]}')
+    assert response.status_code == 200, response.data
+    assert stored_standings(db) == expected_standings(db)
+    row = standings_row(admin, 'Group 1', team_b)
+    assert (row['runs_for'], row['balls_for']) == (5, 5)
@@ -0,0 +1,57 @@
+"""Bracket generation and group-stage scheduling with clear_existing"""
+from conftest import create_match, create_team
+
+
+def count_matches(db):
+    return dict(db.execute('''
+        SELECT CASE WHEN round_number IS NULL THEN round ELSE 'knockout' END, COUNT(*)
+        FROM matches GROUP BY 1
+    ''').fetchall())
+
+
+def test_generate_clear_existing_keeps_group_matches(admin, db):
+    teams = [create_team(admin, f'T{i}') for i in range(4)]
+    group_match = create_match(admin, teams[0], teams[1])
+    admin.put(f'/api/matches/{group_match}/result', json={'winner_id': teams[0]})
+
+    body = {'start_date': '2025-12-01', 'team_ids': teams}
+    assert admin.post('/api/tournament/generate', json=body).status_code == 201
+    response = admin.post('/api/tournament/generate', json=dict(body, clear_existing=True))
+    assert response.status_code == 201, response.data
+
+    assert count_matches(db) == {'Group 1': 1, 'knockout': 3}
+    standings = db.execute('SELECT team_id, won FROM standings ORDER BY team_id').fetchall()
+    assert [tuple(row) for row in standings] == [(teams[0], 1), (teams[1], 0)]
+
+
+def test_generate_clear_existing_refuses_played_bracket(admin, db):
+    teams = [create_team(admin, f'T{i}') for i in range(4)]
+    body = {'start_date': '2025-12-01', 'team_ids': teams}
+    assert admin.post('/api/tournament/generate', json=body).status_code == 201
+    semi = db.execute('SELECT id, team_a_id FROM matches WHERE round_number = 1').fetchone()
+    admin.put(f"/api/matches/{semi['id']}/result", json={'winner_id': semi['team_a_id']})
+
+    response = admin.post('/api/tournament/generate', json=dict(body, clear_existing=True))
+    assert response.status_code == 400
+    assert count_matches(db) == {'knockout': 3}
+
+
+def test_schedule_clear_existing_only_touches_requested_groups(admin, db):
+    teams = [create_team(admin, f'T{i}') for i in range(8)]
+    body = {'start_date': '2025-11-17', 'times': ['18:00', '18:20'],
+            'groups': {'Group 1': teams[:4], 'Group 2': teams[4:]}}
+    assert admin.post('/api/tournament/schedule', json=body).status_code == 201
+    assert admin.post('/api/tournament/schedule', json=body).status_code == 400
+
+    group_2 = db.execute("SELECT id, team_a_id FROM matches WHERE round = 'Group 2'").fetchone()
+    admin.put(f"/api/matches/{group_2['id']}/result", json={'winner_id': group_2['team_a_id']})
+
+    response = admin.post('/api/tournament/schedule', json=dict(
+        body, groups={'Group 1': teams[:4]}, clear_existing=True))
+    assert response.status_code == 201, response.data
+
+    response = admin.post('/api/tournament/schedule', json=dict(
+        body, groups={'Group 2': teams[4:]}, clear_existing=True))
+    assert response.status_code == 400
+    assert count_matches(db) == {'Group 1': 6, 'Group 2': 6}
+    assert db.execute("SELECT COUNT(*) FROM matches WHERE status = 'completed'").fetchone()[0] == 1